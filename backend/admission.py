@@ -0,0 +1,298 @@
+import math
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from werkzeug.exceptions import UnsupportedMediaType
+
+# Admission control for uploads: per-client token buckets, a global cap on concurrent
+# parses with a short bounded wait, and a file signature check that runs on the first
+# bytes of an upload while the request body is still being received.
+
+REJECT_RATE = 'rate'
+REJECT_CONCURRENCY = 'concurrency'
+REJECT_SIGNATURE = 'signature'
+
+# Leading bytes of each accepted file type
+FILE_SIGNATURES = {
+    'pdf': (b'%PDF-',),
+    'docx': (b'PK\x03\x04',),
+    'zip': (b'PK\x03\x04', b'PK\x05\x06'), # Empty archives only have the end-of-directory record
+    # resume_parser reads .doc files as DOCX (Word 97-2003 OLE2 files cannot be parsed), so
+    # .doc uploads must be zip packages too
+    'doc': (b'PK\x03\x04',),
+}
+# PDF readers accept a header after leading whitespace, so it is skipped for PDFs
+_LEADING_WHITESPACE = b' \t\r\n\x00\x0c'
+_MAX_LEADING_BYTES = 1024
+
+
+class AdmissionRejected(Exception):
+    """Raised when an upload is not admitted. `retry_after` is a whole number of seconds."""
+
+    def __init__(self, reason, retry_after, message):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class FileSignatureMismatch(UnsupportedMediaType):
+    """Raised while an upload is received if its first bytes do not match its extension."""
+
+
+def signature_matches(extension, head):
+    """
+    Checks the first bytes of a file against its extension.
+
+    Returns:
+        bool or None: None if `head` is too short to decide or the extension has no known signature.
+    """
+    extension = extension.lower().lstrip('.')
+    signatures = FILE_SIGNATURES.get(extension)
+    if not signatures:
+        return None
+    if extension == 'pdf':
+        head = head[:_MAX_LEADING_BYTES].lstrip(_LEADING_WHITESPACE)
+    undecided = False
+    for signature in signatures:
+        if head.startswith(signature):
+            return True
+        undecided = undecided or (len(head) < len(signature) and signature.startswith(head))
+    return None if undecided else False
+
+
+def file_matches_signature(extension, data):
+    """
+    Checks a complete file (or at least its first 1 KB) against its extension: unlike
+    signature_matches, data too short to hold the signature is a mismatch.
+    """
+    if extension.lower().lstrip('.') not in FILE_SIGNATURES:
+        return True
+    return bool(signature_matches(extension, data[:_MAX_LEADING_BYTES]))
+
+
+class SignatureCheckingSpool(tempfile.SpooledTemporaryFile):
+    """
+    SpooledTemporaryFile that checks the upload's file signature as the first bytes are
+    written and raises FileSignatureMismatch (a 415 error) if it does not match the
+    extension of `filename`, so the rest of the body is never read or spooled.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._extension = filename.rsplit('.', 1)[-1] if filename and '.' in filename else ''
+        self._head = b'' if self._extension.lower() in FILE_SIGNATURES else None
+
+    def write(self, data):
+        if self._head is not None:
+            self._head += bytes(data[:_MAX_LEADING_BYTES])
+            matches = signature_matches(self._extension, self._head)
+            if matches is None and len(self._head) >= _MAX_LEADING_BYTES:
+                matches = False # Nothing but whitespace
+            if matches is False:
+                raise FileSignatureMismatch(f"File contents do not match its .{self._extension} extension.")
+            if matches:
+                self._head = None
+        return super().write(data)
+
+
+class RateLimiter:
+    """
+    Token buckets per client identity. `rates` maps an identity kind (e.g. 'ip', 'key') to
+    (tokens per second, burst size); a rate of 0 disables that kind. acquire() takes one
+    token from every bucket of a request or none at all. At most `max_clients` buckets
+    are kept (least recently used dropped), so memory stays bounded under spoofed clients.
+    """
+
+    def __init__(self, rates, max_clients=10000):
+        self.rates = {kind: (rate, max(1.0, burst)) for kind, (rate, burst) in rates.items() if rate > 0}
+        self.max_clients = max_clients
+        self._buckets = OrderedDict() # (kind, id) -> [tokens, last refill time]
+        self._lock = threading.Lock()
+
+    def acquire(self, identities):
+        """
+        Takes a token for each (kind, id) in `identities`.
+
+        Returns:
+            float: 0.0 if admitted, else seconds until every bucket has a token again.
+        """
+        now = time.monotonic()
+        wait = 0.0
+        with self._lock:
+            buckets = []
+            for kind, client in identities:
+                if kind not in self.rates:
+                    continue
+                rate, burst = self.rates[kind]
+                bucket = self._buckets.get((kind, client))
+                if bucket is None:
+                    bucket = self._buckets[(kind, client)] = [burst, now]
+                    while len(self._buckets) > self.max_clients:
+                        self._buckets.popitem(last=False)
+                else:
+                    self._buckets.move_to_end((kind, client))
+                    bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                    bucket[1] = now
+                if bucket[0] < 1.0:
+                    wait = max(wait, (1.0 - bucket[0]) / rate)
+                buckets.append(bucket)
+            if wait:
+                return wait
+            for bucket in buckets:
+                bucket[0] -= 1.0
+        return 0.0
+
+    def stats(self):
+        with self._lock:
+            return {'clients': len(self._buckets)}
+
+
+class ConcurrencyLimiter:
+    """
+    Caps concurrent parses at `max_concurrent`. A request that finds every slot taken waits
+    up to `queue_timeout` seconds for one, with at most `queue_depth` requests waiting;
+    anything beyond that is rejected straight away with an estimated Retry-After.
+    """
+
+    def __init__(self, max_concurrent, queue_depth=16, queue_timeout=5.0):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.queue_depth = queue_depth
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._average_seconds = 1.0 # Moving average of slot hold times, for Retry-After
+        self._condition = threading.Condition()
+
+    def _retry_after(self):
+        # Caller must hold self._condition
+        return max(1, math.ceil(self._average_seconds * (self.waiting + 1) / self.max_concurrent))
+
+    def acquire(self):
+        """Takes a slot, waiting briefly if needed. Raises AdmissionRejected if none frees up."""
+        with self._condition:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return
+            if self.waiting >= self.queue_depth:
+                raise AdmissionRejected(REJECT_CONCURRENCY, self._retry_after(), "Too many uploads are waiting.")
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + self.queue_timeout
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AdmissionRejected(REJECT_CONCURRENCY, self._retry_after(),
+                                                "No parse slot became free in time.")
+                    self._condition.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+
+    def release(self, held_seconds=None):
+        with self._condition:
+            self.active -= 1
+            if held_seconds is not None:
+                self._average_seconds = 0.8 * self._average_seconds + 0.2 * held_seconds
+            self._condition.notify()
+
+    def slot(self):
+        """Context manager holding a slot for the duration of a parse."""
+        return _Slot(self)
+
+    def stats(self):
+        with self._condition:
+            return {'active': self.active, 'waiting': self.waiting, 'max_concurrent': self.max_concurrent,
+                    'average_seconds': round(self._average_seconds, 3)}
+
+
+class _Slot:
+    __slots__ = ('limiter', 'start')
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    def __enter__(self):
+        self.limiter.acquire()
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.limiter.release(time.monotonic() - self.start)
+        return False
+
+
+class _NoSlot:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NO_SLOT = _NoSlot()
+
+
+class UploadAdmission:
+    """
+    Admission policy for uploads: rate limits per client IP and API key, then a slot in
+    the global parse limit. Either part is disabled by passing None.
+    """
+
+    def __init__(self, rate_limiter=None, concurrency=None):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.rejections = {REJECT_RATE: 0, REJECT_CONCURRENCY: 0, REJECT_SIGNATURE: 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def identities(ip, api_key=None):
+        """Bucket identities of a request. API keys are hashed so they are never kept in memory."""
+        identities = [('ip', ip or 'unknown')]
+        if api_key:
+            identities.append(('key', hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]))
+        return identities
+
+    def record_rejection(self, reason):
+        with self._lock:
+            self.rejections[reason] += 1
+
+    def check_rate(self, ip, api_key=None):
+        """Raises AdmissionRejected if the client is over its rate limit."""
+        if self.rate_limiter is None:
+            return
+        wait = self.rate_limiter.acquire(self.identities(ip, api_key))
+        if wait:
+            self.record_rejection(REJECT_RATE)
+            raise AdmissionRejected(REJECT_RATE, max(1, math.ceil(wait)), "Too many uploads from this client.")
+
+    def parse_slot(self):
+        """Context manager around a parse; raises AdmissionRejected on entry if no slot frees up in time."""
+        if self.concurrency is None:
+            return NO_SLOT
+        return _CountedSlot(self)
+
+    def stats(self):
+        stats = {'rejections': dict(self.rejections)}
+        if self.concurrency is not None:
+            stats.update(self.concurrency.stats())
+        if self.rate_limiter is not None:
+            stats.update(self.rate_limiter.stats())
+        return stats
+
+
+class _CountedSlot(_Slot):
+    __slots__ = ('admission',)
+
+    def __init__(self, admission):
+        super().__init__(admission.concurrency)
+        self.admission = admission
+
+    def __enter__(self):
+        try:
+            return super().__enter__()
+        except AdmissionRejected:
+            self.admission.record_rejection(REJECT_CONCURRENCY)
+            raise
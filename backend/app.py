@@ -1,12 +1,42 @@
 import os
+import atexit
+import hmac
+import hashlib
 import logging
+import functools
+import uuid
 import random # Added for profile image signature
-from flask import Flask, request, jsonify, send_from_directory, current_app
+import json
+import zipfile
+import tempfile
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Request, Response, request, jsonify, send_from_directory, current_app, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
-from resume_parser import parse_resume
-# from portfolio_generator import generate_portfolio # This function is not defined in portfolio_generator.py, generate_portfolio_html is
+from resume_parser import parse_resume, extract_resume_text, warmup as warmup_parser, PARSER_VERSION
+from resume_model import ParsedResume
+from parse_cache import ParseCache, compute_content_key
+from parse_jobs import ParseJobQueue, QueueFullError, JOB_DONE, JOB_FAILED
+from batch_ingest import iter_batch_results
+from incremental_parse import ReparseSessionStore
+from sandbox import SandboxPool, ParseLimitExceeded
+from admission import (UploadAdmission, RateLimiter, ConcurrencyLimiter, AdmissionRejected, FileSignatureMismatch,
+                       SignatureCheckingSpool, file_matches_signature, REJECT_SIGNATURE)
+from minhash import NearDuplicateIndex, signature as text_signature
+from profiler import ParseProfiler, list_captures, load_capture
+import skill_taxonomy
+from metrics import (MetricsRegistry, Counter, Gauge, Histogram, StageTimer, NULL_TIMER,
+                     LATENCY_BUCKETS, BYTES_BUCKETS, PAGE_BUCKETS, CHAR_BUCKETS)
+from portfolio_generator import PortfolioRenderer, create_environment
+from portfolio_export import iter_zip_stream, portfolio_export_files
+from static_assets import StaticManifest
+from models import db, init_db, Portfolio
+from sqlalchemy.exc import SQLAlchemyError
 
 # --- Helper Functions ---
 def allowed_file(filename):
@@ -14,29 +44,109 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
-def _transform_parsed_data_to_frontend_format(parsed_data):
-    """Transforms data from parse_resume into the format expected by PreviewPage.js."""
+def _transform_parsed_data_to_frontend_format(parsed_resume):
+    """Serializes a ParsedResume into the format expected by PreviewPage.js."""
     profile_pic_sig = random.randint(1, 100000) # Generate a random signature for the image URL
-    frontend_data = {
-        "fullName": parsed_data.get('name', 'Name not parsed'),
-        "jobTitle": parsed_data.get('title', 'Title not parsed'),
-        "summary": parsed_data.get('summary', 'Summary not parsed.'),
-        "contact": {
-            "email": parsed_data.get('email', ''),
-            "phone": parsed_data.get('phone', ''),
-            "linkedin": parsed_data.get('linkedin', ''),
-            "github": parsed_data.get('github', '')
-        },
-        "experience": parsed_data.get('experience', []),
-        "education": parsed_data.get('education', []),
-        "skills": parsed_data.get('skills', []),
-        "profile_image_url": f"https://source.unsplash.com/random/150x150/?portrait,person&sig={profile_pic_sig}"
+    return parsed_resume.to_frontend(
+        profile_image_url=f"https://source.unsplash.com/random/150x150/?portrait,person&sig={profile_pic_sig}")
+
+def _portfolio_data_from_payload(payload):
+    """Accepts parse_resume output or the frontend format from /api/upload and returns template data."""
+    if 'fullName' not in payload and 'contact' not in payload:
+        return payload
+    contact = payload.get('contact') or {}
+    return {
+        'name': payload.get('fullName', ''),
+        'title': payload.get('jobTitle', ''),
+        'summary': payload.get('summary', ''),
+        'email': contact.get('email', ''),
+        'phone': contact.get('phone', ''),
+        'linkedin': contact.get('linkedin', ''),
+        'github': contact.get('github', ''),
+        'experience': payload.get('experience', []),
+        'education': payload.get('education', []),
+        'skills': payload.get('skills', []),
+        'profile_image_url': payload.get('profile_image_url', ''),
     }
-    return frontend_data
+
+class UploadRequest(Request):
+    """Request that buffers uploaded files according to PARSE_SPILL_THRESHOLD."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Small uploads stay in memory; larger ones roll over to an anonymous, uniquely
+        # named temp file in UPLOAD_FOLDER, so concurrent uploads never share a path.
+        options = {'max_size': current_app.config['PARSE_SPILL_THRESHOLD'], 'prefix': 'upload_',
+                   'dir': current_app.config['UPLOAD_FOLDER']}
+        if current_app.config['ADMISSION_CHECK_SIGNATURE'] and self.endpoint != 'upload_resume_batch':
+            # Checks the first bytes against the extension and aborts the body read on a mismatch.
+            # Batches check each entry instead and report mismatches per file.
+            return SignatureCheckingSpool(filename, **options)
+        return tempfile.SpooledTemporaryFile(**options)
+
+def _wants_async(req):
+    """Async mode is chosen per request with ?async= (or an 'async' form field), else by config."""
+    value = req.args.get('async', req.form.get('async'))
+    if value is None:
+        return current_app.config['PARSE_ASYNC_DEFAULT']
+    return value.lower() in ['true', '1', 't', 'yes']
+
+def _iter_batch_uploads(files, max_files, rejected=None):
+    """
+    Yields (name, bytes) for every resume in a batch upload, expanding zip archives.
+
+    Zip members are read one at a time as the batch runner asks for them, and entries
+    whose declared size exceeds MAX_CONTENT_LENGTH are rejected to contain zip bombs.
+    If `rejected` is a list, entries whose first bytes do not match their extension are
+    skipped and an error record for each is appended to it instead.
+    """
+    for name, data in _iter_batch_entries(files, max_files):
+        if rejected is not None and not file_matches_signature(os.path.splitext(name)[1], data):
+            upload_admission.record_rejection(REJECT_SIGNATURE)
+            upload_rejections.inc(reason=REJECT_SIGNATURE)
+            extension = os.path.splitext(name)[1].lower()
+            rejected.append({'file': name, 'ok': False, 'reason': REJECT_SIGNATURE, 'elapsed_ms': None,
+                             'error': f"File contents do not match its {extension} extension."})
+            continue
+        yield name, data
+
+def _iter_batch_entries(files, max_files):
+    max_member_size = current_app.config['MAX_CONTENT_LENGTH']
+    count = 0
+    for file in files:
+        filename = secure_filename(file.filename or '')
+        if filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(file.stream) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not allowed_file(info.filename):
+                        continue
+                    count += 1
+                    if count > max_files:
+                        raise ValueError(f"Batch exceeds the limit of {max_files} files.")
+                    if info.file_size > max_member_size:
+                        raise ValueError(f"Archive member '{info.filename}' is too large.")
+                    yield info.filename, archive.read(info)
+        elif allowed_file(filename):
+            count += 1
+            if count > max_files:
+                raise ValueError(f"Batch exceeds the limit of {max_files} files.")
+            yield filename, file.stream.read()
+
+def _with_rejected(records, rejected):
+    """Yields `records`, with the records appended to `rejected` meanwhile mixed in as they appear."""
+    for record in records:
+        while rejected:
+            yield rejected.pop(0)
+        yield record
+    yield from rejected
 
 # --- Flask App Initialization ---
-app = Flask(__name__, static_folder='../frontend/build', static_url_path='/')
+# The React build is served by serve_react_app below, not by Flask's static route
+app = Flask(__name__, static_folder=None)
+app.request_class = UploadRequest
 app.config.from_object(Config)
+if app.config['TRUSTED_PROXY_HOPS']:
+    # request.remote_addr becomes the address the trusted proxies saw, not what clients claim
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'])
 
 # Configure logging
 if not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true": # Ensure logging is configured once
@@ -50,6 +160,271 @@ if not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true": # Ensure logg
 # Enable CORS for API routes
 CORS(app, resources={r"/api/*": {"origins": "*"}}) # For production, restrict origins more tightly
 
+# Parsed portfolios are stored in the database (tables and indexes are created if missing)
+init_db(app)
+
+# Skill dictionary the parser maps extracted skills onto (the bundled one plus any configured files)
+skill_taxonomy.configure(app.config['SKILL_TAXONOMY_PATHS'], fuzzy_threshold=app.config['SKILL_FUZZY_THRESHOLD'])
+
+if app.config['PARSE_PRELOAD']:
+    preload_timings = warmup_parser()
+    app.logger.info("Preloaded parser libraries: " + ', '.join(f"{kind} {seconds * 1000:.0f} ms" for kind, seconds in preload_timings.items()))
+
+# In-memory index of the React build, so frontend requests never touch the filesystem
+static_manifest = StaticManifest(app.config['FRONTEND_BUILD_DIR'])
+if app.config['STATIC_MANIFEST']:
+    static_manifest.build()
+
+# Options applied to every parse_resume call, and the cache version they imply. The skill
+# dictionary's version is a digest of its files; its index is only built on first use.
+parse_options = {'max_pages': app.config['PARSE_MAX_PAGES'], 'max_chars': app.config['PARSE_MAX_CHARS'],
+                 'pdf_reading_order': app.config['PARSE_PDF_READING_ORDER'],
+                 'page_time_budget': app.config['PARSE_PDF_PAGE_SECONDS']}
+parse_cache_version = (f"{PARSER_VERSION}:{parse_options['max_pages']}:{parse_options['max_chars']}"
+                       f":{'layout' if parse_options['pdf_reading_order'] else 'stream'}"
+                       f":{skill_taxonomy.default_version()}")
+
+# Cache of parse results keyed by upload contents, so repeat uploads skip parsing
+parse_cache = ParseCache(max_entries=app.config['PARSE_CACHE_SIZE'], disk_dir=app.config['PARSE_CACHE_DIR'],
+                         encode=ParsedResume.to_dict, decode=ParsedResume.from_dict)
+
+# Near-duplicate index: MinHash signatures of the extracted text of uploads and batch entries
+near_duplicates = None
+text_fingerprint = None # Picklable, so sandbox and batch workers can compute signatures
+if app.config['NEAR_DUPLICATE_INDEX']:
+    near_duplicates = NearDuplicateIndex(bands=app.config['NEAR_DUPLICATE_BANDS'],
+                                         max_entries=app.config['NEAR_DUPLICATE_INDEX_SIZE'],
+                                         snapshot_path=app.config['NEAR_DUPLICATE_SNAPSHOT'],
+                                         snapshot_interval=app.config['NEAR_DUPLICATE_SNAPSHOT_INTERVAL'])
+    text_fingerprint = functools.partial(text_signature, num_perm=near_duplicates.num_perm,
+                                         shingle_size=near_duplicates.shingle_size)
+    if app.config['NEAR_DUPLICATE_SNAPSHOT']:
+        atexit.register(near_duplicates.save)
+
+# Edit sessions for /api/reparse, which re-parse only the sections an edit touches
+reparse_sessions = ReparseSessionStore(max_sessions=app.config['REPARSE_SESSION_LIMIT'],
+                                       ttl=app.config['REPARSE_SESSION_TTL'])
+
+# Portfolio templates are compiled once at startup and rendered pages memoized by content
+portfolio_renderer = PortfolioRenderer(
+    create_environment(bytecode_cache_dir=app.config['PORTFOLIO_TEMPLATE_CACHE_DIR']),
+    max_entries=app.config['PORTFOLIO_RENDER_CACHE_SIZE']).preload()
+
+# Upload metrics, exposed in Prometheus text format at /api/metrics
+metrics_registry = MetricsRegistry()
+upload_stage_seconds = metrics_registry.register(Histogram(
+    'resume_upload_stage_seconds', 'Time spent in each stage of /api/upload.', LATENCY_BUCKETS, ['stage']))
+upload_total_seconds = metrics_registry.register(Histogram(
+    'resume_upload_seconds', 'Total time spent handling /api/upload, by outcome.', LATENCY_BUCKETS, ['outcome']))
+upload_bytes = metrics_registry.register(Histogram(
+    'resume_upload_bytes', 'Size of uploaded resume files.', BYTES_BUCKETS))
+extracted_pages = metrics_registry.register(Histogram(
+    'resume_extracted_pages', 'PDF pages extracted per parsed resume.', PAGE_BUCKETS))
+extracted_chars = metrics_registry.register(Histogram(
+    'resume_extracted_chars', 'Characters of text extracted per parsed resume.', CHAR_BUCKETS))
+uploads_total = metrics_registry.register(Counter(
+    'resume_uploads_total', 'Handled /api/upload requests, by outcome.', ['outcome']))
+metrics_registry.register(Counter(
+    'resume_parse_cache_events_total', 'Parse cache lookups and evictions (hits, disk_hits, misses, evictions).', ['event'],
+    callback=lambda: {key: value for key, value in parse_cache.stats().items()
+                      if key in ('hits', 'disk_hits', 'misses', 'evictions')}))
+metrics_registry.register(Gauge(
+    'resume_parse_cache_entries', 'Parse results held in the in-memory cache tier.',
+    callback=lambda: {(): parse_cache.stats()['entries']}))
+
+# Optional isolation of upload parses in resource-limited worker processes
+sandbox_kills = metrics_registry.register(Counter(
+    'resume_parse_sandbox_kills_total', 'Sandboxed parses stopped by a limit, by reason (cpu, memory, timeout, crash).',
+    ['reason']))
+parse_sandbox = None
+if app.config['PARSE_SANDBOX']:
+    parse_sandbox = SandboxPool(max_workers=app.config['PARSE_SANDBOX_WORKERS'],
+                                cpu_seconds=app.config['PARSE_SANDBOX_CPU_SECONDS'],
+                                memory_mb=app.config['PARSE_SANDBOX_MEMORY_MB'],
+                                timeout=app.config['PARSE_SANDBOX_TIMEOUT'],
+                                max_jobs_per_worker=app.config['PARSE_SANDBOX_MAX_JOBS'],
+                                parse_options=parse_options,
+                                on_kill=lambda reason: sandbox_kills.inc(reason=reason))
+
+# Worker pool for ?async=1 uploads; processes are only started on the first async upload.
+# With PARSE_SANDBOX, jobs run in the sandbox under the same limits as synchronous uploads.
+parse_jobs = ParseJobQueue(max_workers=app.config['PARSE_ASYNC_WORKERS'],
+                           queue_depth=app.config['PARSE_ASYNC_QUEUE_DEPTH'],
+                           job_ttl=app.config['PARSE_JOB_TTL'],
+                           parse_options=parse_options,
+                           sandbox=parse_sandbox)
+
+# Admission control for uploads: per-client rate limits and a cap on concurrent parses
+upload_admission = UploadAdmission(
+    rate_limiter=RateLimiter({'ip': (app.config['ADMISSION_RATE'], app.config['ADMISSION_BURST']),
+                              'key': (app.config['ADMISSION_KEY_RATE'], app.config['ADMISSION_KEY_BURST'])})
+    if app.config['ADMISSION_RATE'] or app.config['ADMISSION_KEY_RATE'] else None,
+    concurrency=ConcurrencyLimiter(app.config['ADMISSION_MAX_CONCURRENT'],
+                                   queue_depth=app.config['ADMISSION_QUEUE_DEPTH'],
+                                   queue_timeout=app.config['ADMISSION_QUEUE_TIMEOUT'])
+    if app.config['ADMISSION_MAX_CONCURRENT'] else None)
+upload_rejections = metrics_registry.register(Counter(
+    'resume_upload_rejections_total', 'Uploads turned away by admission control, by reason (rate, concurrency, signature).',
+    ['reason']))
+metrics_registry.register(Gauge(
+    'resume_upload_parse_slots', 'Synchronous parses running (active) and waiting for a slot (waiting).', ['state'],
+    callback=lambda: {state: value for state, value in upload_admission.stats().items() if state in ('active', 'waiting')}))
+
+def _admission_rejected_response(rejection):
+    upload_rejections.inc(reason=rejection.reason)
+    response = jsonify({"error": "Server is busy processing other resumes. Please retry shortly.",
+                        "reason": rejection.reason, "retryAfter": rejection.retry_after})
+    response.headers['Retry-After'] = str(rejection.retry_after)
+    return response, 429
+
+def _rate_limited(view):
+    """Applies the per-client upload rate limits before the request body is read."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            upload_admission.check_rate(request.remote_addr, request.headers.get('X-API-Key'))
+        except AdmissionRejected as ar:
+            app.logger.warning(f"Rate limited upload from {request.remote_addr}: {ar}")
+            return _admission_rejected_response(ar)
+        return view(*args, **kwargs)
+    return wrapper
+
+# Opt-in capture of profiles and inputs of slow or sampled parses
+parse_profiler = None
+if app.config['PARSE_PROFILE_DIR']:
+    parse_profiler = ParseProfiler(app.config['PARSE_PROFILE_DIR'],
+                                   sample_rate=app.config['PARSE_PROFILE_SAMPLE_RATE'],
+                                   slow_threshold=app.config['PARSE_PROFILE_SLOW_SECONDS'],
+                                   max_input_bytes=app.config['PARSE_PROFILE_MAX_INPUT_BYTES'],
+                                   retention=app.config['PARSE_PROFILE_RETENTION'],
+                                   max_captures=app.config['PARSE_PROFILE_MAX_CAPTURES'],
+                                   parse_options=parse_options)
+
+def _profiled(stream, extension, timer):
+    if parse_profiler is None:
+        return nullcontext()
+    return parse_profiler.profile(stream, extension, timer)
+
+def _admin_only(view):
+    """Hides a view (404) unless ADMIN_TOKEN is set and sent in the X-Admin-Token header."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = app.config['ADMIN_TOKEN']
+        if not token:
+            return jsonify({"error": "Not found."}), 404
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'), token.encode('utf-8')):
+            return jsonify({"error": "Invalid admin token."}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def _upload_size(stream):
+    start = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(start)
+    return size
+
+def _record_upload_metrics(timer, outcome, size=None, extraction_stats=None):
+    uploads_total.inc(outcome=outcome)
+    if not timer.enabled or not app.config['METRICS_ENABLED']:
+        return
+    for stage, seconds in timer.durations.items():
+        upload_stage_seconds.observe(seconds, stage=stage)
+    upload_total_seconds.observe(timer.elapsed(), outcome=outcome) # Includes slot waits and work between stages
+    if size is not None:
+        upload_bytes.observe(size)
+    if extraction_stats:
+        if extraction_stats.get('pages') is not None:
+            extracted_pages.observe(extraction_stats['pages'])
+        extracted_chars.observe(extraction_stats.get('chars', 0))
+
+def _with_timing_header(response, timer):
+    if app.config['PARSE_TIMING_HEADER'] and timer.enabled:
+        response.headers['X-Parse-Timing'] = timer.header_value()
+    return response
+
+def _persist_portfolio(parsed_resume, filename, content_hash):
+    """
+    Stores the parse result, reusing the existing row for the same upload contents.
+    Returns the portfolio's public id, or None if the database write failed (the upload
+    still succeeds). The page is rendered from the stored data when it is requested.
+    """
+    try:
+        portfolio = Portfolio.query.filter_by(content_hash=content_hash).order_by(Portfolio.id).first()
+        if portfolio is None:
+            portfolio = Portfolio(resume_filename=filename, content_hash=content_hash,
+                                  parsed_data=parsed_resume.to_dict())
+            db.session.add(portfolio)
+            db.session.commit()
+            app.logger.info(f'Stored portfolio {portfolio.id} for {filename}')
+        return portfolio.public_id
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.error(f"Could not store portfolio for '{filename}': {e}", exc_info=True)
+        return None
+
+def _near_duplicate_json(matches):
+    """
+    Scores of near-duplicate matches with opaque ids. The ids are stable, so clients can
+    tell matches apart, but they cannot be used to look up the other uploaders' portfolios.
+    """
+    secret = app.config['SECRET_KEY'].encode('utf-8')
+    return [{"matchId": hmac.new(secret, key.encode('utf-8'), hashlib.sha256).hexdigest()[:24],
+             "similarity": round(score, 3)} for key, score, _ in matches]
+
+def _near_duplicate_hook(cache_key, found):
+    """
+    Returns a parse_resume reuse= hook for an upload. It stores the upload's near-duplicates
+    in found['matches'] and, if NEAR_DUPLICATE_REUSE_THRESHOLD is set, returns the cached
+    parse of the closest one when it is similar enough (recorded in found['reused']).
+    """
+    def reuse(sig):
+        reuse_threshold = app.config['NEAR_DUPLICATE_REUSE_THRESHOLD']
+        threshold = app.config['NEAR_DUPLICATE_THRESHOLD']
+        matches = near_duplicates.query(sig, min(threshold, reuse_threshold or threshold), limit=5, exclude=cache_key)
+        found['matches'] = [match for match in matches if match[1] >= threshold]
+        if reuse_threshold and matches and matches[0][1] >= reuse_threshold:
+            previous = parse_cache.get(matches[0][0])
+            if previous is not None:
+                found['reused'] = matches[0]
+            return previous
+        return None
+    return reuse
+
+def _index_upload(cache_key, filename, sig, found):
+    """Adds an upload to the near-duplicate index and returns its near-duplicates found before that."""
+    if near_duplicates is None or sig is None:
+        return []
+    matches = found.get('matches')
+    if matches is None: # Parsed in the sandbox, where the hook cannot run
+        matches = near_duplicates.query(sig, app.config['NEAR_DUPLICATE_THRESHOLD'], limit=5, exclude=cache_key)
+    near_duplicates.add(cache_key, sig, {'filename': filename})
+    return matches
+
+# Process pool for /api/upload/batch, created on the first batch request. With PARSE_SANDBOX
+# the batch entries are parsed in the sandbox instead, from a thread pool of its size.
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+def _get_batch_executor():
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            if parse_sandbox is not None:
+                _batch_executor = ThreadPoolExecutor(max_workers=parse_sandbox.max_workers, thread_name_prefix='batch')
+            else:
+                _batch_executor = ProcessPoolExecutor(max_workers=app.config['BATCH_MAX_WORKERS'])
+        return _batch_executor
+
+def _replace_batch_executor(broken):
+    """Swaps out a batch pool broken by a dead worker; concurrent batches share the new one."""
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is broken:
+            _batch_executor = None
+            broken.shutdown(wait=False, cancel_futures=True)
+            app.logger.warning("Batch worker pool is broken (a worker died); starting a new one")
+    return _get_batch_executor()
+
 # Ensure upload folder exists
 if not os.path.exists(app.config['UPLOAD_FOLDER']):
     try:
@@ -60,9 +435,21 @@ if not os.path.exists(app.config['UPLOAD_FOLDER']):
         # Depending on severity, might want to exit or raise
 
 # --- API Routes ---
+@app.errorhandler(FileSignatureMismatch)
+def file_signature_mismatch(e):
+    upload_admission.record_rejection(REJECT_SIGNATURE)
+    upload_rejections.inc(reason=REJECT_SIGNATURE)
+    app.logger.warning(f"Rejected upload: {e.description}")
+    return jsonify({"error": e.description}), 415
+
 @app.route('/api/upload', methods=['POST'])
+@_rate_limited
 def upload_resume_file():
-    if 'resume' not in request.files:
+    timer = StageTimer() if (app.config['METRICS_ENABLED'] or app.config['PARSE_TIMING_HEADER']) else NULL_TIMER
+
+    with timer.stage('receive'): # Reading and buffering the multipart body
+        has_resume = 'resume' in request.files
+    if not has_resume:
         app.logger.warning('No resume file part in request.')
         return jsonify({"error": "No resume file part in the request."}), 400
     
@@ -73,59 +460,505 @@ def upload_resume_file():
     
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        # Consider adding a unique prefix to filename to prevent overwrites if storing permanently
-        # import uuid
-        # unique_filename = str(uuid.uuid4()) + "_" + filename
-        # saved_filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        saved_filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        try:
-            file.save(saved_filepath)
-            app.logger.info(f'File {filename} saved to {saved_filepath}')
-        except Exception as e:
-            app.logger.error(f"Failed to save file '{filename}': {e}", exc_info=True)
-            return jsonify({"error": "Failed to save file on server."}), 500
+        extension = os.path.splitext(filename)[1]
+        with timer.stage('hash'):
+            upload_size = _upload_size(file.stream)
+            cache_key = compute_content_key(file.stream, parse_cache_version, extension)
+        with timer.stage('cache_lookup'):
+            cached_data = parse_cache.get(cache_key)
+        if cached_data is not None:
+            app.logger.info(f'Parse cache hit for {filename} ({cache_key[:12]})')
+            with timer.stage('persist'):
+                portfolio_id = _persist_portfolio(cached_data, filename, cache_key)
+            with timer.stage('transform'):
+                portfolio_data = _transform_parsed_data_to_frontend_format(cached_data)
+                portfolio_data['portfolioId'] = portfolio_id
+            _record_upload_metrics(timer, 'cache_hit', upload_size)
+            return _with_timing_header(jsonify(portfolio_data), timer), 200
+
+        if _wants_async(request):
+            try:
+                job_id = parse_jobs.submit(file.stream.read(), filename, key=cache_key,
+                                           on_success=lambda data: parse_cache.put(cache_key, data))
+            except QueueFullError:
+                app.logger.warning(f'Parse queue full, rejecting async upload of {filename}.')
+                response = jsonify({"error": "Server is busy processing other resumes. Please retry shortly."})
+                response.headers['Retry-After'] = '1'
+                return response, 429
+            finally:
+                file.close()
+            app.logger.info(f'Queued parse job {job_id} for {filename}')
+            response = jsonify({"jobId": job_id, "status": "queued", "statusUrl": f"/api/jobs/{job_id}"})
+            response.headers['Location'] = f"/api/jobs/{job_id}"
+            return response, 202
 
+        # Parse straight from the upload stream. UploadRequest keeps small uploads in memory
+        # and spools large ones to a uniquely named temp file that is removed on close.
+        extraction_stats = {}
+        near_duplicate_info = {}
         try:
-            parsed_data = parse_resume(saved_filepath)
-            portfolio_data = _transform_parsed_data_to_frontend_format(parsed_data)
+            # Waits briefly for a free parse slot (else AdmissionRejected), then parses, profiled if configured
+            with upload_admission.parse_slot(), _profiled(file.stream, extension, timer):
+                if parse_sandbox is not None:
+                    with timer.stage('spool'):
+                        data = file.stream.read()
+                    parsed_data = parse_sandbox.run(data, filename, timer=timer, stats=extraction_stats,
+                                                    fingerprint=text_fingerprint)
+                else:
+                    parsed_data = parse_resume(file.stream, filename=filename,
+                                               spill_threshold=app.config['PARSE_SPILL_THRESHOLD'],
+                                               spill_dir=app.config['UPLOAD_FOLDER'],
+                                               timer=timer, stats=extraction_stats,
+                                               fingerprint=text_fingerprint,
+                                               reuse=_near_duplicate_hook(cache_key, near_duplicate_info) if near_duplicates else None,
+                                               **parse_options)
+            if 'reused' not in near_duplicate_info: # A reused parse describes another document
+                parse_cache.put(cache_key, parsed_data)
+            with timer.stage('near_duplicates'):
+                near_matches = _index_upload(cache_key, filename, extraction_stats.pop('fingerprint', None),
+                                             near_duplicate_info)
+            with timer.stage('persist'):
+                portfolio_id = _persist_portfolio(parsed_data, filename, cache_key)
+            with timer.stage('transform'):
+                portfolio_data = _transform_parsed_data_to_frontend_format(parsed_data)
+                portfolio_data['portfolioId'] = portfolio_id
+                portfolio_data['nearDuplicates'] = _near_duplicate_json(near_matches)
+                if 'reused' in near_duplicate_info:
+                    portfolio_data['reusedFrom'] = _near_duplicate_json([near_duplicate_info['reused']])[0]
+        except ParseLimitExceeded as le:
+            app.logger.warning(f"Parse of '{filename}' stopped by the sandbox ({le.reason}): {le}")
+            _record_upload_metrics(timer, 'limit', upload_size)
+            return jsonify({"error": "This resume could not be processed within the server's resource limits. "
+                                     "The file may be corrupted.", "reason": le.reason}), 422
+        except AdmissionRejected as ar:
+            app.logger.warning(f'No parse slot for {filename}: {ar}')
+            _record_upload_metrics(timer, 'busy', upload_size)
+            return _admission_rejected_response(ar)
+        except QueueFullError:
+            app.logger.warning(f'Parse sandbox busy, rejecting upload of {filename}.')
+            _record_upload_metrics(timer, 'busy', upload_size)
+            response = jsonify({"error": "Server is busy processing other resumes. Please retry shortly."})
+            response.headers['Retry-After'] = '1'
+            return response, 429
         except ValueError as ve: # Catch specific errors from parser if possible
             app.logger.error(f"Unsupported file type or parsing error for '{filename}': {ve}", exc_info=True)
+            _record_upload_metrics(timer, 'invalid', upload_size)
             return jsonify({"error": str(ve)}), 400 # Or 422 Unprocessable Entity
         except Exception as e:
             app.logger.error(f"Error processing resume '{filename}': {e}", exc_info=True)
+            _record_upload_metrics(timer, 'error', upload_size)
             error_message = str(e) if app.debug else "Failed to process resume data."
             return jsonify({"error": error_message}), 500
         finally:
-            # Clean up uploaded file after processing, unless configured to keep
-            if os.path.exists(saved_filepath) and app.config.get('DELETE_UPLOADED_FILES_AFTER_PROCESSING', True):
-                try:
-                    os.remove(saved_filepath)
-                    app.logger.info(f"Removed temporary file: {saved_filepath}")
-                except OSError as e:
-                    app.logger.error(f"Error removing temporary file {saved_filepath}: {e}", exc_info=True)
+            with timer.stage('cleanup'):
+                file.close()
         
-        return jsonify(portfolio_data), 200
+        _record_upload_metrics(timer, 'parsed', upload_size, extraction_stats)
+        return _with_timing_header(jsonify(portfolio_data), timer), 200
     else:
         app.logger.warning(f'File type not allowed for {file.filename}.')
         allowed_types_str = ', '.join(sorted(list(current_app.config['ALLOWED_EXTENSIONS'])))
         return jsonify({"error": f"File type not allowed. Allowed types: {allowed_types_str}"}), 400
 
+@app.route('/api/upload/batch', methods=['POST'])
+@_rate_limited
+def upload_resume_batch():
+    """
+    Parses many resumes at once. Accepts multipart 'resumes' files and/or zip archives
+    and streams back one NDJSON record per resume as soon as it has been parsed.
+    """
+    files = request.files.getlist('resumes') + request.files.getlist('archive')
+    files = [file for file in files if file.filename]
+    if not files:
+        return jsonify({"error": "No files in the request. Send 'resumes' files or a zip 'archive'."}), 400
+
+    max_files = app.config['BATCH_MAX_FILES']
+    for file in files:
+        name = file.filename.lower()
+        if not name.endswith('.zip') and not allowed_file(name):
+            allowed_types_str = ', '.join(sorted(list(current_app.config['ALLOWED_EXTENSIONS'])))
+            return jsonify({"error": f"File type not allowed for '{file.filename}'. Allowed types: {allowed_types_str}, zip"}), 400
+        if name.endswith('.zip') and not zipfile.is_zipfile(file.stream):
+            return jsonify({"error": f"'{file.filename}' is not a valid zip archive."}), 400
+        file.stream.seek(0)
+
+    batch_parse_options = dict(parse_options, fingerprint=text_fingerprint) if near_duplicates is not None else parse_options
+
+    columnar = None
+    if app.config['COLUMNAR_EXPORT_DIR']:
+        from columnar_export import ColumnarExportWriter # Imports pyarrow, so only when exporting
+        try:
+            columnar = ColumnarExportWriter(app.config['COLUMNAR_EXPORT_DIR'])
+        except (RuntimeError, OSError) as e:
+            app.logger.error(f"Columnar export disabled for this batch: {e}")
+    batch_id = uuid.uuid4().hex
+
+    def generate():
+        ok_count = error_count = 0
+        try:
+            rejected = [] # Entries failing the signature check, reported without being parsed
+            uploads = _iter_batch_uploads(files, max_files, rejected if app.config['ADMISSION_CHECK_SIGNATURE'] else None)
+            records = iter_batch_results(uploads, _get_batch_executor(), parse_options=batch_parse_options,
+                                         replace_executor=_replace_batch_executor, sandbox=parse_sandbox)
+            for record in _with_rejected(records, rejected):
+                if columnar is not None and record['ok']:
+                    columnar.write_result(record['result'], f"batch:{batch_id}:{record['file']}", source=record['file'])
+                sig = record.pop('fingerprint', None)
+                if sig is not None:
+                    # Batch entries are keyed by their signature: identical text, one entry
+                    key = 'text:' + hashlib.sha256(sig.tobytes()).hexdigest()
+                    record['nearDuplicates'] = _near_duplicate_json(
+                        near_duplicates.query(sig, app.config['NEAR_DUPLICATE_THRESHOLD'], limit=5, exclude=key))
+                    near_duplicates.add(key, sig, {'filename': record['file']})
+                if record['ok']:
+                    ok_count += 1
+                else:
+                    error_count += 1
+                yield json.dumps(record) + '\n'
+        except (ValueError, zipfile.BadZipFile) as e:
+            app.logger.warning(f"Batch upload aborted: {e}")
+            yield json.dumps({"ok": False, "error": str(e)}) + '\n'
+        finally:
+            if columnar is not None:
+                columnar.close() # Keeps the rows of a batch cut short too
+        app.logger.info(f"Batch upload finished: {ok_count} parsed, {error_count} errors")
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_parse_job(job_id):
+    job = parse_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired."}), 404
+
+    payload = {"jobId": job['id'], "status": job['status'], "filename": job['filename']}
+    if job['status'] == JOB_DONE:
+        payload["result"] = _transform_parsed_data_to_frontend_format(job['result'])
+        payload["result"]["portfolioId"] = _persist_portfolio(job['result'], job['filename'], job['key'])
+    elif job['status'] == JOB_FAILED:
+        error = job['error']
+        if isinstance(error, ParseLimitExceeded):
+            payload["error"] = ("This resume could not be processed within the server's resource limits. "
+                                "The file may be corrupted.")
+            payload["reason"] = error.reason
+        elif isinstance(error, QueueFullError):
+            payload["error"] = "Server is busy processing other resumes. Please retry shortly."
+        elif isinstance(error, ValueError):
+            payload["error"] = str(error)
+        else:
+            payload["error"] = str(error) if app.debug else "Failed to process resume data."
+    return jsonify(payload), 200
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def delete_parse_job(job_id):
+    if not parse_jobs.discard(job_id):
+        return jsonify({"error": "Job not found or expired."}), 404
+    return '', 204
+
+def _reparse_response(session_id, state, status=200):
+    payload = {
+        "stateId": session_id,
+        "revision": state.revision,
+        "result": _transform_parsed_data_to_frontend_format(state.result()),
+        "stats": state.last_stats,
+    }
+    return jsonify(payload), status
+
+@app.route('/api/reparse', methods=['POST'])
+def reparse_resume_text():
+    """
+    Re-parses edited resume text, redoing only the sections an edit touched.
+
+    {"text": ...} starts an edit session and returns its stateId and revision with the
+    parse result. {"stateId", "revision", "edits": [{"start", "end", "text"}, ...]} or
+    {"stateId", "revision", "text"} updates the session; `revision` must be the one the
+    client last received (409 otherwise), and the response carries the new revision.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Expected a JSON object."}), 400
+    text = payload.get('text')
+    edits = payload.get('edits')
+    if text is not None and not isinstance(text, str):
+        return jsonify({"error": "'text' must be a string."}), 400
+    if edits is not None and not isinstance(edits, list):
+        return jsonify({"error": "'edits' must be a list."}), 400
+    max_chars = app.config['PARSE_MAX_CHARS']
+
+    session_id = payload.get('stateId')
+    if session_id is None:
+        if text is None:
+            return jsonify({"error": "Send 'text' to start a session, or a 'stateId' with edits."}), 400
+        if max_chars and len(text) > max_chars:
+            return jsonify({"error": f"Text exceeds the limit of {max_chars} characters."}), 413
+        session_id, state, lock = reparse_sessions.create(text)
+        with lock:
+            return _reparse_response(session_id, state, 201)
+
+    session = reparse_sessions.get(session_id) if isinstance(session_id, str) else None
+    if session is None:
+        return jsonify({"error": "Edit session not found or expired. Start a new one with the full text."}), 404
+    if (text is None) == (edits is None):
+        return jsonify({"error": "Send either 'edits' or 'text' with a stateId."}), 400
+    state, lock = session
+    with lock:
+        if payload.get('revision') != state.revision:
+            return jsonify({"error": "Revision mismatch.", "revision": state.revision}), 409
+        new_length = len(text) if text is not None else state.new_length(edits)
+        if max_chars and new_length > max_chars:
+            return jsonify({"error": f"Text exceeds the limit of {max_chars} characters."}), 413
+        try:
+            if text is not None:
+                state.replace_text(text)
+            else:
+                state.apply_edits(edits)
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        except Exception as e:
+            app.logger.error(f"Error re-parsing session {session_id}: {e}", exc_info=True)
+            reparse_sessions.discard(session_id) # The state may be inconsistent
+            error_message = str(e) if app.debug else "Failed to re-parse resume text."
+            return jsonify({"error": error_message}), 500
+        return _reparse_response(session_id, state)
+
+@app.route('/api/reparse/<session_id>', methods=['DELETE'])
+def delete_reparse_session(session_id):
+    if not reparse_sessions.discard(session_id):
+        return jsonify({"error": "Edit session not found or expired."}), 404
+    return '', 204
+
+# Rendered portfolios show text from uploaded resumes. It is escaped by the template;
+# the policy also keeps any markup that slips through from running scripts.
+PORTFOLIO_CSP = ("default-src 'none'; style-src 'self' https://fonts.googleapis.com; "
+                 "font-src https://fonts.gstatic.com; img-src * data:; base-uri 'none'; form-action 'none'")
+
+def _portfolio_html_response(html, digest):
+    response = Response(html, mimetype='text/html')
+    response.headers['Content-Security-Policy'] = PORTFOLIO_CSP
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    response.set_etag(digest)
+    response.headers['Cache-Control'] = 'no-cache' # Always revalidate; a matching ETag costs a 304
+    return response.make_conditional(request)
+
+@app.route('/api/portfolio/render', methods=['POST'])
+def render_portfolio():
+    """
+    Renders the portfolio page for the posted resume data (parse_resume output or the
+    /api/upload response) and returns the HTML. The page is then also served, with a
+    strong ETag, from the URL in the Location header.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Expected a JSON object with the resume data."}), 400
+    try:
+        html, digest = portfolio_renderer.render(_portfolio_data_from_payload(payload))
+    except Exception as e:
+        app.logger.error(f"Error rendering portfolio: {e}", exc_info=True)
+        error_message = str(e) if app.debug else "Failed to render portfolio."
+        return jsonify({"error": error_message}), 500
+    response = _portfolio_html_response(html, digest)
+    response.headers['Location'] = f"/api/portfolio/render/{digest}"
+    return response
+
+@app.route('/api/portfolio/render/<digest>', methods=['GET'])
+def get_rendered_portfolio(digest):
+    if request.if_none_match.contains(digest): # Answer revalidation without touching the cache
+        response = Response(status=304)
+        response.set_etag(digest)
+        return response
+    html = portfolio_renderer.get(digest)
+    if html is None:
+        return jsonify({"error": "Rendered portfolio not found or expired. Render it again."}), 404
+    return _portfolio_html_response(html, digest)
+
+def _get_portfolio_or_404(public_id):
+    portfolio = Portfolio.query.filter_by(public_id=public_id).first()
+    if portfolio is None:
+        return None, (jsonify({"error": "Portfolio not found."}), 404)
+    return portfolio, None
+
+@app.route('/api/portfolios/<portfolio_id>', methods=['GET'])
+def get_portfolio(portfolio_id):
+    portfolio, error = _get_portfolio_or_404(portfolio_id)
+    if error:
+        return error
+    portfolio_data = _transform_parsed_data_to_frontend_format(ParsedResume.from_dict(portfolio.parsed_data or {}))
+    portfolio_data['portfolioId'] = portfolio.public_id
+    portfolio_data['filename'] = portfolio.resume_filename
+    portfolio_data['createdAt'] = portfolio.created_at.isoformat() if portfolio.created_at else None
+    portfolio_data['htmlUrl'] = f"/api/portfolios/{portfolio.public_id}/html"
+    return jsonify(portfolio_data), 200
+
+def _similarity_query_args():
+    """Parses the optional ?threshold= and ?limit= of the similarity endpoints."""
+    threshold = request.args.get('threshold', app.config['NEAR_DUPLICATE_THRESHOLD'], type=float)
+    limit = request.args.get('limit', 10, type=int)
+    if not 0 < threshold <= 1 or not 0 < limit <= 100:
+        raise ValueError("threshold must be in (0, 1] and limit in 1-100.")
+    return threshold, limit
+
+@app.route('/api/similar', methods=['POST'])
+def find_similar_resumes():
+    """
+    Finds indexed resumes similar to an uploaded file ('resume' form field) or to posted
+    JSON {"text": ...}. Accepts ?threshold= (estimated Jaccard similarity) and ?limit=.
+    """
+    if near_duplicates is None:
+        return jsonify({"error": "Near-duplicate detection is disabled."}), 404
+    try:
+        threshold, limit = _similarity_query_args()
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    file = request.files.get('resume')
+    if file is not None and file.filename:
+        filename = secure_filename(file.filename)
+        if not allowed_file(filename):
+            return jsonify({"error": "File type not allowed."}), 400
+        try:
+            if parse_sandbox is not None:
+                stats = {}
+                parse_sandbox.run(file.stream.read(), filename, stats=stats, fingerprint=text_fingerprint)
+                sig = stats.get('fingerprint')
+            else:
+                text, _ = extract_resume_text(file.stream, filename=filename,
+                                              spill_threshold=app.config['PARSE_SPILL_THRESHOLD'],
+                                              spill_dir=app.config['UPLOAD_FOLDER'], **parse_options)
+                sig = text_fingerprint(text)
+        except ParseLimitExceeded as le:
+            return jsonify({"error": "This resume could not be processed within the server's resource limits.",
+                            "reason": le.reason}), 422
+        except QueueFullError:
+            return jsonify({"error": "Server is busy processing other resumes. Please retry shortly."}), 429
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        finally:
+            file.close()
+    else:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or not isinstance(payload.get('text'), str):
+            return jsonify({"error": "Send a 'resume' file or a JSON object with 'text'."}), 400
+        sig = text_fingerprint(payload['text'])
+
+    return jsonify({"matches": _near_duplicate_json(near_duplicates.query(sig, threshold, limit))}), 200
+
+@app.route('/api/portfolios/<portfolio_id>/similar', methods=['GET'])
+def get_similar_portfolios(portfolio_id):
+    """Lists indexed resumes similar to a stored portfolio's upload."""
+    if near_duplicates is None:
+        return jsonify({"error": "Near-duplicate detection is disabled."}), 404
+    try:
+        threshold, limit = _similarity_query_args()
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    portfolio, error = _get_portfolio_or_404(portfolio_id)
+    if error:
+        return error
+    entry = near_duplicates.get(portfolio.content_hash) if portfolio.content_hash else None
+    if entry is None:
+        return jsonify({"error": "This portfolio is not in the near-duplicate index."}), 404
+    matches = near_duplicates.query(entry[0], threshold, limit, exclude=portfolio.content_hash)
+    return jsonify({"portfolioId": portfolio_id, "matches": _near_duplicate_json(matches)}), 200
+
+@app.route('/api/portfolios/<portfolio_id>/html', methods=['GET'])
+def get_portfolio_html(portfolio_id):
+    portfolio, error = _get_portfolio_or_404(portfolio_id)
+    if error:
+        return error
+    # Always rendered from the parsed data (memoized), never from HTML stored by an older template
+    html, digest = portfolio_renderer.render(portfolio.parsed_data or {})
+    return _portfolio_html_response(html, digest)
+
+@app.route('/api/portfolios/<portfolio_id>/export', methods=['GET'])
+def export_portfolio(portfolio_id):
+    """
+    Streams a zip with the portfolio's static site (HTML and stylesheet, plus .gz and .br
+    variants of each). The archive is generated chunk by chunk as it is sent.
+    """
+    portfolio, error = _get_portfolio_or_404(portfolio_id)
+    if error:
+        return error
+    html, _ = portfolio_renderer.render(portfolio.parsed_data or {})
+    files = portfolio_export_files(html) # Loaded before streaming; the generator needs no DB session
+    download_name = secure_filename(os.path.splitext(portfolio.resume_filename or '')[0]) or f"portfolio-{portfolio.public_id}"
+    response = Response(iter_zip_stream(files), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment; filename="{download_name}-site.zip"'
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/captures', methods=['GET'])
+@_admin_only
+def list_parse_captures():
+    """Lists captured slow or sampled parses, newest first. Replay them with `python profiler.py replay <id>`."""
+    if parse_profiler is None:
+        return jsonify({"error": "Parse profiling is not enabled (set PARSE_PROFILE_DIR)."}), 404
+    return jsonify({"captures": list_captures(parse_profiler.capture_dir), **parse_profiler.stats()}), 200
+
+@app.route('/api/admin/captures/<capture_id>', methods=['GET'])
+@_admin_only
+def get_parse_capture(capture_id):
+    meta = load_capture(parse_profiler.capture_dir, capture_id) if parse_profiler is not None else None
+    if meta is None:
+        return jsonify({"error": "Capture not found."}), 404
+    return jsonify(meta), 200
+
+@app.route('/api/admin/captures/<capture_id>/<artifact>', methods=['GET'])
+@_admin_only
+def download_parse_capture(capture_id, artifact):
+    """Downloads a capture's profile ('profile') or saved input ('input')."""
+    meta = load_capture(parse_profiler.capture_dir, capture_id) if parse_profiler is not None else None
+    name = {'profile': meta.get('profile'), 'input': meta.get('input_file')}.get(artifact) if meta else None
+    if not name:
+        return jsonify({"error": "Not found."}), 404
+    return send_from_directory(os.path.join(parse_profiler.capture_dir, capture_id), name, as_attachment=True)
+
+@app.route('/api/cache/stats', methods=['GET'])
+def parse_cache_stats():
+    return jsonify(parse_cache.stats()), 200
+
 # --- Serve React App ---
+def _serve_static_asset(asset):
+    encoding, body, etag = asset.select(request.accept_encodings)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, content_type=asset.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = asset.cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_react_app(path):
-    if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
+    if path.startswith('api/'): # Unknown API routes must not fall through to the SPA
+        return jsonify({"error": "Not found."}), 404
+    build_dir = app.config['FRONTEND_BUILD_DIR']
+    if app.config['STATIC_MANIFEST']:
+        # Unknown paths are client-side routes and get index.html
+        asset = (path and static_manifest.get(path)) or static_manifest.get('index.html')
+        if asset is None:
+            app.logger.error(f"index.html not found in frontend build: {build_dir}")
+            return jsonify({"error": "Application not built or index.html missing. Please build the frontend."}), 404
+        return _serve_static_asset(asset)
+
+    if path != "" and os.path.exists(os.path.join(build_dir, path)):
+        return send_from_directory(build_dir, path)
     else:
-        index_path = os.path.join(app.static_folder, 'index.html')
+        index_path = os.path.join(build_dir, 'index.html')
         if not os.path.exists(index_path):
-            app.logger.error(f"index.html not found in static folder: {app.static_folder}")
+            app.logger.error(f"index.html not found in static folder: {build_dir}")
             # This usually means the frontend hasn't been built or static_folder is misconfigured.
             return jsonify({"error": "Application not built or index.html missing. Please build the frontend."}), 404
-        return send_from_directory(app.static_folder, 'index.html')
+        return send_from_directory(build_dir, 'index.html')
 
 if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (see wsgi.py and gunicorn.conf.py).
     # Debug mode is typically controlled by FLASK_DEBUG env var or app.config['DEBUG']
     # Port is hardcoded to 9000 as per startup.sh expectation.
     app.run(host='0.0.0.0', port=9000, debug=app.config.get('DEBUG', False))
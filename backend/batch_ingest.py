@@ -0,0 +1,227 @@
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from resume_parser import parse_resume, MAX_PAGES, MAX_CHARS, PDF_PAGE_TIME_BUDGET
+from sandbox import ParseLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+
+def _parse_batch_item(name, source, parse_options, sandbox=None):
+    """
+    Parses one batch entry in a worker process and returns its NDJSON record.
+
+    If parse_options has a `fingerprint` function, its value for the extracted text is
+    returned in record['fingerprint'] for the caller to use (and drop before writing).
+    With a `sandbox` (a sandbox.SandboxPool, run from a thread) the entry is parsed by
+    sandbox.run under its limits, and a stopped parse is reported with its 'reason'.
+    """
+    start = time.perf_counter()
+    try:
+        stats = {}
+        if sandbox is not None:
+            result = sandbox.run(source, name, stats=stats, fingerprint=parse_options.get('fingerprint'))
+        else:
+            result = parse_resume(source, filename=name, stats=stats, **parse_options)
+        record = {'file': name, 'ok': True, 'result': result.to_dict()}
+        if 'fingerprint' in stats:
+            record['fingerprint'] = stats['fingerprint']
+    except ParseLimitExceeded as le:
+        record = {'file': name, 'ok': False, 'reason': le.reason,
+                  'error': "This resume could not be processed within the server's resource limits."}
+    except Exception as e: # Report per file; one bad resume must not stop the batch
+        record = {'file': name, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return record
+
+
+def iter_batch_results(items, executor, max_in_flight=None, parse_options=None, replace_executor=None,
+                       sandbox=None):
+    """
+    Fans `items` out over `executor` and yields one record per item as soon as it finishes.
+
+    Args:
+        items: Iterable of (name, source) pairs, where source is a path or bytes. It is
+               consumed lazily, so at most `max_in_flight` items are held at once.
+        executor: A concurrent.futures executor (normally a ProcessPoolExecutor).
+        max_in_flight (int): Cap on submitted but unfinished items. Defaults to twice
+                             the executor's worker count.
+        parse_options (dict): Extra keyword arguments for parse_resume (e.g. budgets, or
+                              a picklable `fingerprint` function).
+        replace_executor: Optional callable that takes a broken executor (a worker died,
+                          e.g. killed for memory) and returns a working one. Items in
+                          flight on the broken pool are reported as errors and the rest
+                          of the batch continues on the new one. Without it, every item
+                          submitted after the pool broke is reported as an error.
+        sandbox: Optional sandbox.SandboxPool to parse every item in, with its resource
+                 limits and timeout. `executor` must then be a ThreadPoolExecutor (the
+                 pool cannot be pickled) and sources must be bytes.
+
+    Yields:
+        dict: {'file', 'ok', 'elapsed_ms', and 'result' or 'error'} in completion order;
+              sandboxed items stopped by a limit also have a 'reason'.
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * (getattr(executor, '_max_workers', None) or os.cpu_count() or 1)
+
+    parse_options = parse_options or {}
+    items = iter(items)
+    pending = {}
+    exhausted = False
+    while pending or not exhausted:
+        while not exhausted and len(pending) < max_in_flight:
+            try:
+                name, source = next(items)
+            except StopIteration:
+                exhausted = True
+                break
+            try:
+                future = executor.submit(_parse_batch_item, name, source, parse_options, sandbox)
+            except BrokenProcessPool as e:
+                if replace_executor is None:
+                    yield {'file': name, 'ok': False, 'error': f"{type(e).__name__}: {e}", 'elapsed_ms': None}
+                    continue
+                executor = replace_executor(executor)
+                try:
+                    future = executor.submit(_parse_batch_item, name, source, parse_options, sandbox)
+                except BrokenProcessPool as e:
+                    yield {'file': name, 'ok': False, 'error': f"{type(e).__name__}: {e}", 'elapsed_ms': None}
+                    continue
+            pending[future] = name
+
+        if not pending:
+            break
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            try:
+                yield future.result()
+            except Exception as e: # e.g. a worker process died
+                yield {'file': name, 'ok': False, 'error': f"{type(e).__name__}: {e}", 'elapsed_ms': None}
+
+
+def collect_input_files(patterns):
+    """Expands directories (recursively) and glob patterns into a sorted list of resume paths."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = glob.iglob(os.path.join(pattern, '**', '*'), recursive=True)
+        else:
+            candidates = glob.iglob(pattern, recursive=True)
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.add(os.path.normpath(path))
+    return sorted(paths)
+
+
+def load_completed_files(output_path):
+    """Returns the files already parsed successfully according to an existing NDJSON output."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue # Partial line from an interrupted run
+            if record.get('ok'):
+                completed.add(record.get('file'))
+    return completed
+
+
+def _prepare_for_append(output_path):
+    # If a previous run was killed mid-write, terminate its partial last line
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        with open(output_path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m resume_parser',
+        description="Parse resumes in bulk and write one NDJSON record per file as each finishes.")
+    arg_parser.add_argument('inputs', nargs='+', help="Resume files, directories or glob patterns (e.g. 'cvs/**/*.pdf').")
+    arg_parser.add_argument('-o', '--output', help="NDJSON output file (default: stdout).")
+    arg_parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    arg_parser.add_argument('--max-pages', type=int, default=MAX_PAGES,
+                            help=f"Stop extracting PDFs after this many pages, 0 for no limit (default: {MAX_PAGES}).")
+    arg_parser.add_argument('--max-chars', type=int, default=MAX_CHARS,
+                            help=f"Stop extracting after this many characters, 0 for no limit (default: {MAX_CHARS}).")
+    arg_parser.add_argument('--pdf-reading-order', action='store_true',
+                            help="Extract PDF text in reading order (columns, blocks) instead of content stream order.")
+    arg_parser.add_argument('--pdf-page-seconds', type=float, default=PDF_PAGE_TIME_BUDGET,
+                            help=f"Time budget for reading-order extraction of one PDF page, 0 for no limit (default: {PDF_PAGE_TIME_BUDGET}).")
+    arg_parser.add_argument('--resume', action='store_true',
+                            help="Skip files already parsed successfully in --output and append to it.")
+    arg_parser.add_argument('--parquet', metavar='DIR',
+                            help="Also stream parsed results into a new Parquet part file in DIR (needs pyarrow).")
+    args = arg_parser.parse_args(argv)
+
+    if args.resume and not args.output:
+        arg_parser.error("--resume requires --output")
+
+    parse_options = {'max_pages': args.max_pages or None, 'max_chars': args.max_chars or None,
+                     'pdf_reading_order': args.pdf_reading_order, 'page_time_budget': args.pdf_page_seconds or None}
+    paths = collect_input_files(args.inputs)
+    skipped = 0
+    if args.resume:
+        completed = load_completed_files(args.output)
+        remaining = [path for path in paths if path not in completed]
+        skipped = len(paths) - len(remaining)
+        paths = remaining
+        _prepare_for_append(args.output)
+
+    if args.output:
+        out = open(args.output, 'a' if args.resume else 'w', encoding='utf-8')
+    else:
+        out = sys.stdout
+
+    columnar = None
+    if args.parquet:
+        from columnar_export import ColumnarExportWriter
+        columnar = ColumnarExportWriter(args.parquet)
+
+    def replace_executor(broken):
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Batch worker pool is broken (a worker died); starting a new one")
+        executors.append(ProcessPoolExecutor(max_workers=args.workers))
+        return executors[-1]
+
+    ok_count = error_count = 0
+    start = time.perf_counter()
+    executors = [ProcessPoolExecutor(max_workers=args.workers)]
+    try:
+        for record in iter_batch_results(((path, path) for path in paths), executors[0],
+                                         parse_options=parse_options, replace_executor=replace_executor):
+            out.write(json.dumps(record) + '\n')
+            out.flush() # Each finished file is durable, which is what --resume relies on
+            if record['ok']:
+                ok_count += 1
+                if columnar is not None:
+                    columnar.write_result(record['result'], os.path.abspath(record['file']), source=record['file'])
+            else:
+                error_count += 1
+    finally:
+        for executor in executors:
+            executor.shutdown()
+        if out is not sys.stdout:
+            out.close()
+        if columnar is not None:
+            columnar.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Parsed {ok_count} resumes, {error_count} errors, {skipped} skipped (already done) in {elapsed:.1f}s",
+          file=sys.stderr)
+    return 1 if error_count else 0
@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import columnar_export
+from corpus import SKILLS, COMPANIES, TITLES, FIRST_NAMES, LAST_NAMES
+
+# Benchmark for the columnar export: write throughput and size of a Parquet export of
+# synthetic parse results, and the time to find every resume listing one skill, against
+# the current alternative of loading each portfolio's JSON blob from SQLite.
+#
+#   python benchmarks/bench_columnar_export.py --rows 1000000 --sqlite-rows 50000
+
+
+def _make_result(rng):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return {
+        'name': name,
+        'title': rng.choice(TITLES),
+        'email': f"{name.lower().replace(' ', '.')}{rng.randint(1, 99999)}@example.com",
+        'phone': f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        'linkedin': '', 'github': '',
+        'summary': 'Engineer with experience building reliable systems.',
+        'experience': [{'title': rng.choice(TITLES), 'company': rng.choice(COMPANIES), 'period': '2019 - Present',
+                        'description': 'Built and operated services.'} for _ in range(rng.randint(1, 4))],
+        'education': [{'degree': 'B.S. in Computer Science', 'institution': 'State University', 'period': '2015',
+                       'description': ''}],
+        'skills': sorted(rng.sample(SKILLS, rng.randint(5, 15))),
+        'truncated': False,
+    }
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark the Parquet export against JSON blobs in SQLite.")
+    arg_parser.add_argument('--rows', type=int, default=200000, help="Resumes in the Parquet export.")
+    arg_parser.add_argument('--sqlite-rows', type=int, default=20000,
+                            help="Resumes in the SQLite comparison (its scan time is extrapolated to --rows).")
+    arg_parser.add_argument('--skill', default='Kubernetes')
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    rng = random.Random(0)
+    # A pool of distinct results reused across rows keeps generation out of the timings
+    pool = [_make_result(rng) for _ in range(1000)]
+    results = {'rows': args.rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        export_dir = os.path.join(tmp, 'export')
+        start = time.perf_counter()
+        with columnar_export.ColumnarExportWriter(export_dir) as writer:
+            for i in range(args.rows):
+                writer.write_result(pool[i % len(pool)], f"row:{i}", source=f"resume_{i}.pdf")
+        results['write_seconds'] = round(time.perf_counter() - start, 2)
+        results['write_rows_per_sec'] = round(args.rows / results['write_seconds'])
+        results['export_mb'] = round(sum(os.path.getsize(path) for path in writer.files_written) / 1e6, 1)
+
+        start = time.perf_counter()
+        matches = columnar_export.find_by_skill(export_dir, args.skill)
+        results['find_skill_seconds'] = round(time.perf_counter() - start, 3)
+        results['find_skill_matches'] = matches.num_rows
+
+        start = time.perf_counter()
+        emails = columnar_export.scan(export_dir, columns=['email'])
+        results['scan_one_column_seconds'] = round(time.perf_counter() - start, 3)
+        assert emails.num_rows == args.rows
+
+        # The alternative today: every portfolio's parsed_data TEXT blob, json.loads-ed per row
+        connection = sqlite3.connect(os.path.join(tmp, 'portfolios.db'))
+        connection.execute("CREATE TABLE portfolios (id INTEGER PRIMARY KEY, parsed_data TEXT)")
+        connection.executemany("INSERT INTO portfolios (parsed_data) VALUES (?)",
+                               ((json.dumps(pool[i % len(pool)]),) for i in range(args.sqlite_rows)))
+        connection.commit()
+        start = time.perf_counter()
+        found = 0
+        for (parsed_data,) in connection.execute("SELECT parsed_data FROM portfolios"):
+            found += args.skill in json.loads(parsed_data)['skills']
+        sqlite_seconds = time.perf_counter() - start
+        connection.close()
+        results['sqlite_json_seconds_extrapolated'] = round(sqlite_seconds * args.rows / args.sqlite_rows, 2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for name, value in results.items():
+        print(f"{name:<34} {value}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
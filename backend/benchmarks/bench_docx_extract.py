@@ -0,0 +1,87 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import corpus
+import resume_parser
+
+# Benchmark for DOCX text extraction: the streaming zip/iterparse extractor against the
+# python-docx path it replaced, on plain 'flow' documents and on 'template' documents
+# (header, table and text box content). Reports speed and how much of each document's
+# ground truth (contacts, experience titles, skills) ends up in the extracted text.
+#
+#   python benchmarks/bench_docx_extract.py --count 5 --repeat 5
+
+
+def _python_docx_text(data):
+    return '\n'.join(resume_parser._iter_docx_paragraphs_python_docx(io.BytesIO(data), 'bench', {}))
+
+
+def _streaming_text(data):
+    return '\n'.join(resume_parser._iter_docx_paragraphs(io.BytesIO(data), 'bench', {}))
+
+
+EXTRACTORS = {'python-docx': _python_docx_text, 'streaming': _streaming_text}
+
+
+def _truth_terms(spec):
+    terms = [spec['name'], spec['email'], spec['phone']]
+    terms += [item['title'] for item in spec['experience']]
+    terms += [item['degree'] for item in spec['education']]
+    terms += spec['skills']
+    return terms
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compare DOCX extractors for speed and coverage.")
+    arg_parser.add_argument('--count', type=int, default=3, help="Documents per size and layout.")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Timed passes over the documents.")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    resume_parser.warmup()
+    entries = corpus.build_corpus(args.count, formats=('docx',), docx_layouts=corpus.DOCX_LAYOUTS)
+    results = []
+    for layout in corpus.DOCX_LAYOUTS:
+        for size in corpus.SIZES:
+            docs = [entry for entry in entries if entry['layout'] == layout and entry['size'] == size]
+            row = {'layout': layout, 'size': size, 'documents': len(docs)}
+            for name, extract in EXTRACTORS.items():
+                samples = []
+                for _ in range(args.repeat):
+                    for entry in docs:
+                        start = time.perf_counter()
+                        extract(entry['data'])
+                        samples.append(time.perf_counter() - start)
+                found = total = 0
+                for entry in docs:
+                    text = extract(entry['data'])
+                    terms = _truth_terms(entry['truth'])
+                    total += len(terms)
+                    found += sum(1 for term in terms if term in text)
+                row[name] = {'median_ms': round(statistics.median(samples) * 1000, 3),
+                             'coverage': round(found / total, 3) if total else None}
+            row['speedup'] = round(row['python-docx']['median_ms'] / row['streaming']['median_ms'], 2)
+            results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'layout':<9} {'size':<7} {'python-docx ms':>15} {'streaming ms':>13} {'speedup':>8} {'coverage (old -> new)':>22}")
+    for row in results:
+        coverage = f"{row['python-docx']['coverage']:.0%} -> {row['streaming']['coverage']:.0%}"
+        print(f"{row['layout']:<9} {row['size']:<7} {row['python-docx']['median_ms']:>15} "
+              f"{row['streaming']['median_ms']:>13} {row['speedup']:>7}x {coverage:>22}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Import-time benchmark: how long a fresh interpreter takes to become ready to serve,
+# with the parsing libraries loaded lazily versus eagerly (the previous behaviour,
+# reproduced by importing docx and PyPDF2 up front), and the one-off cost of the first
+# parse of each format that lazy loading defers.
+#
+#   python benchmarks/bench_import.py --repeat 10
+
+SCENARIOS = {
+    'resume_parser (lazy)': "import resume_parser",
+    'resume_parser (eager)': "import docx, PyPDF2, resume_parser",
+    'resume_parser + warmup()': "import resume_parser; resume_parser.warmup()",
+    'app (lazy)': "import app",
+    'app (PARSE_PRELOAD=1)': "import app",
+}
+
+TIMED_SNIPPET = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def _time_scenario(name, statement, env):
+    scenario_env = dict(env)
+    if 'PARSE_PRELOAD' in name:
+        scenario_env['PARSE_PRELOAD'] = '1'
+    output = subprocess.run([sys.executable, '-c', TIMED_SNIPPET.format(statement=statement)],
+                            cwd=BACKEND_DIR, env=scenario_env, capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Measure cold import time of the parser and app.")
+    arg_parser.add_argument('--repeat', type=int, default=7, help="Fresh interpreters per scenario.")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the app from touching the real database and upload folder
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                   UPLOAD_FOLDER=os.path.join(tmp, 'uploads'), PARSE_PRELOAD='0', FLASK_DEBUG='0')
+        results = {}
+        for name, statement in SCENARIOS.items():
+            samples = [_time_scenario(name, statement, env) for _ in range(args.repeat)]
+            results[name] = {'median_ms': round(statistics.median(samples) * 1000, 2),
+                             'min_ms': round(min(samples) * 1000, 2)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'scenario':<28} {'median ms':>10} {'min ms':>10}")
+    for name, row in results.items():
+        print(f"{name:<28} {row['median_ms']:>10} {row['min_ms']:>10}")
+    saved = results['resume_parser (eager)']['median_ms'] - results['resume_parser (lazy)']['median_ms']
+    print(f"Lazy loading saves {saved:.1f} ms per cold start until the first PDF/DOCX is parsed.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
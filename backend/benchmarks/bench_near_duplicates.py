@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import minhash
+from bench_parse_sections import make_resume_text
+
+# Benchmark for near-duplicate detection: signature cost, LSH lookup time against a
+# linear scan over every stored signature, and how well lookups find lightly edited
+# copies (recall) without reporting unrelated resumes (false positives).
+#
+#   python benchmarks/bench_near_duplicates.py --documents 2000 --queries 200
+
+
+def _edit(rng, text, changed_lines):
+    lines = text.split('\n')
+    for _ in range(changed_lines):
+        lines[rng.randrange(len(lines))] = 'Edited ' + ' '.join(rng.choice(['led', 'built', 'team', 'python', 'scaled'])
+                                                               for _ in range(6))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark MinHash signatures and the LSH index.")
+    arg_parser.add_argument('--documents', type=int, default=1000, help="Resumes in the index.")
+    arg_parser.add_argument('--queries', type=int, default=100, help="Edited copies looked up.")
+    arg_parser.add_argument('--sections', type=int, default=8, help="Sections per generated resume.")
+    arg_parser.add_argument('--changed-lines', type=int, default=2, help="Lines replaced in each edited copy.")
+    arg_parser.add_argument('--threshold', type=float, default=0.8)
+    arg_parser.add_argument('--bands', type=int, default=16)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    rng = random.Random(0)
+    texts = [make_resume_text(args.sections, seed=seed) for seed in range(args.documents)]
+    index = minhash.NearDuplicateIndex(bands=args.bands, max_entries=args.documents)
+
+    signature_samples = []
+    signatures = []
+    for text in texts:
+        start = time.perf_counter()
+        sig = minhash.signature(text)
+        signature_samples.append(time.perf_counter() - start)
+        signatures.append(sig)
+    for key, sig in enumerate(signatures):
+        index.add(key, sig)
+
+    lsh_samples = []
+    scan_samples = []
+    found = false_positives = missed_by_lsh = 0
+    for _ in range(args.queries):
+        original = rng.randrange(args.documents)
+        sig = minhash.signature(_edit(rng, texts[original], args.changed_lines))
+
+        start = time.perf_counter()
+        matches = index.query(sig, args.threshold, limit=10)
+        lsh_samples.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scan = [key for key, other in enumerate(signatures) if minhash.similarity(sig, other) >= args.threshold]
+        scan_samples.append(time.perf_counter() - start)
+
+        keys = {key for key, _, _ in matches}
+        found += original in keys
+        false_positives += len(keys - {original})
+        missed_by_lsh += len(set(scan) - keys)
+
+    results = {
+        'documents': args.documents,
+        'signature_median_ms': round(statistics.median(signature_samples) * 1000, 3),
+        'lsh_query_median_ms': round(statistics.median(lsh_samples) * 1000, 3),
+        'linear_scan_median_ms': round(statistics.median(scan_samples) * 1000, 3),
+        'recall': round(found / args.queries, 3),
+        'false_positives': false_positives, # Other resumes reported as near-duplicates
+        'missed_by_lsh': missed_by_lsh, # Matches the linear scan found but no band bucket held
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for name, value in results.items():
+        print(f"{name:<24} {value}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import resume_parser
+import skill_taxonomy
+from resume_model import ParsedResume
+
+# Benchmark for _parse_sections: compares the single-pass scanner against the previous
+# implementation (kept verbatim below) on synthetic resumes of increasing length, and
+# checks that both produce identical output (after mapping legacy skills to the taxonomy).
+#
+#   python benchmarks/bench_parse_sections.py --sections 5 50 500 --repeat 20
+
+# --- Previous implementation (reference for output equivalence and speed) ---
+def legacy_process_section_content(section_name, content_lines, target_dict):
+    if not section_name or not content_lines or section_name not in target_dict:
+        return
+
+    full_content_block = '\n'.join(content_lines).strip()
+    if not full_content_block:
+        return
+
+    if section_name in ['experience', 'education']:
+        # Append the block; structuring will happen later
+        target_dict[section_name].append(full_content_block)
+    elif section_name == 'skills':
+        # Split skills by common delimiters (comma, newline, semicolon, bullet points)
+        raw_skills = re.split(r'[\n,;\u2022*-]', full_content_block)
+        for skill in raw_skills:
+            s = skill.strip()
+            if s and len(s) > 1: # Basic validation for skill length
+                if s not in target_dict[section_name]: # Avoid duplicate skills from same block
+                    target_dict[section_name].append(s)
+    elif section_name == 'summary':
+        # Explicit summary section should overwrite any heuristically gathered summary
+        target_dict[section_name] = full_content_block.strip()
+    # Note: If other generic single-block text sections are added in the future,
+    # they would need specific handling or a reinstated generic 'else' block.
+    # For now, any other section type not explicitly handled above will be ignored here.
+
+def legacy_parse_sections(text_content):
+    parsed_data = {
+        'name': '', 'title': '',
+        'email': '', 'phone': '', 'linkedin': '', 'github': '',
+        'summary': '',
+        'experience': [], 'education': [], 'skills': []
+    }
+
+    # Extract contact info
+    emails = sorted(list(set(re.findall(resume_parser.EMAIL_REGEX, text_content, re.IGNORECASE))))
+    if emails: parsed_data['email'] = emails[0] # Take the first one for simplicity
+    
+    phones = sorted(list(set(re.findall(resume_parser.PHONE_REGEX, text_content))))
+    if phones: parsed_data['phone'] = phones[0]
+
+    linkedin_urls = sorted(list(set(re.findall(resume_parser.LINKEDIN_REGEX, text_content, re.IGNORECASE))))
+    if linkedin_urls: parsed_data['linkedin'] = linkedin_urls[0].replace("https://", "").replace("http://", "")
+
+    github_urls = sorted(list(set(re.findall(resume_parser.GITHUB_REGEX, text_content, re.IGNORECASE))))
+    if github_urls: parsed_data['github'] = github_urls[0].replace("https://", "").replace("http://", "")
+
+    lines = [line.strip() for line in text_content.split('\n') if line.strip()]
+    current_section = None
+    temp_content = []
+    
+    # Attempt to get name and title (heuristic)
+    # Name is often the first prominent line, title might be second or near contact details.
+    if lines:
+        # First line as potential name, if it's not an email or phone or too long
+        first_line = lines[0]
+        if not re.search(resume_parser.EMAIL_REGEX + "|" + resume_parser.PHONE_REGEX, first_line, re.IGNORECASE) and len(first_line.split()) < 6 and len(first_line) < 50:
+            parsed_data['name'] = first_line
+            # Try second line as title
+            if len(lines) > 1:
+                second_line = lines[1]
+                if not re.search(resume_parser.EMAIL_REGEX + "|" + resume_parser.PHONE_REGEX, second_line, re.IGNORECASE) and len(second_line.split()) < 10 and len(second_line) < 70:
+                    # Check if it looks like a section header
+                    is_section_header = any(keyword in second_line.lower() for section_keywords in resume_parser.SECTION_KEYWORDS.values() for keyword in section_keywords)
+                    if not is_section_header:
+                        parsed_data['title'] = second_line
+    
+    # Default if not found
+    if not parsed_data['name']: parsed_data['name'] = 'Your Name'
+    if not parsed_data['title']: parsed_data['title'] = 'Professional Title'
+
+    section_line_indices = set()
+
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        identified_new_section = False
+
+        # Check if line is a section header
+        for section_key_candidate, keywords in resume_parser.SECTION_KEYWORDS.items():
+            # Section headers are usually short and contain keywords
+            if any(keyword in line_lower for keyword in keywords) and len(line.split()) < 6:
+                legacy_process_section_content(current_section, temp_content, parsed_data)
+                current_section = section_key_candidate
+                temp_content = []
+                identified_new_section = True
+                section_line_indices.add(i)
+                break # Found a section, process it
+        # Removed redundant `if identified_new_section: break` as it was inside the loop that sets it
+        
+        if not identified_new_section and i not in section_line_indices:
+            # If line is not part of name/title extraction and not a section header
+            if (parsed_data['name'] and line == parsed_data['name']) or \
+               (parsed_data['title'] and line == parsed_data['title']): # Avoid re-adding name/title
+                continue
+
+            if current_section:
+                temp_content.append(line)
+            elif not parsed_data['summary'] and len(line.split()) > 3: # Content before any explicit section could be summary
+                 # Avoid contact info being part of summary
+                if not re.search(resume_parser.EMAIL_REGEX + "|" + resume_parser.PHONE_REGEX + "|" + resume_parser.LINKEDIN_REGEX + "|" + resume_parser.GITHUB_REGEX, line, re.IGNORECASE):
+                    parsed_data['summary'] += line + "\n"
+
+    legacy_process_section_content(current_section, temp_content, parsed_data)
+
+    # Post-process experience and education for structure
+    parsed_data['experience'] = [(resume_parser._try_structure_item(block, 'experience')) for block in parsed_data.get('experience', [])]
+    parsed_data['education'] = [(resume_parser._try_structure_item(block, 'education')) for block in parsed_data.get('education', [])]
+
+    # Clean up skills: unique, sensible length
+    if parsed_data['skills']:
+        unique_skills = list(set(s.strip().capitalize() for s in parsed_data['skills'] if s.strip() and 1 < len(s.strip()) < 50))
+        parsed_data['skills'] = sorted(unique_skills)
+    else:
+        parsed_data['skills'] = []
+
+    if parsed_data['summary']:
+        parsed_data['summary'] = parsed_data['summary'].strip()
+
+    return parsed_data
+
+
+# --- Synthetic resume text ---
+HEADERS = ['Summary', 'Professional Experience', 'Education', 'Technical Skills', 'Projects',
+           'Career Summary', 'Core Competencies', 'Academic Qualifications', 'Work History', 'Tools']
+WORDS = ('designed built led migrated optimised scalable distributed services pipeline team '
+         'customers revenue latency reliability python java kubernetes analytics platform').split()
+
+def make_resume_text(num_sections, seed=0):
+    rng = random.Random(seed)
+    lines = ['Jane Q. Example', 'Senior Software Engineer',
+             'jane.example42@example.com | +1 (555) 123-4567 | linkedin.com/in/jane-example | github.com/janeex',
+             'Experienced engineer focused on reliable, well tested backend systems at scale.']
+    for i in range(num_sections):
+        lines.append(rng.choice(HEADERS))
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"{rng.choice(WORDS).title()} Engineer")
+            lines.append(f"Example Corp {rng.randint(1, 999)}")
+            lines.append(f"Jan {rng.randint(2000, 2015)} - {rng.choice(['Present', 'Dec 2020', '2019'])}")
+            for _ in range(rng.randint(1, 4)):
+                lines.append('- ' + ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))))
+            lines.append(', '.join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 6))))
+        lines.append('')
+    return '\n'.join(lines)
+
+def time_call(func, text, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark _parse_sections against the previous implementation.")
+    arg_parser.add_argument('--sections', type=int, nargs='+', default=[5, 50, 500],
+                            help="Resume sizes to generate, in number of sections.")
+    arg_parser.add_argument('--repeat', type=int, default=20, help="Timed runs per size and implementation.")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    results = []
+    for num_sections in args.sections:
+        text = make_resume_text(num_sections, seed=num_sections)
+        # Compare in the typed model's stable schema (legacy dicts omit empty keys)
+        expected = ParsedResume.from_dict(legacy_parse_sections(text)).to_dict()
+        # The legacy parser predates the skill taxonomy; map its skills the same way
+        taxonomy = skill_taxonomy.get_default()
+        expected['skills'] = sorted({taxonomy.canonicalize(skill) or skill for skill in expected['skills']})
+        actual = resume_parser._parse_sections(text).to_dict()
+        if actual != expected:
+            raise SystemExit(f"Output mismatch for a {num_sections}-section resume")
+
+        legacy_samples = time_call(legacy_parse_sections, text, args.repeat)
+        current_samples = time_call(resume_parser._parse_sections, text, args.repeat)
+        legacy_ms = statistics.median(legacy_samples) * 1000
+        current_ms = statistics.median(current_samples) * 1000
+        results.append({
+            'sections': num_sections,
+            'lines': text.count('\n') + 1,
+            'chars': len(text),
+            'legacy_median_ms': round(legacy_ms, 3),
+            'current_median_ms': round(current_ms, 3),
+            'speedup': round(legacy_ms / current_ms, 2) if current_ms else None,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'sections':>8} {'lines':>7} {'chars':>9} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+        for row in results:
+            print(f"{row['sections']:>8} {row['lines']:>7} {row['chars']:>9} {row['legacy_median_ms']:>10.3f} "
+                  f"{row['current_median_ms']:>11.3f} {row['speedup']:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import corpus
+
+# Parser throughput benchmark over the synthetic corpus (see corpus.py).
+#
+# Measures parse_resume end to end, the PDF and DOCX extractors, and _parse_sections on
+# pre-extracted text, each in a fresh process so peak RSS is attributable. Results can be
+# saved as a JSON baseline and compared against a later run, e.g.:
+#
+#   git checkout <old-commit> && python benchmarks/bench_parser.py --save /tmp/base.json
+#   git checkout <new-commit> && python benchmarks/bench_parser.py --compare /tmp/base.json
+
+TARGETS = ('parse_resume', 'extract_pdf', 'extract_docx', 'parse_sections')
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _select_documents(entries, target):
+    if target == 'extract_pdf':
+        return [entry for entry in entries if entry['format'] == 'pdf']
+    if target == 'extract_docx':
+        return [entry for entry in entries if entry['format'] == 'docx']
+    return entries
+
+
+def _run_target(target, count, sizes, seed, repeat, warmup):
+    """Runs one benchmark target in the current (fresh) process and returns its stats."""
+    import resume_parser
+
+    entries = _select_documents(corpus.build_corpus(count, sizes, seed=seed), target)
+    rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if target == 'parse_resume':
+        def run(entry):
+            return resume_parser.parse_resume(entry['data'], filename=entry['name'])
+    elif target == 'extract_pdf':
+        def run(entry):
+            return resume_parser._extract_text_from_pdf(io.BytesIO(entry['data']), entry['name'])
+    elif target == 'extract_docx':
+        def run(entry):
+            return resume_parser._extract_text_from_docx(io.BytesIO(entry['data']), entry['name'])
+    elif target == 'parse_sections':
+        texts = {entry['name']: resume_parser._extract_text_from_docx(io.BytesIO(entry['data']), entry['name'])[0]
+                 if entry['format'] == 'docx' else
+                 resume_parser._extract_text_from_pdf(io.BytesIO(entry['data']), entry['name'])[0]
+                 for entry in entries}
+
+        def run(entry):
+            return resume_parser._parse_sections(texts[entry['name']])
+    else:
+        raise ValueError(f"Unknown target: {target}")
+
+    for entry in entries[:warmup]:
+        run(entry)
+
+    latencies = []
+    by_size = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for entry in entries:
+            t0 = time.perf_counter()
+            run(entry)
+            elapsed = time.perf_counter() - t0
+            latencies.append(elapsed)
+            by_size.setdefault(entry['size'], []).append(elapsed)
+    total = time.perf_counter() - start
+    latencies.sort()
+
+    return {
+        'target': target,
+        'documents': len(latencies),
+        'docs_per_sec': round(len(latencies) / total, 2) if total else None,
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        'p50_ms_by_size': {size: round(_percentile(sorted(values), 0.50) * 1000, 3) for size, values in by_size.items()},
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'rss_growth_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before_kb,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Returns human-readable regressions of `results` against `baseline` beyond `threshold` (e.g. 0.1 = 10%)."""
+    regressions = []
+    previous = {row['target']: row for row in baseline.get('results', [])}
+    for row in results['results']:
+        old = previous.get(row['target'])
+        if not old:
+            continue
+        if old.get('docs_per_sec') and row['docs_per_sec'] < old['docs_per_sec'] * (1 - threshold):
+            regressions.append(f"{row['target']}: throughput {old['docs_per_sec']} -> {row['docs_per_sec']} docs/s")
+        for key in ('p50_ms', 'p99_ms'):
+            if old.get(key) and row[key] > old[key] * (1 + threshold):
+                regressions.append(f"{row['target']}: {key} {old[key]} -> {row[key]}")
+        if old.get('peak_rss_kb') and row['peak_rss_kb'] > old['peak_rss_kb'] * (1 + threshold):
+            regressions.append(f"{row['target']}: peak RSS {old['peak_rss_kb']} -> {row['peak_rss_kb']} KB")
+    return regressions
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark the resume parser on a synthetic corpus.")
+    arg_parser.add_argument('--targets', nargs='+', default=list(TARGETS), choices=TARGETS)
+    arg_parser.add_argument('--count', type=int, default=3, help="Documents per size and format/layout.")
+    arg_parser.add_argument('--sizes', nargs='+', default=list(corpus.SIZES), choices=list(corpus.SIZES))
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Timed passes over the corpus.")
+    arg_parser.add_argument('--warmup', type=int, default=2, help="Untimed documents per target.")
+    arg_parser.add_argument('--save', help="Write results as a JSON baseline to this path.")
+    arg_parser.add_argument('--compare', help="Compare against a baseline saved with --save.")
+    arg_parser.add_argument('--threshold', type=float, default=0.10, help="Relative change reported as a regression.")
+    args = arg_parser.parse_args(argv)
+
+    rows = []
+    spawn = get_context('spawn')
+    for target in args.targets:
+        # A fresh interpreter per target keeps peak RSS and import state independent
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            rows.append(executor.submit(_run_target, target, args.count, tuple(args.sizes),
+                                        args.seed, args.repeat, args.warmup).result())
+
+    results = {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': {'count': args.count, 'sizes': args.sizes, 'seed': args.seed, 'repeat': args.repeat},
+        'results': rows,
+    }
+
+    print(f"{'target':<16} {'docs':>6} {'docs/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}")
+    for row in rows:
+        print(f"{row['target']:<16} {row['documents']:>6} {row['docs_per_sec']:>9} {row['p50_ms']:>9} "
+              f"{row['p99_ms']:>9} {row['peak_rss_kb'] / 1024:>12.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"Compared with {args.compare} (revision {baseline.get('revision')}):")
+        for line in regressions or ["no regressions beyond threshold"]:
+            print(f"  {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
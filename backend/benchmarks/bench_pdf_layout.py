@@ -0,0 +1,106 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import dataclasses
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import corpus
+import resume_parser
+import skill_taxonomy
+
+# Benchmark for PDF text extraction: reading order (pdf_layout) against content stream
+# order, on single- and two-column PDFs. Reports extraction speed and how accurately the
+# full parse recovers each document's ground truth: name, email and summary, the share of
+# experience and education items found in their section, and skill recall.
+#
+#   python benchmarks/bench_pdf_layout.py --count 5 --repeat 3
+
+MODES = {'stream': False, 'reading_order': True}
+
+
+def _section_text(items):
+    return '\n'.join(item if isinstance(item, str) else '\n'.join(dataclasses.astuple(item)) for item in items)
+
+
+def _recall(expected, text):
+    return sum(1 for term in expected if term in text) / len(expected) if expected else 1.0
+
+
+def _score(result, spec):
+    """How much of the ground truth ended up in the right field or section of a parse result."""
+    taxonomy = skill_taxonomy.get_default()
+    expected_skills = {taxonomy.canonicalize(skill) or skill for skill in spec['skills']}
+    return {
+        'name': result.name == spec['name'],
+        'email': result.email == spec['email'],
+        'summary': ' '.join(result.summary.split()) == spec['summary'],
+        'experience': _recall([item['company'] for item in spec['experience']], _section_text(result.experience)),
+        'education': _recall([item['degree'] for item in spec['education']], _section_text(result.education)),
+        'skills': len(expected_skills & set(result.skills)) / len(expected_skills),
+    }
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compare PDF extraction in stream and reading order.")
+    arg_parser.add_argument('--count', type=int, default=3, help="Documents per size and layout.")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Timed passes over the documents.")
+    arg_parser.add_argument('--page-seconds', type=float, default=resume_parser.PDF_PAGE_TIME_BUDGET,
+                            help="Per-page time budget for reading order (0 for none).")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    resume_parser.warmup()
+    budget = args.page_seconds or None
+    entries = corpus.build_corpus(args.count, formats=('pdf',), layouts=corpus.PDF_LAYOUTS)
+    results = []
+    for layout in corpus.PDF_LAYOUTS:
+        for size in corpus.SIZES:
+            docs = [entry for entry in entries if entry['layout'] == layout and entry['size'] == size]
+            row = {'layout': layout, 'size': size, 'documents': len(docs)}
+            for name, reading_order in MODES.items():
+                samples = []
+                pages = 0
+                truncated = 0
+                for _ in range(args.repeat):
+                    for entry in docs:
+                        start = time.perf_counter()
+                        _, info = resume_parser._extract_text_from_pdf(io.BytesIO(entry['data']), entry['name'],
+                                                                       layout=reading_order, page_time_budget=budget)
+                        samples.append(time.perf_counter() - start)
+                        pages += info['pages']
+                        truncated += info['truncated']
+                scores = [_score(resume_parser.parse_resume(entry['data'], filename=entry['name'],
+                                                            pdf_reading_order=reading_order, page_time_budget=budget),
+                                 entry['truth']) for entry in docs]
+                row[name] = {
+                    'median_ms': round(statistics.median(samples) * 1000, 3),
+                    'pages_per_sec': round(pages / sum(samples), 1),
+                    'truncated': truncated,
+                    **{field: round(statistics.mean(score[field] for score in scores), 3) for field in scores[0]},
+                }
+            row['slowdown'] = round(row['reading_order']['median_ms'] / row['stream']['median_ms'], 2)
+            results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'layout':<14} {'size':<7} {'mode':<14} {'median ms':>10} {'pages/s':>8} {'name':>5} {'email':>6} "
+          f"{'summary':>8} {'exp':>5} {'edu':>5} {'skills':>7}")
+    for row in results:
+        for name in MODES:
+            stats = row[name]
+            print(f"{row['layout']:<14} {row['size']:<7} {name:<14} {stats['median_ms']:>10} {stats['pages_per_sec']:>8} "
+                  f"{stats['name']:>5.0%} {stats['email']:>6.0%} {stats['summary']:>8.0%} {stats['experience']:>5.0%} "
+                  f"{stats['education']:>5.0%} {stats['skills']:>7.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import resume_parser
+from bench_parse_sections import make_resume_text
+from incremental_parse import IncrementalParse
+
+# Benchmark for incremental re-parsing: the cost of applying a small edit (a few words
+# typed into one line of a section) with IncrementalParse, against re-running
+# _parse_sections on the whole edited text, for growing document sizes. Every result is
+# checked against the full parse.
+#
+#   python benchmarks/bench_reparse.py --sections 5 50 200 --edits 200
+
+
+def _random_edit(rng, text):
+    """Replaces a short span inside a random body line with a few words."""
+    while True:
+        start = rng.randrange(len(text))
+        line_start = text.rfind('\n', 0, start) + 1
+        line_end = text.find('\n', start)
+        if line_end == -1:
+            line_end = len(text)
+        if line_end - line_start > 20 and text[line_start] == '-': # A bullet line
+            end = min(line_end, start + rng.randint(0, 12))
+            return {'start': start, 'end': end, 'text': rng.choice(['scaled ', 'led the ', 'rewrote ', ''])}
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compare incremental re-parsing with full re-parsing.")
+    arg_parser.add_argument('--sections', type=int, nargs='+', default=[5, 50, 200],
+                            help="Resume sizes to generate, in number of sections.")
+    arg_parser.add_argument('--edits', type=int, default=100, help="Edits applied per size.")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    results = []
+    for num_sections in args.sections:
+        rng = random.Random(num_sections)
+        text = make_resume_text(num_sections, seed=num_sections)
+        state = IncrementalParse(text)
+        incremental_samples = []
+        full_samples = []
+        reparsed = []
+        for _ in range(args.edits):
+            edit = _random_edit(rng, state.text)
+            start = time.perf_counter()
+            state.apply_edits([edit])
+            result = state.result()
+            incremental_samples.append(time.perf_counter() - start)
+            reparsed.append(state.last_stats['reparsed'])
+
+            start = time.perf_counter()
+            expected = resume_parser._parse_sections(state.text)
+            full_samples.append(time.perf_counter() - start)
+            if result.to_dict() != expected.to_dict():
+                raise SystemExit(f"Output mismatch after an edit of a {num_sections}-section resume")
+
+        incremental_ms = statistics.median(incremental_samples) * 1000
+        full_ms = statistics.median(full_samples) * 1000
+        results.append({
+            'sections': num_sections,
+            'chars': len(state.text),
+            'segments': len(state.segments),
+            'reparsed_per_edit': round(statistics.mean(reparsed), 2),
+            'full_median_ms': round(full_ms, 3),
+            'incremental_median_ms': round(incremental_ms, 3),
+            'speedup': round(full_ms / incremental_ms, 1) if incremental_ms else None,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'sections':>8} {'chars':>9} {'segments':>9} {'reparsed':>9} {'full ms':>9} {'incremental ms':>15} {'speedup':>8}")
+    for row in results:
+        print(f"{row['sections']:>8} {row['chars']:>9} {row['segments']:>9} {row['reparsed_per_edit']:>9} "
+              f"{row['full_median_ms']:>9.3f} {row['incremental_median_ms']:>15.3f} {row['speedup']:>7}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
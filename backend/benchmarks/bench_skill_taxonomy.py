@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import skill_taxonomy
+
+# Benchmark for skill canonicalization: per-resume cost of SkillTaxonomy.normalize as the
+# dictionary grows, with a cold memo (every skill resolved) and a warm one (batch mode,
+# where skills repeat across resumes), against a linear fuzzy scan over every name.
+# Dictionaries are the bundled one padded with generated skill names.
+#
+#   python benchmarks/bench_skill_taxonomy.py --sizes 1000 10000 50000 --resumes 500
+
+SYLLABLES = ('al ber con da el fi gra hy in jo ka lo mi no or pa qui ro sa ti ul ve wo xe yo za '
+             'net flow base stack script soft data cloud logic').split()
+
+
+def _make_name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def _make_entries(rng, size):
+    with open(skill_taxonomy.DEFAULT_DICTIONARY_PATH, 'r', encoding='utf-8') as f:
+        entries = list(skill_taxonomy.parse_dictionary(f.read().splitlines()))
+    names = {skill_taxonomy.skill_key(name) for canonical, aliases in entries for name in (canonical, *aliases)}
+    while len(entries) < size:
+        name = _make_name(rng)
+        if skill_taxonomy.skill_key(name) not in names:
+            names.add(skill_taxonomy.skill_key(name))
+            entries.append((name, [name.lower() + ' ' + rng.choice(['framework', 'tools', 'platform'])]))
+    return entries
+
+
+def _typo(rng, word):
+    i = rng.randrange(1, len(word))
+    return word[:i] + word[i - 1] + word[i:]
+
+
+def _make_resume_skills(rng, entries, count):
+    skills = []
+    for _ in range(count):
+        # Most skills on resumes come from a few hundred popular ones
+        canonical, aliases = rng.choice(entries[:500] if rng.random() < 0.8 else entries)
+        choice = rng.random()
+        if choice < 0.4:
+            skills.append(canonical.upper() if rng.random() < 0.5 else canonical.lower())
+        elif choice < 0.6 and aliases:
+            skills.append(rng.choice(aliases))
+        elif choice < 0.75:
+            skills.append(f"{canonical} {rng.randint(2, 12)}")
+        elif choice < 0.9 and len(canonical) > 6:
+            skills.append(_typo(rng, canonical))
+        else:
+            skills.append(_make_name(rng) + ' ' + _make_name(rng)) # Not in the dictionary
+    return skills
+
+
+def _linear_fuzzy(keys_grams, skill):
+    grams = skill_taxonomy._trigrams(skill_taxonomy.skill_key(skill))
+    return max((2 * len(grams & other) / (len(grams) + len(other)), i) for i, other in enumerate(keys_grams))
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark skill canonicalization against dictionary size.")
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                            help="Dictionary sizes (canonical skills) to generate.")
+    arg_parser.add_argument('--resumes', type=int, default=300, help="Resumes normalized per size.")
+    arg_parser.add_argument('--skills', type=int, default=25, help="Extracted skills per resume.")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        rng = random.Random(size)
+        entries = _make_entries(rng, size)
+        start = time.perf_counter()
+        taxonomy = skill_taxonomy.SkillTaxonomy(entries)
+        build_seconds = time.perf_counter() - start
+        resumes = [_make_resume_skills(rng, entries, args.skills) for _ in range(args.resumes)]
+
+        cold_samples = []
+        for skills in resumes:
+            taxonomy._memo.clear()
+            start = time.perf_counter()
+            taxonomy.normalize(skills)
+            cold_samples.append(time.perf_counter() - start)
+        taxonomy._memo.clear()
+        start = time.perf_counter()
+        for skills in resumes:
+            taxonomy.normalize(skills)
+        warm_per_resume = (time.perf_counter() - start) / len(resumes)
+
+        linear_samples = []
+        for skills in resumes[:10]:
+            start = time.perf_counter()
+            _linear_fuzzy(taxonomy._key_grams, skills[0])
+            linear_samples.append(time.perf_counter() - start)
+
+        stats = taxonomy.stats()
+        results.append({
+            'dictionary': len(entries),
+            'names': stats['names'],
+            'stop_grams': stats['stop_grams'],
+            'build_ms': round(build_seconds * 1000, 1),
+            'cold_median_ms': round(statistics.median(cold_samples) * 1000, 3),
+            'batch_per_resume_ms': round(warm_per_resume * 1000, 3),
+            'linear_scan_per_skill_ms': round(statistics.median(linear_samples) * 1000, 3),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'dictionary':>10} {'names':>8} {'stop grams':>10} {'build ms':>9} {'cold ms':>8} {'batch ms':>9} {'scan/skill ms':>14}")
+    for row in results:
+        print(f"{row['dictionary']:>10} {row['names']:>8} {row['stop_grams']:>10} {row['build_ms']:>9.1f} "
+              f"{row['cold_median_ms']:>8.3f} {row['batch_per_resume_ms']:>9.3f} {row['linear_scan_per_skill_ms']:>14.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
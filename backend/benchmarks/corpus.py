@@ -0,0 +1,377 @@
+import io
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Deterministic synthetic resume corpus for the parser benchmarks.
+#
+# Every document is generated from a seeded spec, so the same arguments always produce
+# byte-identical files, and each entry carries its ground truth (name, contacts, section
+# contents) so benchmarks can score accuracy as well as speed.
+#
+#   python benchmarks/corpus.py out/corpus --count 5
+
+SIZES = {
+    # size: (experience items, education items, skills, bullets per item)
+    'small': (2, 1, 8, (2, 3)),
+    'medium': (6, 2, 20, (3, 5)),
+    'large': (30, 4, 60, (4, 8)),
+}
+FORMATS = ('docx', 'pdf')
+PDF_LAYOUTS = ('single_column', 'two_column')
+# 'flow' is plain paragraphs; 'template' mimics resume templates: name and contacts in the
+# page header, sections in a two-column table and skills in a floating text box
+DOCX_LAYOUTS = ('flow', 'template')
+
+FIRST_NAMES = ['Ada', 'Grace', 'Alan', 'Linus', 'Margaret', 'Dennis', 'Barbara', 'Ken', 'Frances', 'Edsger']
+LAST_NAMES = ['Lovelace', 'Hopper', 'Turing', 'Torvalds', 'Hamilton', 'Ritchie', 'Liskov', 'Thompson', 'Allen', 'Dijkstra']
+TITLES = ['Software Engineer', 'Data Scientist', 'Site Reliability Engineer', 'Product Designer', 'Engineering Manager']
+COMPANIES = ['Initech', 'Globex Corporation', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Acme Corp']
+DEGREES = ['B.S. in Computer Science', 'M.S. in Statistics', 'B.A. in Mathematics', 'Ph.D. in Physics', 'M.Eng. in Software Systems']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University', 'University of Examples']
+SKILLS = ['Python', 'Java', 'Go', 'Rust', 'SQL', 'PostgreSQL', 'Kubernetes', 'Docker', 'Terraform', 'AWS', 'GCP',
+          'React', 'TypeScript', 'GraphQL', 'Kafka', 'Spark', 'Airflow', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
+          'Redis', 'Elasticsearch', 'Linux', 'Bash', 'Git', 'CI/CD', 'Flask', 'Django', 'FastAPI', 'Scala', 'C++',
+          'Prometheus', 'Grafana', 'gRPC', 'REST APIs', 'Microservices', 'Agile', 'Scrum', 'Leadership']
+VERBS = ['Designed', 'Built', 'Led', 'Migrated', 'Optimised', 'Automated', 'Shipped', 'Scaled', 'Mentored', 'Reduced']
+OBJECTS = ['the billing pipeline', 'a distributed job scheduler', 'customer-facing APIs', 'the data warehouse',
+           'release tooling', 'an internal search service', 'observability dashboards', 'the onboarding flow']
+OUTCOMES = ['cutting latency by 40%', 'saving $200k per year', 'for 3M monthly users', 'with zero downtime',
+            'across 12 teams', 'improving reliability to 99.95%', 'ahead of schedule']
+
+
+def generate_spec(seed, size='medium'):
+    """Builds the content of one synthetic resume; identical for identical arguments."""
+    rng = random.Random(f"{seed}:{size}")
+    num_experience, num_education, num_skills, bullet_range = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}{rng.randint(1, 99)}".lower()
+
+    experience = []
+    year = 2024
+    for _ in range(num_experience):
+        start = year - rng.randint(1, 4)
+        experience.append({
+            'title': rng.choice(TITLES),
+            'company': f"{rng.choice(COMPANIES)} {rng.randint(1, 99)}",
+            'period': f"Jan {start} - {'Present' if year == 2024 else f'Dec {year}'}",
+            'bullets': [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}"
+                        for _ in range(rng.randint(*bullet_range))],
+        })
+        year = start - 1
+
+    education = []
+    for _ in range(num_education):
+        education.append({
+            'degree': rng.choice(DEGREES),
+            'institution': rng.choice(SCHOOLS),
+            'period': str(year - rng.randint(0, 3)),
+        })
+        year -= 4
+
+    return {
+        'name': f"{first} {last}",
+        'title': rng.choice(TITLES),
+        'email': f"{handle}@example.com",
+        'phone': f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        'linkedin': f"linkedin.com/in/{handle}",
+        'github': f"github.com/{handle}",
+        'summary': (f"{rng.choice(TITLES)} with {rng.randint(3, 20)} years of experience building reliable "
+                    f"systems and teams, focused on {rng.choice(OBJECTS)}."),
+        'experience': experience,
+        'education': education,
+        'skills': rng.sample(SKILLS, min(num_skills, len(SKILLS))),
+    }
+
+
+def _spec_blocks(spec):
+    """Flattens a spec into (kind, text) lines shared by the DOCX and PDF renderers."""
+    blocks = [('name', spec['name']), ('title', spec['title']),
+              ('text', f"{spec['email']} | {spec['phone']} | {spec['linkedin']} | {spec['github']}"),
+              ('header', 'Summary'), ('text', spec['summary']), ('header', 'Professional Experience')]
+    for item in spec['experience']:
+        blocks += [('text', item['title']), ('text', item['company']), ('text', item['period'])]
+        blocks += [('text', f"- {bullet}") for bullet in item['bullets']]
+        blocks.append(('break', ''))
+    blocks.append(('header', 'Education'))
+    for item in spec['education']:
+        blocks += [('text', item['degree']), ('text', item['institution']), ('text', item['period']), ('break', '')]
+    blocks += [('header', 'Technical Skills'), ('text', ', '.join(spec['skills']))]
+    return blocks
+
+
+def render_docx(spec):
+    from docx import Document
+
+    doc = Document()
+    paragraph_lines = []
+
+    def flush():
+        if paragraph_lines:
+            doc.add_paragraph('\n'.join(paragraph_lines))
+            paragraph_lines.clear()
+
+    for kind, text in _spec_blocks(spec):
+        if kind == 'name':
+            doc.add_heading(text, 0)
+        elif kind == 'header':
+            flush()
+            doc.add_heading(text, level=1)
+        elif kind == 'break':
+            flush()
+        else:
+            paragraph_lines.append(text)
+    flush()
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+_TEXT_BOX_XML = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"'
+    ' xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><wp:anchor><wp:docPr id="1" name="Skills"/>'
+    '<a:graphic><a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">'
+    '<wps:wsp><wps:txbx><w:txbxContent>{paragraphs}</w:txbxContent></wps:txbx></wps:wsp>'
+    '</a:graphicData></a:graphic></wp:anchor></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>{paragraphs}</w:txbxContent></v:textbox>'
+    '</v:shape></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+
+def _escape_xml(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def render_docx_template(spec):
+    from docx import Document
+    from docx.oxml import parse_xml
+
+    doc = Document()
+    header = doc.sections[0].header
+    header.paragraphs[0].text = spec['name']
+    header.add_paragraph(spec['title'])
+    header.add_paragraph(' | '.join([spec['email'], spec['phone'], spec['linkedin'], spec['github']]))
+
+    blocks = _spec_blocks(spec)
+    skills_start = next(i for i, (kind, text) in enumerate(blocks) if kind == 'header' and text == 'Technical Skills')
+    education_start = next(i for i, (kind, text) in enumerate(blocks) if kind == 'header' and text == 'Education')
+    first_section = next(i for i, (kind, _) in enumerate(blocks) if kind == 'header')
+
+    table = doc.add_table(rows=1, cols=2)
+    left, right = table.rows[0].cells
+    for cell, cell_blocks in ((right, blocks[first_section:education_start]), (left, blocks[education_start:skills_start])):
+        cell.paragraphs[0].text = cell_blocks[0][1]
+        for kind, text in cell_blocks[1:]:
+            if kind != 'break':
+                cell.add_paragraph(text)
+
+    box_paragraphs = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{_escape_xml(text)}</w:t></w:r></w:p>'
+                             for _, text in blocks[skills_start:])
+    anchor = doc.add_paragraph()
+    anchor._p.append(parse_xml(_TEXT_BOX_XML.format(paragraphs=box_paragraphs)))
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+class _PdfWriter:
+    """Minimal PDF writer: Helvetica text at absolute positions, no external dependencies."""
+
+    PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+    FONTS = {'regular': 'Helvetica', 'bold': 'Helvetica-Bold'}
+
+    def __init__(self):
+        self.pages = []
+
+    def add_page(self, commands):
+        self.pages.append(commands)
+
+    @staticmethod
+    def text(x, y, text, size=10, font='regular'):
+        escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        font_ref = 'F2' if font == 'bold' else 'F1'
+        return f"BT /{font_ref} {size} Tf 1 0 0 1 {x} {y} Tm ({escaped}) Tj ET"
+
+    def to_bytes(self):
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        regular = add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{self.FONTS['regular']} /Encoding /WinAnsiEncoding >>".encode())
+        bold = add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{self.FONTS['bold']} /Encoding /WinAnsiEncoding >>".encode())
+        pages_id = add(b'')
+        kids = []
+        for commands in self.pages:
+            content = '\n'.join(commands).encode('latin-1', 'replace')
+            content_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+            kids.append(add(
+                (f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+                 f"/Resources << /Font << /F1 {regular} 0 R /F2 {bold} 0 R >> >> /Contents {content_id} 0 R >>").encode()))
+        objects[pages_id - 1] = (f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] "
+                                 f"/Count {len(kids)} >>").encode()
+        catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+        out = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b''.join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+        return bytes(out)
+
+
+def _wrap(text, width):
+    words, lines, current = text.split(), [], ''
+    for word in words:
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines or ['']
+
+
+def _layout_column(blocks, width_chars):
+    """Turns blocks into (text, size, font, gap_before) rows for one column."""
+    rows = []
+    for kind, text in blocks:
+        if kind == 'name':
+            rows.append((text, 18, 'bold', 0))
+        elif kind == 'header':
+            rows.append((text, 13, 'bold', 10))
+        elif kind == 'break':
+            rows.append(('', 10, 'regular', 0))
+        else:
+            for line in _wrap(text, width_chars):
+                rows.append((line, 10, 'regular', 0))
+    return rows
+
+
+def render_pdf(spec, layout='single_column'):
+    """
+    Renders a spec as PDF. 'two_column' puts contact details, education and skills in a
+    narrow left column and summary/experience on the right, and writes the content stream
+    row by row across both columns, the way many resume templates are exported.
+    """
+    writer = _PdfWriter()
+    top, bottom, line_height = 750, 50, 14
+    blocks = _spec_blocks(spec)
+
+    if layout == 'single_column':
+        commands, y = [], top
+        for text, size, font, gap in _layout_column(blocks, 95):
+            y -= gap
+            if y < bottom:
+                writer.add_page(commands)
+                commands, y = [], top
+            if text:
+                commands.append(writer.text(50, y, text, size, font))
+            y -= line_height + (size - 10)
+        writer.add_page(commands)
+        return writer.to_bytes()
+
+    if layout != 'two_column':
+        raise ValueError(f"Unknown PDF layout: {layout}")
+
+    # Name and title span the page; the rest is split across two columns
+    head, body = blocks[:2], blocks[2:]
+    contact = body[0][1].split(' | ')
+    left_blocks = [('header', 'Contact')] + [('text', part) for part in contact]
+    right_blocks = []
+    current = right_blocks
+    for kind, text in body[1:]:
+        if kind == 'header':
+            current = left_blocks if text in ('Education', 'Technical Skills') else right_blocks
+        current.append((kind, text))
+
+    left_rows = _layout_column(left_blocks, 30)
+    right_rows = _layout_column(right_blocks, 60)
+    columns = [(50, left_rows), (250, right_rows)]
+
+    commands = [writer.text(50, top, head[0][1], 18, 'bold'), writer.text(50, top - 22, head[1][1], 11)]
+    cursors = [top - 50, top - 50]
+    indexes = [0, 0]
+    while any(indexes[i] < len(rows) for i, (_, rows) in enumerate(columns)):
+        if all(cursors[i] < bottom or indexes[i] >= len(rows) for i, (_, rows) in enumerate(columns)):
+            writer.add_page(commands)
+            commands, cursors = [], [top, top]
+        # Emit one row from each column that still fits on this page, interleaving them
+        for i, (x, rows) in enumerate(columns):
+            if indexes[i] >= len(rows) or cursors[i] < bottom:
+                continue
+            text, size, font, gap = rows[indexes[i]]
+            cursors[i] -= gap
+            if text:
+                commands.append(writer.text(x, cursors[i], text, size, font))
+            cursors[i] -= line_height + (size - 10)
+            indexes[i] += 1
+    writer.add_page(commands)
+    return writer.to_bytes()
+
+
+def build_corpus(count=3, sizes=tuple(SIZES), formats=FORMATS, layouts=PDF_LAYOUTS, seed=0, docx_layouts=('flow',)):
+    """
+    Generates the corpus in memory.
+
+    Returns:
+        list[dict]: One entry per document with 'name', 'format', 'size', 'layout',
+                    'data' (file bytes) and 'truth' (the spec it was rendered from).
+    """
+    entries = []
+    for size in sizes:
+        for index in range(count):
+            spec = generate_spec(seed * 100003 + index, size)
+            for fmt in formats:
+                for layout in (layouts if fmt == 'pdf' else docx_layouts):
+                    if fmt == 'pdf':
+                        data = render_pdf(spec, layout)
+                    else:
+                        data = render_docx_template(spec) if layout == 'template' else render_docx(spec)
+                    entries.append({
+                        'name': f"{size}_{index:03d}_{layout}.{fmt}",
+                        'format': fmt, 'size': size, 'layout': layout,
+                        'data': data, 'truth': spec,
+                    })
+    return entries
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Write the synthetic resume corpus to a directory.")
+    arg_parser.add_argument('output_dir')
+    arg_parser.add_argument('--count', type=int, default=3, help="Documents per size and format/layout.")
+    arg_parser.add_argument('--sizes', nargs='+', default=list(SIZES), choices=list(SIZES))
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--docx-layouts', nargs='+', default=['flow'], choices=DOCX_LAYOUTS)
+    args = arg_parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = []
+    for entry in build_corpus(args.count, tuple(args.sizes), seed=args.seed, docx_layouts=tuple(args.docx_layouts)):
+        with open(os.path.join(args.output_dir, entry['name']), 'wb') as f:
+            f.write(entry['data'])
+        manifest.append({key: value for key, value in entry.items() if key != 'data'})
+    with open(os.path.join(args.output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Wrote {len(manifest)} documents to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import corpus
+from load_upload import _multipart_body, _free_port, _start_server
+
+# Overload test for upload admission control: starts the development server with
+# admission control off and then on, sends far more concurrent uploads than it can parse,
+# and compares the latency of the uploads that were served. With admission control the
+# excess is turned away quickly with 429 + Retry-After and served uploads keep a stable
+# p99; without it every upload competes for the CPU and all of them slow down.
+#
+#   python benchmarks/load_admission.py --requests 200 --concurrency 48 --max-concurrent 2
+
+SETTINGS = {
+    'unlimited': {'ADMISSION_MAX_CONCURRENT': '0', 'ADMISSION_RATE': '0', 'ADMISSION_KEY_RATE': '0'},
+    'admission': {'ADMISSION_RATE': '0', 'ADMISSION_KEY_RATE': '0'}, # Concurrency settings come from the arguments
+}
+
+
+def _upload(url, filename, data):
+    body, content_type = _multipart_body(filename, data)
+    req = urllib.request.Request(f"{url}/api/upload", data=body, method='POST',
+                                 headers={'Content-Type': content_type})
+    start = time.perf_counter()
+    retry_after = None
+    try:
+        with urllib.request.urlopen(req, timeout=300) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+        retry_after = e.headers.get('Retry-After')
+    except OSError:
+        status = None
+    return status, time.perf_counter() - start, retry_after
+
+
+def _percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def run_overload(url, documents, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda entry: _upload(url, entry['name'], entry['data']), documents))
+    elapsed = time.perf_counter() - start
+
+    served = sorted(seconds for status, seconds, _ in results if status == 200)
+    rejected = sorted(seconds for status, seconds, _ in results if status == 429)
+    statuses = Counter(str(status) for status, _, _ in results)
+    return {
+        'requests': len(documents),
+        'served': len(served),
+        'rejected': len(rejected),
+        'statuses': dict(statuses),
+        'served_per_sec': round(len(served) / elapsed, 2),
+        'p50_ms': round(statistics.median(served) * 1000, 1) if served else None,
+        'p99_ms': round(_percentile(served, 0.99) * 1000, 1) if served else None,
+        'reject_p99_ms': round(_percentile(rejected, 0.99) * 1000, 1) if rejected else None,
+        'retry_after': sorted({int(value) for _, _, value in results if value}),
+    }
+
+
+def check_signature(url, size):
+    """Time to reject a `size`-byte upload named .pdf whose contents are not a PDF."""
+    status, seconds, _ = _upload(url, 'not-a-resume.pdf', b'MZ' + b'\0' * size)
+    return {'status': status, 'ms': round(seconds * 1000, 1)}
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Overload /api/upload with and without admission control.")
+    arg_parser.add_argument('--requests', type=int, default=200)
+    arg_parser.add_argument('--concurrency', type=int, default=48, help="Concurrent clients.")
+    arg_parser.add_argument('--max-concurrent', type=int, default=2, help="ADMISSION_MAX_CONCURRENT for the admission run.")
+    arg_parser.add_argument('--queue-depth', type=int, default=4)
+    arg_parser.add_argument('--queue-timeout', type=float, default=2.0)
+    arg_parser.add_argument('--size', default='medium', choices=list(corpus.SIZES))
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+
+    # One distinct document per request, so every served upload is a real parse
+    documents = []
+    seed = 0
+    while len(documents) < args.requests:
+        documents += corpus.build_corpus(1, (args.size,), seed=seed, layouts=('single_column',))
+        seed += 1
+    documents = documents[:args.requests]
+
+    results = {}
+    for name, settings in SETTINGS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'load.db')}",
+                       UPLOAD_FOLDER=os.path.join(tmp, 'uploads'), PARSE_CACHE_SIZE='0', FLASK_DEBUG='0',
+                       NEAR_DUPLICATE_INDEX='False', ADMISSION_MAX_CONCURRENT=str(args.max_concurrent),
+                       ADMISSION_QUEUE_DEPTH=str(args.queue_depth), ADMISSION_QUEUE_TIMEOUT=str(args.queue_timeout))
+            env.update(settings)
+            port = _free_port()
+            process = _start_server('dev', port, env)
+            try:
+                url = f"http://127.0.0.1:{port}"
+                results[name] = run_overload(url, documents, args.concurrency)
+                results[name]['signature_reject'] = check_signature(url, 8 * 1024 * 1024)
+            finally:
+                process.terminate()
+                process.wait(timeout=60)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'run':<10} {'served':>7} {'rejected':>9} {'served/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'reject p99 ms':>14} {'bad .pdf':>14}")
+    for name, row in results.items():
+        signature = f"{row['signature_reject']['status']} {row['signature_reject']['ms']} ms"
+        print(f"{name:<10} {row['served']:>7} {row['rejected']:>9} {row['served_per_sec']:>9} {row['p50_ms']:>9} "
+              f"{row['p99_ms']:>9} {str(row['reject_p99_ms']):>14} {signature:>14}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import corpus
+
+# Load test for /api/upload: sends concurrent multipart uploads of distinct synthetic
+# resumes (so the parse cache never short-circuits) and reports throughput and latency.
+#
+# Against a running server:
+#   python benchmarks/load_upload.py --url http://localhost:9000 --concurrency 16
+#
+# Or start the development server and gunicorn in turn and compare them:
+#   python benchmarks/load_upload.py --compare dev gunicorn --requests 200
+
+SERVERS = ('dev', 'gunicorn')
+
+
+def _multipart_body(filename, data):
+    boundary = uuid.uuid4().hex
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"resume\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n").encode('utf-8')
+    return head + data + f"\r\n--{boundary}--\r\n".encode('utf-8'), f"multipart/form-data; boundary={boundary}"
+
+
+def _upload(url, filename, data):
+    body, content_type = _multipart_body(filename, data)
+    req = urllib.request.Request(f"{url}/api/upload", data=body, method='POST',
+                                 headers={'Content-Type': content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=300) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = None
+    return status, time.perf_counter() - start
+
+
+def run_load(url, documents, total_requests, concurrency):
+    """Uploads `total_requests` documents (cycling through `documents`) with `concurrency` clients."""
+    jobs = [documents[i % len(documents)] for i in range(total_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda entry: _upload(url, entry['name'], entry['data']), jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds for status, seconds in results if status == 200)
+    errors = sum(1 for status, _ in results if status != 200)
+    return {
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'requests_per_sec': round(total_requests / elapsed, 2),
+        'p50_ms': round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000, 1) if latencies else None,
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(kind, port, env):
+    if kind == 'dev':
+        command = [sys.executable, '-c', f"from app import app; app.run(host='127.0.0.1', port={port})"]
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-b', f'127.0.0.1:{port}',
+                   '--access-logfile', '/dev/null', 'wsgi:app']
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/cache/stats", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Concurrent /api/upload load test.")
+    arg_parser.add_argument('--url', help="Base URL of a running server.")
+    arg_parser.add_argument('--compare', nargs='+', choices=SERVERS,
+                            help="Start each server type locally in turn and load test it.")
+    arg_parser.add_argument('--requests', type=int, default=100)
+    arg_parser.add_argument('--concurrency', type=int, default=8)
+    arg_parser.add_argument('--size', default='medium', choices=list(corpus.SIZES))
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+    args = arg_parser.parse_args(argv)
+    if not args.url and not args.compare:
+        arg_parser.error("give --url or --compare")
+
+    # One distinct document per request, so every upload is a real parse
+    documents = []
+    seed = 0
+    while len(documents) < args.requests:
+        documents += corpus.build_corpus(1, (args.size,), seed=seed, layouts=('single_column',))
+        seed += 1
+
+    results = {}
+    if args.url:
+        results[args.url] = run_load(args.url.rstrip('/'), documents, args.requests, args.concurrency)
+    for kind in args.compare or ():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'load.db')}",
+                       UPLOAD_FOLDER=os.path.join(tmp, 'uploads'), PARSE_CACHE_SIZE='0', FLASK_DEBUG='0')
+            port = _free_port()
+            process = _start_server(kind, port, env)
+            try:
+                results[kind] = run_load(f"http://127.0.0.1:{port}", documents, args.requests, args.concurrency)
+            finally:
+                process.terminate()
+                process.wait(timeout=60)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'server':<24} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, row in results.items():
+        print(f"{name:<24} {row['requests_per_sec']:>8} {row['p50_ms']:>9} {row['p99_ms']:>9} {row['errors']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
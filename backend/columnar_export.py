@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError: # Optional: only needed for the Parquet export and reads
+    pa = None
+
+from resume_parser import PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Columnar export of parse results for analytics.
+#
+# An export is a directory of Parquet part files (zstd compressed) sharing one schema.
+# Writers only ever add new part files, which appear under their final name once
+# complete, so exports can be appended to while others read them. Reads go through
+# pyarrow.dataset: only the requested columns are decoded and filters skip row groups
+# using the per-column statistics.
+#
+#   python columnar_export.py export-db exports/resumes
+#   python columnar_export.py find-skill exports/resumes Kubernetes --columns id name email
+
+PART_PREFIX = 'part-'
+PART_SUFFIX = '.parquet'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Columnar export needs pyarrow (pip install pyarrow).")
+
+
+def export_schema():
+    """Arrow schema of exported rows: one row per parsed resume."""
+    _require_pyarrow()
+    experience = pa.struct([('title', pa.string()), ('company', pa.string()), ('period', pa.string()),
+                            ('description', pa.string())])
+    education = pa.struct([('degree', pa.string()), ('institution', pa.string()), ('period', pa.string()),
+                           ('description', pa.string())])
+    return pa.schema([
+        ('id', pa.string()), # Content hash of the upload, or another stable key
+        ('source', pa.string()), # Original file name
+        ('parsed_at', pa.timestamp('ms', tz='UTC')),
+        ('parser_version', pa.string()),
+        ('name', pa.string()),
+        ('title', pa.string()),
+        ('email', pa.string()),
+        ('phone', pa.string()),
+        ('linkedin', pa.string()),
+        ('github', pa.string()),
+        ('summary', pa.string()),
+        ('skills', pa.list_(pa.string())),
+        ('experience', pa.list_(experience)),
+        ('education', pa.list_(education)),
+        ('truncated', pa.bool_()),
+    ])
+
+
+def _item_row(item, first, second):
+    # Unstructured items are plain strings; they are kept as the description
+    if isinstance(item, str):
+        return {first: '', second: '', 'period': '', 'description': item}
+    return {first: item.get(first, ''), second: item.get(second, ''), 'period': item.get('period', ''),
+            'description': item.get('description', '')}
+
+
+def result_row(result, row_id, source=None, parsed_at=None, parser_version=PARSER_VERSION):
+    """Builds an export row from a parse result dict (ParsedResume.to_dict() shape)."""
+    return {
+        'id': row_id,
+        'source': source,
+        'parsed_at': parsed_at or datetime.now(timezone.utc),
+        'parser_version': parser_version,
+        'name': result.get('name', ''),
+        'title': result.get('title', ''),
+        'email': result.get('email', ''),
+        'phone': result.get('phone', ''),
+        'linkedin': result.get('linkedin', ''),
+        'github': result.get('github', ''),
+        'summary': result.get('summary', ''),
+        'skills': list(result.get('skills') or []),
+        'experience': [_item_row(item, 'title', 'company') for item in result.get('experience') or []],
+        'education': [_item_row(item, 'degree', 'institution') for item in result.get('education') or []],
+        'truncated': bool(result.get('truncated', False)),
+    }
+
+
+class ColumnarExportWriter:
+    """
+    Streams rows into new Parquet part files in `directory`.
+
+    Rows are buffered and written as a row group every `row_group_size` rows; a part file
+    is finished after `rows_per_file` rows. Part files are written under a hidden
+    temporary name and renamed when complete, so readers only see whole files. Use as a
+    context manager, or call close() to flush and finish the current part.
+    """
+
+    def __init__(self, directory, rows_per_file=250000, row_group_size=10000, compression='zstd'):
+        _require_pyarrow()
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = export_schema()
+        self.rows_written = 0
+        self.files_written = []
+        self._buffer = []
+        self._writer = None
+        self._part_path = None
+        self._part_rows = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_part(self):
+        name = f"{PART_PREFIX}{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:12]}{PART_SUFFIX}"
+        self._part_path = os.path.join(self.directory, name)
+        self._writer = pq.ParquetWriter(os.path.join(self.directory, '.' + name), self.schema,
+                                        compression=self.compression)
+        self._part_rows = 0
+
+    def _finish_part(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        directory, name = os.path.split(self._part_path)
+        os.replace(os.path.join(directory, '.' + name), self._part_path)
+        self.files_written.append(self._part_path)
+        logger.info(f"Wrote {self._part_rows} rows to {self._part_path}")
+        self._writer = None
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._open_part()
+        rows = self._buffer[:self.rows_per_file - self._part_rows]
+        self._buffer = self._buffer[len(rows):]
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self.schema), row_group_size=self.row_group_size)
+        self._part_rows += len(rows)
+        self.rows_written += len(rows)
+        if self._part_rows >= self.rows_per_file:
+            self._finish_part()
+        if self._buffer:
+            self._flush()
+
+    def write(self, row):
+        """Adds one row (see result_row)."""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def write_result(self, result, row_id, source=None, parsed_at=None):
+        self.write(result_row(result, row_id, source=source, parsed_at=parsed_at))
+
+    def close(self):
+        self._flush()
+        self._finish_part()
+
+    def abort(self):
+        """Drops buffered rows and the unfinished part file."""
+        self._buffer = []
+        if self._writer is not None:
+            self._writer.close()
+            directory, name = os.path.split(self._part_path)
+            os.remove(os.path.join(directory, '.' + name))
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def open_dataset(directory):
+    """The export in `directory` as a pyarrow dataset (temporary part files excluded)."""
+    _require_pyarrow()
+    return ds.dataset(directory, format='parquet', schema=export_schema(), ignore_prefixes=['.', '_'])
+
+
+def scan(directory, columns=None, where=None):
+    """
+    Reads an export, decoding only `columns` (default: all) and keeping rows matching
+    `where`, a pyarrow.compute expression such as `pc.field('email') != ''`.
+
+    Returns:
+        pyarrow.Table
+    """
+    return open_dataset(directory).to_table(columns=columns, filter=where)
+
+
+def iter_skill_matches(directory, skills, columns=('id', 'name', 'email'), batch_size=65536):
+    """
+    Yields record batches of the rows listing any of `skills` (exact, case-sensitive
+    canonical names), with `columns`. Only the skills column is read for rows that do
+    not match.
+    """
+    dataset = open_dataset(directory)
+    wanted = pa.array(list(skills), type=pa.string())
+    columns = list(columns)
+    read_columns = columns + ([] if 'skills' in columns else ['skills'])
+    for batch in dataset.to_batches(columns=read_columns, batch_size=batch_size):
+        skills_column = batch.column(batch.schema.get_field_index('skills'))
+        found = pc.is_in(pc.list_flatten(skills_column), value_set=wanted)
+        rows = pc.unique(pc.filter(pc.list_parent_indices(skills_column), found))
+        if len(rows):
+            matched = batch.take(rows)
+            yield pa.RecordBatch.from_arrays([matched.column(matched.schema.get_field_index(name)) for name in columns],
+                                             names=columns)
+
+
+def find_by_skill(directory, skill, columns=('id', 'name', 'email')):
+    """
+    Rows listing `skill`, matched by its canonical name in the skill taxonomy (so
+    "python3" finds rows with "Python") as well as the name as given.
+
+    Returns:
+        pyarrow.Table with `columns`.
+    """
+    import skill_taxonomy
+    names = {skill, skill_taxonomy.get_default().canonicalize(skill) or skill}
+    batches = list(iter_skill_matches(directory, names, columns))
+    if not batches:
+        return export_schema().empty_table().select(list(columns))
+    return pa.Table.from_batches(batches)
+
+
+def export_database(database_uri, directory, chunk_size=1000, **writer_options):
+    """
+    Exports every stored portfolio's parse result to a new part file in `directory`.
+    Rows are streamed from the database in chunks. Returns the number of rows written.
+    """
+    from sqlalchemy import create_engine, text
+    engine = create_engine(database_uri)
+    query = text("SELECT id, content_hash, resume_filename, parsed_data, created_at FROM portfolios "
+                 "WHERE parsed_data IS NOT NULL ORDER BY id")
+    with ColumnarExportWriter(directory, **writer_options) as writer, engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+        for portfolio_id, content_hash, filename, parsed_data, created_at in result:
+            try:
+                data = json.loads(parsed_data)
+            except ValueError:
+                logger.warning(f"Skipping portfolio {portfolio_id}: parsed_data is not valid JSON")
+                continue
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at)
+            if created_at is not None and created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc) # Stored as naive UTC
+            writer.write_result(data, content_hash or f"portfolio:{portfolio_id}", source=filename, parsed_at=created_at)
+    engine.dispose()
+    return writer.rows_written
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Columnar (Parquet) export of parsed resumes.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export-db', help="Export every stored portfolio to a new part file.")
+    export.add_argument('directory')
+    export.add_argument('--database-url', default=None, help="Database URL (default: the app's DATABASE_URL).")
+    find = commands.add_parser('find-skill', help="List rows with a skill.")
+    find.add_argument('directory')
+    find.add_argument('skill')
+    find.add_argument('--columns', nargs='+', default=['id', 'name', 'email'])
+    find.add_argument('--limit', type=int, default=20, help="Rows to print.")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        _require_pyarrow()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.command == 'export-db':
+        from config import Config
+        start = time.perf_counter()
+        rows = export_database(args.database_url or Config.SQLALCHEMY_DATABASE_URI, args.directory)
+        print(f"Exported {rows} resumes to {args.directory} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        return 0
+
+    start = time.perf_counter()
+    table = find_by_skill(args.directory, args.skill, args.columns)
+    elapsed = time.perf_counter() - start
+    for row in table.slice(0, args.limit).to_pylist():
+        print(json.dumps(row, default=str))
+    print(f"{table.num_rows} resumes list '{args.skill}' ({elapsed:.2f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
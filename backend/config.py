@@ -13,11 +13,11 @@ class Config:
     # It's crucial to set this to a strong, random value in production.
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev_secret_key_for_resume_portfolio_app_12345'
     
-    # Debug mode: set to False in production
-    DEBUG = os.environ.get('FLASK_DEBUG', 'True').lower() in ['true', '1', 't']
+    # Debug mode: off unless FLASK_DEBUG is set (e.g. FLASK_DEBUG=1 for local development)
+    DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() in ['true', '1', 't']
     
     # File Upload Configuration
-    # UPLOAD_FOLDER: Directory where uploaded resumes will be stored.
+    # UPLOAD_FOLDER: Directory for temporary files of uploads too large to parse in memory.
     # os.path.dirname(__file__) is the 'backend' directory if config.py is in 'backend'.
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     
@@ -27,6 +27,209 @@ class Config:
     # MAX_CONTENT_LENGTH: Maximum file size for uploads (e.g., 10MB).
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH') or 10 * 1024 * 1024) # 10 MB
 
+    # PARSE_SPILL_THRESHOLD: Uploads up to this size are parsed entirely in memory; larger
+    # uploads are spooled to a uniquely named temporary file in UPLOAD_FOLDER while parsing.
+    PARSE_SPILL_THRESHOLD = int(os.environ.get('PARSE_SPILL_THRESHOLD') or 2 * 1024 * 1024) # 2 MB
+
+    # Upload Admission Control: limits applied to /api/upload before any parsing starts.
+    # ADMISSION_RATE / ADMISSION_BURST: Uploads per second each client IP may sustain, and how
+    # many it may send at once after being idle (token bucket; rate 0, the default, disables the
+    # limit). Behind a reverse proxy every request comes from the proxy's address, so set
+    # TRUSTED_PROXY_HOPS as well or all clients share one bucket.
+    ADMISSION_RATE = float(os.environ.get('ADMISSION_RATE') or 0)
+    ADMISSION_BURST = float(os.environ.get('ADMISSION_BURST') or 10)
+    # ADMISSION_KEY_RATE / ADMISSION_KEY_BURST: The same per X-API-Key header value, applied in
+    # addition to the IP limit when a request carries a key. Keys are not verified, so this only
+    # throttles clients that keep sending the same key: omitting or rotating the header escapes
+    # it, and only the IP limit bounds such clients.
+    ADMISSION_KEY_RATE = float(os.environ.get('ADMISSION_KEY_RATE') or 5)
+    ADMISSION_KEY_BURST = float(os.environ.get('ADMISSION_KEY_BURST') or 20)
+    # TRUSTED_PROXY_HOPS: Reverse proxies in front of the app that append the client address to
+    # X-Forwarded-For (e.g. nginx proxy_add_x_forwarded_for). The client IP is the entry the
+    # outermost of them appended, counted from the right, so addresses a client puts in the
+    # header itself are ignored. 0, the default, uses the connection's address.
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS') or 0)
+    # ADMISSION_MAX_CONCURRENT: Synchronous parses running at once in this process (0 for no limit).
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT') or os.cpu_count() or 2)
+    # ADMISSION_QUEUE_DEPTH / ADMISSION_QUEUE_TIMEOUT: Uploads allowed to wait for a parse slot,
+    # and for how many seconds, before getting a 429 with Retry-After.
+    ADMISSION_QUEUE_DEPTH = int(os.environ.get('ADMISSION_QUEUE_DEPTH') or 16)
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT') or 5)
+    # ADMISSION_CHECK_SIGNATURE: Reject uploads whose first bytes do not match their extension
+    # (e.g. a .pdf that is not a PDF) with a 415, before the rest of the body is read.
+    ADMISSION_CHECK_SIGNATURE = os.environ.get('ADMISSION_CHECK_SIGNATURE', 'True').lower() in ['true', '1', 't']
+
+    # Extraction Budgets: documents beyond these limits stop early and are flagged as truncated.
+    # PARSE_MAX_PAGES: Maximum PDF pages extracted per resume (0 for no limit).
+    PARSE_MAX_PAGES = int(os.environ.get('PARSE_MAX_PAGES') or 50) or None
+    # PARSE_MAX_CHARS: Maximum characters extracted per resume (0 for no limit).
+    PARSE_MAX_CHARS = int(os.environ.get('PARSE_MAX_CHARS') or 200000) or None
+    # PARSE_PDF_READING_ORDER: Extract PDF text in reading order (columns, blocks, header hints)
+    # instead of content stream order, which interleaves multi-column layouts. Opt-in: it is
+    # only measured on the synthetic corpus so far (benchmarks/bench_pdf_layout.py).
+    PARSE_PDF_READING_ORDER = os.environ.get('PARSE_PDF_READING_ORDER', 'False').lower() in ['true', '1', 't']
+    # PARSE_PDF_PAGE_SECONDS: Time budget for reading-order extraction of one PDF page; a page
+    # over budget is cut short and the result flagged as truncated (0 for no limit).
+    PARSE_PDF_PAGE_SECONDS = float(os.environ.get('PARSE_PDF_PAGE_SECONDS') or 2) or None
+
+    # PARSE_PRELOAD: Import the PDF/DOCX libraries when the app starts instead of on the first
+    # upload of each format. Useful with pre-fork servers that load the app in the master.
+    PARSE_PRELOAD = os.environ.get('PARSE_PRELOAD', 'False').lower() in ['true', '1', 't']
+
+    # Parse Result Cache
+    # PARSE_CACHE_SIZE: Number of parse results kept in the in-memory LRU tier (0 disables it).
+    PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE') or 256)
+    # PARSE_CACHE_DIR: Optional directory for the on-disk cache tier. Unset disables the disk tier.
+    PARSE_CACHE_DIR = os.environ.get('PARSE_CACHE_DIR') or None
+
+    # Asynchronous Parse Jobs
+    # PARSE_ASYNC_DEFAULT: Make /api/upload return a job id instead of the parsed data unless
+    # the client asks otherwise (?async=0). The synchronous path is the default.
+    PARSE_ASYNC_DEFAULT = os.environ.get('PARSE_ASYNC_DEFAULT', 'False').lower() in ['true', '1', 't']
+    # PARSE_ASYNC_WORKERS: Size of the parse process pool (defaults to the number of CPUs).
+    PARSE_ASYNC_WORKERS = int(os.environ.get('PARSE_ASYNC_WORKERS') or os.cpu_count() or 1)
+    # PARSE_ASYNC_QUEUE_DEPTH: Jobs allowed to wait for a free worker before uploads get a 429.
+    PARSE_ASYNC_QUEUE_DEPTH = int(os.environ.get('PARSE_ASYNC_QUEUE_DEPTH') or 32)
+    # PARSE_JOB_TTL: Seconds a finished job's result stays available at /api/jobs/<id>. Jobs are
+    # tracked by the process that accepted the upload (see SERVER_WORKERS).
+    PARSE_JOB_TTL = int(os.environ.get('PARSE_JOB_TTL') or 600)
+
+    # Parse Sandbox: run upload parses (synchronous, ?async=1 and /api/upload/batch) in isolated,
+    # reusable worker processes with resource limits, so a malicious or corrupt file cannot stall
+    # or exhaust the server. Async and batch parses then share the sandbox workers instead of
+    # using the PARSE_ASYNC_WORKERS and BATCH_MAX_WORKERS pools.
+    PARSE_SANDBOX = os.environ.get('PARSE_SANDBOX', 'False').lower() in ['true', '1', 't']
+    # PARSE_SANDBOX_WORKERS: Sandbox worker processes (parses running at once).
+    PARSE_SANDBOX_WORKERS = int(os.environ.get('PARSE_SANDBOX_WORKERS') or os.cpu_count() or 1)
+    # PARSE_SANDBOX_CPU_SECONDS: CPU time allowed per parse (0 for no limit).
+    PARSE_SANDBOX_CPU_SECONDS = int(os.environ.get('PARSE_SANDBOX_CPU_SECONDS') or 20)
+    # PARSE_SANDBOX_MEMORY_MB: Memory a worker may allocate on top of its baseline (0 for no limit).
+    PARSE_SANDBOX_MEMORY_MB = int(os.environ.get('PARSE_SANDBOX_MEMORY_MB') or 512)
+    # PARSE_SANDBOX_TIMEOUT: Wall-clock seconds per parse before the worker is killed; also how
+    # long an upload waits for a free worker before getting a 429.
+    PARSE_SANDBOX_TIMEOUT = int(os.environ.get('PARSE_SANDBOX_TIMEOUT') or 30)
+    # PARSE_SANDBOX_MAX_JOBS: Parses a worker handles before it is replaced.
+    PARSE_SANDBOX_MAX_JOBS = int(os.environ.get('PARSE_SANDBOX_MAX_JOBS') or 200)
+
+    # Parse Profiling: capture profiles and inputs of slow (or randomly sampled) /api/upload parses
+    # PARSE_PROFILE_DIR: Directory for captures; unset disables profiling. List and replay them
+    # with `python profiler.py list|replay --dir <dir>`. With PARSE_SANDBOX the profile covers the
+    # app's side only; replaying the saved input gives the parser's profile.
+    PARSE_PROFILE_DIR = os.environ.get('PARSE_PROFILE_DIR') or None
+    # PARSE_PROFILE_SAMPLE_RATE: Fraction of parses (0-1) run under cProfile and captured.
+    PARSE_PROFILE_SAMPLE_RATE = float(os.environ.get('PARSE_PROFILE_SAMPLE_RATE') or 0)
+    # PARSE_PROFILE_SLOW_SECONDS: Parses taking this long are always captured, with stacks
+    # sampled from the moment they cross it (0 disables slow captures).
+    PARSE_PROFILE_SLOW_SECONDS = float(os.environ.get('PARSE_PROFILE_SLOW_SECONDS') or 5)
+    # PARSE_PROFILE_MAX_INPUT_BYTES: Uploads up to this size are saved with their capture (by
+    # content hash, without the original filename); larger ones only record size and hash.
+    PARSE_PROFILE_MAX_INPUT_BYTES = int(os.environ.get('PARSE_PROFILE_MAX_INPUT_BYTES') or 5 * 1024 * 1024)
+    # PARSE_PROFILE_RETENTION / PARSE_PROFILE_MAX_CAPTURES: Seconds captures are kept, and how
+    # many at most (oldest deleted first).
+    PARSE_PROFILE_RETENTION = int(os.environ.get('PARSE_PROFILE_RETENTION') or 7 * 24 * 3600)
+    PARSE_PROFILE_MAX_CAPTURES = int(os.environ.get('PARSE_PROFILE_MAX_CAPTURES') or 200)
+    # ADMIN_TOKEN: Enables the /api/admin endpoints (e.g. listing parse captures) for requests
+    # with a matching X-Admin-Token header. Unset, those endpoints return 404.
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN') or None
+
+    # Near-Duplicate Detection: MinHash signatures of extracted text in an in-memory LSH index
+    NEAR_DUPLICATE_INDEX = os.environ.get('NEAR_DUPLICATE_INDEX', 'True').lower() in ['true', '1', 't']
+    # NEAR_DUPLICATE_INDEX_SIZE: Resumes kept in the index (oldest dropped first).
+    NEAR_DUPLICATE_INDEX_SIZE = int(os.environ.get('NEAR_DUPLICATE_INDEX_SIZE') or 10000)
+    # NEAR_DUPLICATE_BANDS: LSH bands of the 128-value signature (must divide 128). More bands
+    # find less similar pairs at the cost of more comparisons; 16 targets similarity >= ~0.7.
+    NEAR_DUPLICATE_BANDS = int(os.environ.get('NEAR_DUPLICATE_BANDS') or 16)
+    # NEAR_DUPLICATE_THRESHOLD: Estimated similarity (0-1) at which resumes are reported as near-duplicates.
+    NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD') or 0.8)
+    # NEAR_DUPLICATE_REUSE_THRESHOLD: Similarity at which an upload reuses the cached parse of
+    # its near-duplicate instead of parsing its own text (0 disables reuse; e.g. 0.97).
+    NEAR_DUPLICATE_REUSE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_REUSE_THRESHOLD') or 0)
+    # NEAR_DUPLICATE_SNAPSHOT: Optional file the index is loaded from at startup and saved to
+    # periodically and at exit. Each serving process saves its own index over the file, so with
+    # several SERVER_WORKERS the last one to exit wins; give each process its own file.
+    NEAR_DUPLICATE_SNAPSHOT = os.environ.get('NEAR_DUPLICATE_SNAPSHOT') or None
+    # NEAR_DUPLICATE_SNAPSHOT_INTERVAL: Additions between background snapshot saves.
+    NEAR_DUPLICATE_SNAPSHOT_INTERVAL = int(os.environ.get('NEAR_DUPLICATE_SNAPSHOT_INTERVAL') or 100)
+
+    # Skill Taxonomy: extracted skills are mapped to canonical names from backend/data/skills.txt
+    # SKILL_TAXONOMY_PATHS: Additional dictionary files in the same format ("Canonical | alias | ...")
+    # separated by the OS path separator (':' on Linux). Earlier files win when names collide.
+    SKILL_TAXONOMY_PATHS = [path for path in os.environ.get('SKILL_TAXONOMY_PATHS', '').split(os.pathsep) if path]
+    # SKILL_FUZZY_THRESHOLD: Trigram similarity (0-1) for matching misspelled or variant skills
+    # to the dictionary (0 disables fuzzy matching; exact and versioned names still match).
+    SKILL_FUZZY_THRESHOLD = float(os.environ.get('SKILL_FUZZY_THRESHOLD') or 0.8)
+
+    # Incremental Re-parsing (/api/reparse)
+    # REPARSE_SESSION_LIMIT: Edit sessions kept in memory; the least recently used is dropped beyond this.
+    # Sessions live in the serving process, so with several workers clients need sticky routing
+    # (see SERVER_WORKERS).
+    REPARSE_SESSION_LIMIT = int(os.environ.get('REPARSE_SESSION_LIMIT') or 256)
+    # REPARSE_SESSION_TTL: Seconds an idle edit session is kept.
+    REPARSE_SESSION_TTL = int(os.environ.get('REPARSE_SESSION_TTL') or 1800)
+
+    # Batch Ingestion (/api/upload/batch)
+    # BATCH_MAX_WORKERS: Worker processes shared by batch uploads (defaults to the number of CPUs).
+    # Note that a whole batch request is still bounded by MAX_CONTENT_LENGTH.
+    BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS') or os.cpu_count() or 1)
+    # BATCH_MAX_FILES: Maximum number of resumes accepted in one batch (multipart files plus zip members).
+    BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES') or 500)
+    # COLUMNAR_EXPORT_DIR: Optional directory where each batch also streams its parse results
+    # into a new Parquet part file for analytics (needs pyarrow; see columnar_export.py).
+    COLUMNAR_EXPORT_DIR = os.environ.get('COLUMNAR_EXPORT_DIR') or None
+
+    # Metrics and Timing
+    # METRICS_ENABLED: Time each upload stage and expose histograms at /api/metrics.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() in ['true', '1', 't']
+    # PARSE_TIMING_HEADER: Add an X-Parse-Timing header with per-stage durations to upload responses.
+    PARSE_TIMING_HEADER = os.environ.get('PARSE_TIMING_HEADER', 'False').lower() in ['true', '1', 't']
+
+    # Portfolio Rendering
+    # PORTFOLIO_RENDER_CACHE_SIZE: Number of rendered portfolio pages kept in memory (0 disables it).
+    PORTFOLIO_RENDER_CACHE_SIZE = int(os.environ.get('PORTFOLIO_RENDER_CACHE_SIZE') or 128)
+    # PORTFOLIO_TEMPLATE_CACHE_DIR: Optional directory for Jinja2 template bytecode, shared by
+    # worker processes so templates are compiled only once. Unset keeps bytecode in memory only.
+    PORTFOLIO_TEMPLATE_CACHE_DIR = os.environ.get('PORTFOLIO_TEMPLATE_CACHE_DIR') or None
+
+    # Production Server (gunicorn, see gunicorn.conf.py and wsgi.py)
+    # SERVER_BIND: Address the server listens on.
+    SERVER_BIND = os.environ.get('SERVER_BIND') or '0.0.0.0:9000'
+    # SERVER_WORKERS: Pre-forked worker processes. With one worker, synchronous parses run in
+    # its request threads and share one CPU (the GIL); set PARSE_SANDBOX to spread them over
+    # PARSE_SANDBOX_WORKERS processes. Async (?async=1) and batch parses use their own process
+    # pools (or the sandbox). Async jobs (/api/jobs/<id>), reparse sessions (/api/reparse),
+    # rendered pages (/api/portfolio/render/<digest>) and the near-duplicate index all live in
+    # the serving process: with more than one worker, requests for them 404 or miss unless the
+    # load balancer routes each client to the same worker (sticky sessions), and workers must
+    # not share a NEAR_DUPLICATE_SNAPSHOT file.
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS') or 1)
+    # SERVER_THREADS: Threads per worker. Threads overlap upload I/O and DB writes; values above 1
+    # use the threaded (gthread) worker.
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS') or 4)
+    # SERVER_MAX_REQUESTS: Recycle a worker after this many requests to contain parser memory
+    # growth (0, the default, disables). A recycled worker loses the per-process state listed
+    # above; PARSE_SANDBOX contains parser memory without that, as its workers are replaced
+    # every PARSE_SANDBOX_MAX_JOBS parses. SERVER_MAX_REQUESTS_JITTER staggers restarts.
+    SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS') or 0)
+    SERVER_MAX_REQUESTS_JITTER = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER') or 50)
+    # SERVER_TIMEOUT: Seconds a worker may spend on one request before it is killed and replaced.
+    # Sized for large PDFs at the default extraction budgets.
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT') or 120)
+    # SERVER_GRACEFUL_TIMEOUT: Seconds in-flight requests get to finish on shutdown or reload.
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT') or 30)
+    # SERVER_KEEPALIVE: Seconds an idle keep-alive connection is held open.
+    SERVER_KEEPALIVE = int(os.environ.get('SERVER_KEEPALIVE') or 5)
+    # SERVER_PRELOAD: Load the app (and parser libraries) once in the master before forking, so
+    # workers start fast and share that memory copy-on-write.
+    SERVER_PRELOAD = os.environ.get('SERVER_PRELOAD', 'True').lower() in ['true', '1', 't']
+
+    # Frontend (React build) Serving
+    # FRONTEND_BUILD_DIR: Directory produced by `npm run build`.
+    FRONTEND_BUILD_DIR = os.environ.get('FRONTEND_BUILD_DIR') or \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'build')
+    # STATIC_MANIFEST: Load the build into memory at startup and serve it with compression and
+    # long-lived caching. Disable while the frontend is being rebuilt under a running server.
+    STATIC_MANIFEST = os.environ.get('STATIC_MANIFEST', 'True').lower() in ['true', '1', 't']
+
     # Database Configuration (Placeholder for SQLite)
     # SQLALCHEMY_DATABASE_URI: Connection string for the database.
     # Defaults to a SQLite database named 'database.db' in the project root directory.
@@ -35,3 +238,20 @@ class Config:
     
     # SQLALCHEMY_TRACK_MODIFICATIONS: Disable Flask-SQLAlchemy event system if not needed.
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # SQLALCHEMY_ENGINE_OPTIONS: Connection pool settings. Each request thread checks out its own
+    # connection; SQLite runs in WAL mode (see models.init_db) and waits up to
+    # DB_BUSY_TIMEOUT seconds for the write lock instead of failing with "database is locked".
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or 5),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 10),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT') or 30),
+        'pool_pre_ping': True,
+    }
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'timeout': int(os.environ.get('DB_BUSY_TIMEOUT') or 30),
+            'check_same_thread': False,
+        }
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS['pool_recycle'] = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
@@ -0,0 +1,42 @@
+# gunicorn settings, driven by the SERVER_* values in Config:
+#   cd backend && gunicorn -c gunicorn.conf.py wsgi:app
+import os
+from config import Config
+
+bind = Config.SERVER_BIND
+workers = Config.SERVER_WORKERS
+threads = Config.SERVER_THREADS
+worker_class = 'gthread' if Config.SERVER_THREADS > 1 else 'sync'
+max_requests = Config.SERVER_MAX_REQUESTS
+max_requests_jitter = Config.SERVER_MAX_REQUESTS_JITTER if Config.SERVER_MAX_REQUESTS else 0
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+keepalive = Config.SERVER_KEEPALIVE
+preload_app = Config.SERVER_PRELOAD
+# Worker heartbeat files; a tmpfs avoids false timeouts when the disk is slow
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = '-'
+
+
+def on_starting(server):
+    if preload_app:
+        # Import the PDF/DOCX libraries in the master so forked workers inherit them
+        from resume_parser import warmup
+        timings = warmup()
+        server.log.info("Preloaded parser libraries: " + ', '.join(f"{kind} {seconds * 1000:.0f} ms" for kind, seconds in timings.items()))
+
+
+def when_ready(server):
+    if workers > 1:
+        server.log.warning(f"Running {workers} workers: async jobs, reparse sessions, rendered pages and the "
+                           "near-duplicate index are per process, so clients need sticky routing (see SERVER_WORKERS).")
+
+
+def post_fork(server, worker):
+    if preload_app:
+        # Database connections opened while loading the app in the master must not be
+        # shared with the children; each worker opens its own.
+        from app import app
+        from models import db
+        with app.app_context():
+            db.engine.dispose(close=False)
@@ -0,0 +1,349 @@
+import re
+import time
+import uuid
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+
+from resume_model import ParsedResume
+from resume_parser import (CONTACT_LINE_PATTERN, _detect_name_title, _finish_contacts, _normalize_skills,
+                           _phone_candidate, _process_section_content, _section_header_key,
+                           _token_contact_candidates, _try_structure_item)
+
+logger = logging.getLogger(__name__)
+
+# A phone number run ([\d\s+()._-] characters, see PHONE_RUN_PATTERN) can continue from
+# one segment into the next when the next header line starts with one of these.
+PHONE_RUN_CHAR_PATTERN = re.compile(r'[\d\s+()._-]')
+
+# Block size used when looking for the common prefix/suffix of two texts
+COMPARE_BLOCK = 1024
+
+
+def _split_segments(text):
+    """
+    Splits text at section headers.
+
+    Returns a list whose first item is the text before the first header (possibly empty)
+    followed by one item per section. Each section starts at the first non-whitespace
+    character of its header line, so the pieces concatenate back to `text` and every
+    boundary falls on whitespace.
+    """
+    parts = []
+    segment_start = 0
+    line_start = 0
+    while True:
+        newline = text.find('\n', line_start)
+        line = text[line_start:] if newline == -1 else text[line_start:newline]
+        stripped = line.strip()
+        if stripped and _section_header_key(stripped) is not None:
+            header_start = line_start + len(line) - len(line.lstrip())
+            parts.append(text[segment_start:header_start])
+            segment_start = header_start
+        if newline == -1:
+            break
+        line_start = newline + 1
+    parts.append(text[segment_start:])
+    return parts
+
+
+def _leading_lines(text, count=2):
+    """The first `count` non-empty stripped lines of the text, without splitting all of it."""
+    lines = []
+    line_start = 0
+    while len(lines) < count and line_start <= len(text):
+        newline = text.find('\n', line_start)
+        if newline == -1:
+            newline = len(text)
+        line = text[line_start:newline].strip()
+        if line:
+            lines.append(line)
+        line_start = newline + 1
+    return lines
+
+
+def _common_prefix_length(a, b, limit):
+    position = 0
+    while position < limit:
+        block = min(COMPARE_BLOCK, limit - position)
+        if a[position:position + block] == b[position:position + block]:
+            position += block
+            continue
+        while a[position] == b[position]:
+            position += 1
+        return position
+    return limit
+
+
+def _common_suffix_length(a, b, limit):
+    length = 0
+    while length < limit:
+        block = min(COMPARE_BLOCK, limit - length)
+        if a[len(a) - length - block:len(a) - length] == b[len(b) - length - block:len(b) - length]:
+            length += block
+            continue
+        while a[len(a) - length - 1] == b[len(b) - length - 1]:
+            length += 1
+        return length
+    return limit
+
+
+class _Segment:
+    """One section of the text (or the text before the first section) and what it contributes to the result."""
+
+    __slots__ = ('text', 'email', 'linkedin', 'github', 'phone', 'summary_line',
+                 'experience', 'education', 'skills', 'summary')
+
+    def __init__(self, text, is_preamble, name, title):
+        self.text = text
+        self.email, self.linkedin, self.github = _token_contact_candidates(text)
+        self.phone = '' # Phone candidate of the run group this segment leads, see _update_phones()
+        self.summary_line = '' # Preamble only: the heuristic summary line
+        self.experience = []
+        self.education = []
+        self.skills = set()
+        self.summary = '' # Explicit summary section content
+
+        lines = [line for line in (raw_line.strip() for raw_line in text.split('\n')) if line]
+        if is_preamble:
+            for line in lines:
+                if line != name and line != title and len(line.split()) > 3 and not CONTACT_LINE_PATTERN.search(line):
+                    self.summary_line = line
+                    break
+        elif lines:
+            scratch = ParsedResume()
+            content = [line for line in lines[1:] if line != name and line != title]
+            _process_section_content(_section_header_key(lines[0]), content, scratch)
+            self.experience = [_try_structure_item(block, 'experience') for block in scratch.experience]
+            self.education = [_try_structure_item(block, 'education') for block in scratch.education]
+            self.skills = _normalize_skills(scratch.skills)
+            self.summary = scratch.summary
+
+    def joins_previous_run(self):
+        return bool(self.text) and PHONE_RUN_CHAR_PATTERN.match(self.text) is not None
+
+
+class IncrementalParse:
+    """
+    Parse state of a resume text that can be edited in place.
+
+    The text is kept split into sections (see _split_segments); each section caches its
+    structured items, skills, summary and contact candidates. An edit re-splits and
+    re-analyzes only the sections it touches, so its cost grows with the size of the
+    change rather than the document. Only a change of the detected name or title, which
+    every section filters out of its content, re-analyzes everything.
+
+    result() is always identical to _parse_sections() on the current text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.revision = 0
+        self.name, self.title = _detect_name_title(_leading_lines(text))
+        self.segments = self._analyze(_split_segments(text), 0)
+        self.starts = self._segment_starts(0, 0)
+        self._update_phones(0, len(self.segments))
+        self.last_stats = {'segments': len(self.segments), 'reparsed': len(self.segments), 'full': True}
+
+    def _analyze(self, texts, first_index):
+        return [_Segment(text, first_index + offset == 0, self.name, self.title) for offset, text in enumerate(texts)]
+
+    def _segment_starts(self, from_index, position):
+        starts = self.starts[:from_index] if from_index else []
+        for segment in self.segments[from_index:]:
+            starts.append(position)
+            position += len(segment.text)
+        return starts
+
+    def _update_phones(self, first, stop):
+        """Recomputes the phone candidate of every run group with a member in segments[first:stop]."""
+        segments = self.segments
+        while first > 0 and segments[first].joins_previous_run():
+            first -= 1
+        while stop < len(segments) and segments[stop].joins_previous_run():
+            stop += 1
+        index = first
+        while index < stop:
+            group_end = index + 1
+            while group_end < len(segments) and segments[group_end].joins_previous_run():
+                group_end += 1
+            for member in segments[index + 1:group_end]:
+                member.phone = ''
+            segments[index].phone = _phone_candidate(''.join(segment.text for segment in segments[index:group_end]))
+            index = group_end
+
+    def _segment_at(self, position):
+        return bisect.bisect_right(self.starts, position) - 1
+
+    def _splice(self, start, end, replacement):
+        """Replaces text[start:end] with `replacement` (already validated). Returns (reparsed, full)."""
+        text = self.text
+        new_text = text[:start] + replacement + text[end:]
+        delta = len(replacement) - (end - start)
+
+        # Grow the edited region [first, stop) until it is cut at segment boundaries that
+        # are still valid in the new text: nothing but whitespace may precede its first
+        # header, and its last line must not run into the next segment's header line.
+        segment_count = len(self.segments)
+        first = self._segment_at(start)
+        stop = self._segment_at(end) + 1
+        while True:
+            region_start = self.starts[first]
+            region_end = (self.starts[stop] if stop < segment_count else len(text)) + delta
+            region = new_text[region_start:region_end]
+            if stop < segment_count and region[region.rfind('\n') + 1:].strip():
+                stop += 1
+                continue
+            parts = _split_segments(region)
+            if first > 0 and parts[0]:
+                first -= 1
+                continue
+            break
+        if first > 0:
+            parts = parts[1:]
+
+        self.text = new_text
+        name_title = _detect_name_title(_leading_lines(new_text))
+        full = name_title != (self.name, self.title)
+        if full:
+            self.name, self.title = name_title
+            texts = [segment.text for segment in self.segments[:first]] + parts + \
+                    [segment.text for segment in self.segments[stop:]]
+            self.segments = self._analyze(texts, 0)
+            self.starts = self._segment_starts(0, 0)
+            self._update_phones(0, len(self.segments))
+        else:
+            self.segments[first:stop] = self._analyze(parts, first)
+            self.starts = self._segment_starts(first, region_start)
+            self._update_phones(max(0, first - 1), min(first + len(parts), len(self.segments)))
+
+        return (len(self.segments) if full else len(parts)), full
+
+    def _finish_revision(self, reparsed, full):
+        self.revision += 1
+        self.last_stats = {'segments': len(self.segments), 'reparsed': reparsed, 'full': full}
+        return self.last_stats
+
+    def apply_edits(self, edits):
+        """
+        Applies a list of {'start', 'end', 'text'} edits in order, as one new revision.
+        Offsets of each edit refer to the text as left by the previous one. All edits are
+        validated before any is applied. Returns stats for the revision.
+
+        Raises:
+            ValueError: If an edit is malformed or its range lies outside the text.
+        """
+        length = len(self.text)
+        spans = []
+        for edit in edits:
+            if not isinstance(edit, dict):
+                raise ValueError("Each edit must be an object with 'start', 'end' and 'text'.")
+            start, end, replacement = edit.get('start'), edit.get('end'), edit.get('text', '')
+            if type(start) is not int or type(end) is not int or not isinstance(replacement, str):
+                raise ValueError("Each edit needs integer 'start' and 'end' offsets and a 'text' string.")
+            if not 0 <= start <= end <= length:
+                raise ValueError(f"Edit range {start}-{end} is outside the text (length {length}).")
+            length += len(replacement) - (end - start)
+            spans.append((start, end, replacement))
+
+        reparsed = 0
+        full = False
+        for start, end, replacement in spans:
+            edit_reparsed, edit_full = self._splice(start, end, replacement)
+            reparsed += edit_reparsed
+            full = full or edit_full
+        return self._finish_revision(reparsed, full)
+
+    def replace_text(self, new_text):
+        """Updates to `new_text` as one new revision, splicing only the span that differs from the current text."""
+        text = self.text
+        if new_text == text:
+            return self._finish_revision(0, False)
+        limit = min(len(text), len(new_text))
+        prefix = _common_prefix_length(text, new_text, limit)
+        suffix = _common_suffix_length(text, new_text, limit - prefix)
+        return self._finish_revision(*self._splice(prefix, len(text) - suffix, new_text[prefix:len(new_text) - suffix]))
+
+    def new_length(self, edits):
+        """Length of the text after `edits`, for size checks before applying them (assumes valid edits)."""
+        length = len(self.text)
+        for edit in edits:
+            if isinstance(edit, dict) and type(edit.get('start')) is int and type(edit.get('end')) is int:
+                length += len(edit.get('text') or '') - (edit['end'] - edit['start'])
+        return length
+
+    def result(self):
+        """Assembles the ParsedResume for the current text from the cached segments."""
+        segments = self.segments
+        contacts = _finish_contacts(
+            min((segment.email for segment in segments if segment.email), default=''),
+            min((segment.phone for segment in segments if segment.phone), default=''),
+            min((segment.linkedin for segment in segments if segment.linkedin), default=''),
+            min((segment.github for segment in segments if segment.github), default=''))
+        summary = next((segment.summary for segment in reversed(segments) if segment.summary), '')
+        return ParsedResume(
+            name=self.name,
+            title=self.title,
+            summary=(summary or segments[0].summary_line).strip(),
+            experience=[item for segment in segments for item in segment.experience],
+            education=[item for segment in segments for item in segment.education],
+            skills=sorted(set().union(*(segment.skills for segment in segments))),
+            **contacts)
+
+
+class ReparseSessionStore:
+    """
+    Holds IncrementalParse states for /api/reparse by session id.
+
+    Bounded LRU with a time-to-live: sessions idle for `ttl` seconds expire, and the
+    least recently used session is dropped beyond `max_sessions`. Each session has its
+    own lock, held by callers while they edit it.
+    """
+
+    def __init__(self, max_sessions=256, ttl=1800):
+        self.max_sessions = max(1, int(max_sessions))
+        self.ttl = ttl
+        self._sessions = OrderedDict() # id -> (state, lock, last used)
+        self._lock = threading.Lock()
+
+    def _prune_expired(self):
+        # Caller must hold self._lock
+        cutoff = time.time() - self.ttl
+        while self._sessions:
+            session_id, (_, _, last_used) = next(iter(self._sessions.items()))
+            if last_used >= cutoff:
+                break
+            del self._sessions[session_id]
+
+    def create(self, text):
+        """Parses `text` into a new session. Returns (session id, state, lock)."""
+        state = IncrementalParse(text)
+        session_id = uuid.uuid4().hex
+        lock = threading.Lock()
+        with self._lock:
+            self._prune_expired()
+            self._sessions[session_id] = (state, lock, time.time())
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id, state, lock
+
+    def get(self, session_id):
+        """Returns (state, lock) for a live session, or None if it is unknown or expired."""
+        with self._lock:
+            self._prune_expired()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            state, lock, _ = entry
+            self._sessions[session_id] = (state, lock, time.time())
+            self._sessions.move_to_end(session_id)
+        return state, lock
+
+    def discard(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            return {'sessions': len(self._sessions), 'max_sessions': self.max_sessions, 'ttl': self.ttl}
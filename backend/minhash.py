@@ -0,0 +1,252 @@
+import os
+import re
+import sys
+import json
+import zlib
+import base64
+import logging
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Near-duplicate detection for extracted resume text.
+#
+# A signature summarizes the set of word shingles (runs of SHINGLE_SIZE consecutive
+# words) of a text, so that the fraction of equal signature slots estimates the Jaccard
+# similarity of two shingle sets. Signatures use one-permutation hashing: every shingle
+# is hashed once and lands in one of NUM_PERM bins, keeping the minimum per bin, and
+# empty bins borrow from their right neighbour (rotation densification). That costs one
+# hash per shingle instead of NUM_PERM.
+#
+# NearDuplicateIndex buckets signatures by bands of rows (locality-sensitive hashing),
+# so a lookup only compares against entries sharing at least one band.
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+TOKEN_PATTERN = re.compile(r'\w+')
+
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64
+
+# Hash of a shingle: CPython's tuple hash over the tokens' CRC-32s. Tuple hashing of
+# ints does not depend on PYTHONHASHSEED, but it is interpreter specific, so snapshots
+# record this scheme and are discarded when it changes.
+HASH_SCHEME = f"crc32-tuple-{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}-{sys.hash_info.width}"
+
+
+def shingle_hashes(text, shingle_size=SHINGLE_SIZE):
+    """Returns the set of 64-bit hashes of the text's word shingles (lowercased \\w+ tokens)."""
+    token_hashes = {}
+    tokens = [token_hashes.get(token) or token_hashes.setdefault(token, zlib.crc32(token.encode('utf-8')))
+              for token in TOKEN_PATTERN.findall(text.lower())]
+    if not tokens:
+        return set()
+    if len(tokens) < shingle_size:
+        return {hash(tuple(tokens)) & _MASK64}
+    return {value & _MASK64 for value in map(hash, zip(*(tokens[i:] for i in range(shingle_size))))}
+
+
+def signature(text, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+    """
+    Computes the MinHash signature of a text.
+
+    Returns:
+        array('Q') of `num_perm` values, or None if the text has no words.
+    """
+    hashes = shingle_hashes(text, shingle_size)
+    if not hashes:
+        return None
+    bins = [_EMPTY] * num_perm
+    for value in hashes:
+        rank, slot = divmod(value, num_perm)
+        if rank < bins[slot]:
+            bins[slot] = rank
+    # Densify: an empty bin takes the value of the next non-empty bin to its right, offset
+    # by the distance so borrowed values never collide with real ones
+    offset = (_MASK64 // num_perm) + 1
+    if _EMPTY in bins:
+        densified = bins[:]
+        for i, value in enumerate(bins):
+            if value == _EMPTY:
+                distance = 1
+                while bins[(i + distance) % num_perm] == _EMPTY:
+                    distance += 1
+                densified[i] = (bins[(i + distance) % num_perm] + distance * offset) & _MASK64
+        bins = densified
+    return array('Q', bins)
+
+
+def similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of the texts behind two signatures (0.0 - 1.0)."""
+    if len(signature_a) != len(signature_b) or not signature_a:
+        return 0.0
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index of text signatures, keyed by an id (e.g. the content hash).
+
+    Signatures are split into `bands` bands of `num_perm // bands` rows; two texts with
+    Jaccard similarity s share at least one band with probability 1 - (1 - s^rows)^bands,
+    so with the defaults (16 bands of 8 rows) pairs above ~0.7 are almost always found
+    and dissimilar ones almost never compared. Each entry keeps a small metadata dict.
+
+    At most `max_entries` entries are kept (oldest dropped first). If `snapshot_path` is
+    set, the index is loaded from it on creation and saved to it by save(), and in the
+    background after every `snapshot_interval` additions. All methods are thread-safe.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=16, shingle_size=SHINGLE_SIZE, max_entries=10000,
+                 snapshot_path=None, snapshot_interval=100):
+        if bands < 1 or num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands}).")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max(1, int(max_entries))
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._entries = OrderedDict() # key -> (signature, metadata)
+        self._buckets = [{} for _ in range(bands)] # band -> band bytes -> set of keys
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self.evictions = 0
+        if snapshot_path:
+            self.load(snapshot_path)
+
+    def _band_keys(self, sig):
+        rows = self.rows
+        return [sig[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def _remove(self, key):
+        # Caller must hold self._lock
+        sig, _ = self._entries.pop(key)
+        for bucket, band_key in zip(self._buckets, self._band_keys(sig)):
+            keys = bucket.get(band_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band_key]
+
+    def _insert(self, key, sig, metadata):
+        # Caller must hold self._lock
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (sig, metadata)
+        for bucket, band_key in zip(self._buckets, self._band_keys(sig)):
+            bucket.setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def add(self, key, sig, metadata=None):
+        """Indexes `sig` under `key` (replacing any previous entry) with optional metadata."""
+        if sig is None or len(sig) != self.num_perm:
+            return
+        with self._lock:
+            self._insert(key, sig, dict(metadata or {}))
+            self._unsaved += 1
+            save_now = bool(self.snapshot_path) and self._unsaved >= self.snapshot_interval
+            if save_now:
+                self._unsaved = 0
+        if save_now:
+            threading.Thread(target=self.save, name='minhash-snapshot', daemon=True).start()
+
+    def update_metadata(self, key, **metadata):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1].update(metadata)
+
+    def get(self, key):
+        """Returns (signature, metadata) for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else (entry[0], dict(entry[1]))
+
+    def query(self, sig, threshold=0.8, limit=10, exclude=None):
+        """
+        Finds indexed entries similar to `sig`.
+
+        Returns:
+            list: Up to `limit` (key, similarity, metadata) tuples with similarity >=
+                  `threshold`, most similar first. `exclude` (a key) is skipped.
+        """
+        if sig is None or len(sig) != self.num_perm:
+            return []
+        with self._lock:
+            candidates = set()
+            for bucket, band_key in zip(self._buckets, self._band_keys(sig)):
+                keys = bucket.get(band_key)
+                if keys:
+                    candidates.update(keys)
+            candidates.discard(exclude)
+            matches = []
+            for key in candidates:
+                other, metadata = self._entries[key]
+                score = similarity(sig, other)
+                if score >= threshold:
+                    matches.append((key, score, dict(metadata)))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit]
+
+    def _params(self):
+        return {'num_perm': self.num_perm, 'bands': self.bands, 'shingle_size': self.shingle_size,
+                'hash_scheme': HASH_SCHEME}
+
+    def save(self, path=None):
+        """Writes the index to `path` (default: snapshot_path) atomically as JSON."""
+        path = path or self.snapshot_path
+        if not path:
+            return
+        with self._save_lock:
+            with self._lock:
+                entries = [[key, base64.b64encode(sig.tobytes()).decode('ascii'), metadata]
+                           for key, (sig, metadata) in self._entries.items()]
+                self._unsaved = 0
+            snapshot = dict(self._params(), version=1, entries=entries)
+            directory = os.path.dirname(os.path.abspath(path))
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.minhash_', suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, separators=(',', ':'))
+                os.replace(tmp_path, path)
+                logger.info(f"Saved near-duplicate index snapshot ({len(entries)} entries) to {path}")
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Could not save near-duplicate index snapshot to {path}: {e}", exc_info=True)
+
+    def load(self, path):
+        """Loads entries from a snapshot written by save(). Returns the number loaded."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable near-duplicate index snapshot {path}: {e}")
+            return 0
+        if {key: snapshot.get(key) for key in self._params()} != self._params():
+            logger.warning(f"Ignoring near-duplicate index snapshot {path}: built with different parameters.")
+            return 0
+        loaded = 0
+        with self._lock:
+            for key, encoded, metadata in snapshot.get('entries', []):
+                sig = array('Q')
+                sig.frombytes(base64.b64decode(encoded))
+                if len(sig) == self.num_perm:
+                    self._insert(key, sig, metadata)
+                    loaded += 1
+        logger.info(f"Loaded {loaded} entries into the near-duplicate index from {path}")
+        return loaded
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries, 'evictions': self.evictions,
+                    'bands': self.bands, 'rows': self.rows}
@@ -1,6 +1,11 @@
-from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
 import json
+import uuid
+import logging
+from datetime import datetime
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
+
+logger = logging.getLogger(__name__)
 
 # Initialize SQLAlchemy. This db object will be configured with the Flask app
 # in app.py (e.g., db.init_app(app))
@@ -19,14 +24,18 @@ class User(db.Model):
 class Portfolio(db.Model):
     __tablename__ = 'portfolios'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True) # Nullable if portfolios can be anonymous for now
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True) # Nullable if portfolios can be anonymous for now
     resume_filename = db.Column(db.String(255), nullable=True)
+    # SHA-256 of the upload (see parse_cache.compute_content_key), used to dedupe re-uploads
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    # Unguessable id used in public URLs and API responses; `id` is sequential
+    public_id = db.Column(db.String(32), nullable=True, unique=True, index=True, default=lambda: uuid.uuid4().hex)
     
     # Store parsed data as JSON string
     _parsed_data = db.Column(db.Text, name='parsed_data', nullable=True)
     
     generated_html_content = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     @property
@@ -47,7 +56,42 @@ class Portfolio(db.Model):
     def __repr__(self):
         return f'<Portfolio {self.id} for User {self.user_id}>'
 
-# Example of how to create tables (typically run once, e.g. in a Flask CLI command or init script)
-# def init_db(app):
-#     with app.app_context():
-#         db.create_all()
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a writer commits; NORMAL sync is durable in WAL mode.
+    # The lock wait for concurrent writers is set via connect_args['timeout'] in Config.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def _add_missing_columns(engine):
+    # create_all() does not alter existing tables, so databases created before the
+    # content_hash or public_id columns existed get them (and their indexes) added here
+    columns = {column['name'] for column in inspect(engine).get_columns(Portfolio.__tablename__)}
+    if 'content_hash' not in columns:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE portfolios ADD COLUMN content_hash VARCHAR(64)"))
+        logger.info("Added portfolios.content_hash column")
+    if 'public_id' not in columns:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE portfolios ADD COLUMN public_id VARCHAR(32)"))
+            ids = [row[0] for row in connection.execute(text("SELECT id FROM portfolios"))]
+            for portfolio_id in ids:
+                connection.execute(text("UPDATE portfolios SET public_id = :public_id WHERE id = :id"),
+                                   {'public_id': uuid.uuid4().hex, 'id': portfolio_id})
+        logger.info(f"Added portfolios.public_id column ({len(ids)} existing portfolios)")
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def init_db(app):
+    """Binds `db` to the app, enables WAL for SQLite and creates missing tables and indexes."""
+    db.init_app(app)
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', _configure_sqlite_connection)
+            engine.dispose() # Drop connections opened before the listener was attached
+        db.create_all()
+        _add_missing_columns(engine)
@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks used when hashing an upload stream.
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def compute_content_key(stream, parser_version, extension=''):
+    """
+    Builds the cache key for an uploaded resume.
+
+    The key is a SHA-256 over the parser version, the file extension (the same bytes
+    parse differently as PDF or DOCX) and the raw file contents. `stream` may be a
+    bytes-like object or a readable, seekable file object; file objects are read in
+    chunks and rewound afterwards so the caller can still parse them.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f"{parser_version}\0{extension.lower().lstrip('.')}\0".encode('utf-8'))
+    if isinstance(stream, (bytes, bytearray, memoryview)):
+        hasher.update(stream)
+    else:
+        start = stream.tell()
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+        stream.seek(start)
+    return hasher.hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier cache of parse_resume results keyed by compute_content_key().
+
+    The memory tier is a bounded LRU; the optional disk tier stores one JSON file per
+    key under `disk_dir` and is consulted on memory misses (hits are promoted back into
+    memory). All operations are thread-safe.
+
+    Values are kept as-is in memory. The disk tier stores `encode(value)` as JSON and
+    returns `decode(data)` when reading it back (both default to the identity).
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None, encode=None, decode=None):
+        self.max_entries = max(0, int(max_entries))
+        self.disk_dir = disk_dir
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.error(f"Could not create parse cache directory {self.disk_dir}: {e}", exc_info=True)
+                self.disk_dir = None
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _store_in_memory(self, key, value):
+        # Caller must hold self._lock
+        if self.max_entries == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        """Returns the cached result for `key`, or None on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    value = self.decode(json.load(f))
+            except FileNotFoundError:
+                value = None
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Discarding unreadable parse cache entry {path}: {e}")
+                value = None
+            if value is not None:
+                with self._lock:
+                    self._store_in_memory(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Stores `value` (a parse result, JSON-serialisable after `encode`) under `key`."""
+        with self._lock:
+            self._store_in_memory(key, value)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.encode(value), f)
+                os.replace(tmp_path, path) # Atomic, so concurrent readers never see a partial file
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Failed to write parse cache entry {path}: {e}", exc_info=True)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def clear(self):
+        """Drops the memory tier. Disk entries are left in place."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_enabled': bool(self.disk_dir),
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
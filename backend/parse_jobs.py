@@ -0,0 +1,186 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from resume_parser import parse_resume
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """Raised by ParseJobQueue.submit when every worker and queue slot is taken."""
+
+
+class ParseJobQueue:
+    """
+    Runs parse_resume on a bounded process pool and tracks the resulting jobs by id.
+
+    At most `max_workers + queue_depth` jobs are admitted at once; submit() raises
+    QueueFullError beyond that so callers can shed load instead of queueing without
+    bound. Finished jobs are kept for `job_ttl` seconds so clients can poll for them.
+    If a worker dies (e.g. killed for memory), the broken pool is replaced on the next
+    submit; jobs that were in flight on it fail. `parse_options` are passed to every
+    parse_resume call (e.g. extraction budgets).
+
+    With a `sandbox` (a sandbox.SandboxPool), jobs are run through sandbox.run from a
+    thread pool of the sandbox's size instead, so they get its resource limits and
+    timeout; a stopped parse fails its job with ParseLimitExceeded.
+    """
+
+    def __init__(self, max_workers=None, queue_depth=32, job_ttl=600, parse_options=None, sandbox=None):
+        self.sandbox = sandbox
+        if sandbox is not None:
+            self.max_workers = sandbox.max_workers
+        else:
+            # Resolved here rather than left to the pool, so the admission slots match its size
+            self.max_workers = max_workers or getattr(os, 'process_cpu_count', os.cpu_count)() or 1
+        self.parse_options = parse_options or {}
+        self.queue_depth = queue_depth
+        self.job_ttl = job_ttl
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers + queue_depth)
+
+    def _get_executor(self):
+        # Caller must hold self._lock. The pool is created on first use so importing the
+        # app (or running it synchronously) never forks worker processes.
+        if self._executor is None:
+            if self.sandbox is not None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='parse-job')
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"Started parse worker pool (workers={self._executor._max_workers}, queue depth={self.queue_depth})")
+        return self._executor
+
+    def _submit_parse(self, executor, data, filename):
+        if self.sandbox is not None:
+            return executor.submit(self.sandbox.run, data, filename)
+        return executor.submit(parse_resume, data, filename=filename, **self.parse_options)
+
+    def _replace_broken_executor(self, broken):
+        # Caller must hold self._lock
+        if self._executor is broken:
+            self._executor = None
+            broken.shutdown(wait=False, cancel_futures=True)
+            logger.warning("Parse worker pool is broken (a worker died); starting a new one")
+
+    def _prune_expired(self):
+        # Caller must hold self._lock
+        cutoff = time.time() - self.job_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, data, filename, on_success=None, key=None):
+        """
+        Queues `data` (the raw file bytes) for parsing and returns the new job id.
+
+        `on_success(parsed_data)` is called in the parent process once the parse
+        completes, e.g. to populate the parse cache. `key` (e.g. the content hash) is
+        kept with the job and returned by get().
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError("Parse queue is full.")
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'filename': filename,
+            'key': key,
+            'submitted_at': time.time(),
+            'finished_at': None,
+            'future': None,
+            'result': None,
+            'error': None,
+        }
+        try:
+            with self._lock:
+                self._prune_expired()
+                executor = self._get_executor()
+                try:
+                    future = self._submit_parse(executor, data, filename)
+                except BrokenProcessPool:
+                    self._replace_broken_executor(executor)
+                    future = self._submit_parse(self._get_executor(), data, filename)
+                job['future'] = future
+                self._jobs[job_id] = job
+        except Exception:
+            self._slots.release()
+            raise
+
+        def _on_done(fut):
+            self._slots.release()
+            if fut.cancelled():
+                job['error'] = "Job was cancelled."
+            elif fut.exception() is not None:
+                exc = fut.exception()
+                logger.error(f"Parse job {job_id} for '{filename}' failed: {exc}")
+                job['error'] = exc
+            else:
+                job['result'] = fut.result()
+                if on_success is not None:
+                    try:
+                        on_success(job['result'])
+                    except Exception as e:
+                        logger.error(f"Post-processing of parse job {job_id} failed: {e}", exc_info=True)
+            job['finished_at'] = time.time()
+
+        future.add_done_callback(_on_done)
+        return job_id
+
+    def get(self, job_id):
+        """Returns a snapshot of the job as a dict, or None if it is unknown or expired."""
+        with self._lock:
+            self._prune_expired()
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        future = job['future']
+        if job['finished_at'] is not None:
+            status = JOB_FAILED if job['error'] is not None else JOB_DONE
+        elif future.running():
+            status = JOB_RUNNING
+        else:
+            status = JOB_QUEUED
+        return {
+            'id': job_id,
+            'status': status,
+            'filename': job['filename'],
+            'key': job['key'],
+            'submitted_at': job['submitted_at'],
+            'finished_at': job['finished_at'],
+            'result': job['result'],
+            'error': job['error'],
+        }
+
+    def discard(self, job_id):
+        """Cancels the job if it has not started yet and forgets it. Returns False if unknown."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        job['future'].cancel()
+        return True
+
+    def stats(self):
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job['finished_at'] is None)
+            return {'jobs': len(self._jobs), 'pending': pending, 'queue_depth': self.queue_depth}
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
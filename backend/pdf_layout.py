@@ -0,0 +1,262 @@
+import math
+import time
+import bisect
+
+# Layout-aware text extraction for PDF pages.
+#
+# PyPDF2's extract_text() emits text in content stream order, which for multi-column
+# resumes interleaves the columns line by line. Here the text fragments of a page are
+# collected with their position, font size and weight through extract_text's visitor
+# callbacks, split into blocks with a recursive XY-cut (columns first, then bands of
+# whitespace) and emitted block by block in reading order. Text set in bold or larger
+# than the body text is treated as a section header hint: a run-in header such as
+# "Skills:" at the start of a line is put on a line of its own.
+
+# Operators that draw text; the text matrix when one runs is where its text starts
+SHOW_OPERATORS = frozenset((b'Tj', b'TJ', b"'", b'"'))
+# Average glyph width per point of font size, for fonts without a /Widths array (the standard 14)
+AVERAGE_CHAR_WIDTH = 0.5
+# Vertical extent of a line around its baseline, per point of font size
+ASCENT, DESCENT = 0.8, 0.2
+BOLD_NAME_PARTS = ('bold', 'black', 'heavy', 'semibold', 'demi')
+FORCE_BOLD_FLAG = 1 << 18
+
+# Layout thresholds, in multiples of the median font size of the region being split
+MIN_GUTTER = 1.5 # Empty vertical strip that separates two columns
+MIN_BAND_GAP = 0.8 # Empty horizontal strip that separates two blocks
+BASELINE_TOLERANCE = 0.3 # Fragments this close vertically are on the same line
+WORD_GAP = 0.15 # Horizontal gap between fragments of a line that gets a space
+MIN_COLUMN_LINES = 3
+# A narrow strip whose lines mostly sit next to lines on the other side of the gutter
+# (dates beside job titles, labels beside values) belongs to those rows, not a column
+NARROW_COLUMN = 0.25
+MAX_ALIGNED_LINES = 0.6
+# Lines at least this much larger than the body text are header hints
+HEADER_SIZE_RATIO = 1.15
+MAX_CUT_DEPTH = 32
+
+
+class _PageBudgetExceeded(Exception):
+    pass
+
+
+class _Fragment:
+    __slots__ = ('x', 'y', 'x1', 'size', 'bold', 'text')
+
+    def __init__(self, x, y, size, bold, text, char_width):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.bold = bold
+        self.text = text
+        self.x1 = x + len(text) * size * char_width
+
+
+def _position(tm, cm):
+    """Device-space origin and scale of the text matrix `tm` under `cm`."""
+    a = tm[0] * cm[0] + tm[1] * cm[2]
+    b = tm[0] * cm[1] + tm[1] * cm[3]
+    c = tm[2] * cm[0] + tm[3] * cm[2]
+    d = tm[2] * cm[1] + tm[3] * cm[3]
+    x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+    y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+    return float(x), float(y), math.sqrt(abs(a * d) + abs(b * c))
+
+
+def _font_style(font):
+    """(bold, average glyph width per point of size) of a PDF font dictionary."""
+    bold = False
+    char_width = AVERAGE_CHAR_WIDTH
+    if not font:
+        return bold, char_width
+    try:
+        name = str(font.get('/BaseFont', '')).lower()
+        bold = any(part in name for part in BOLD_NAME_PARTS)
+        descriptor = font.get('/FontDescriptor')
+        if descriptor is not None:
+            descriptor = descriptor.get_object()
+            bold = bold or float(descriptor.get('/FontWeight', 0)) >= 600 or bool(int(descriptor.get('/Flags', 0)) & FORCE_BOLD_FLAG)
+        widths = [float(width) for width in (font.get('/Widths') or ()) if float(width) > 0]
+        if widths:
+            char_width = sum(widths) / len(widths) / 1000.0
+    except Exception: # Malformed font dictionaries only lose the hint
+        pass
+    return bold, char_width
+
+
+class _FragmentCollector:
+    """Visitor callbacks for PageObject.extract_text that record positioned text fragments."""
+
+    def __init__(self, deadline):
+        self.fragments = []
+        self.deadline = deadline
+        self._start = None # Position of the first text drawn since the last fragment
+        self._operations = 0
+        self._fonts = {}
+
+    def before_operator(self, operator, operands, cm, tm):
+        self._operations += 1
+        if self.deadline is not None and not self._operations & 63 and time.perf_counter() > self.deadline:
+            raise _PageBudgetExceeded()
+        if self._start is None and operator in SHOW_OPERATORS:
+            self._start = _position(tm, cm)
+
+    def on_text(self, text, cm, tm, font, font_size):
+        # PyPDF2 passes text as it flushes it (at ET, or when the next line starts), so the
+        # matrices may already point past it; the position comes from the first show operator
+        if not text:
+            return
+        x, y, scale = self._start or _position(tm, cm)
+        self._start = None
+        style = self._fonts.get(id(font))
+        if style is None:
+            style = self._fonts[id(font)] = _font_style(font)
+        size = float(font_size) * scale or 1.0
+        for line_number, piece in enumerate(text.split('\n')):
+            piece = piece.strip()
+            if piece:
+                self.fragments.append(_Fragment(x, y - line_number * size * 1.2, size, style[0], piece, style[1]))
+
+
+def _median_size(fragments):
+    sizes = sorted(fragment.size for fragment in fragments)
+    return sizes[len(sizes) // 2]
+
+
+def _baselines(fragments, tolerance):
+    """Sorted, distinct baselines (y) of the fragments."""
+    baselines = []
+    for y in sorted(fragment.y for fragment in fragments):
+        if not baselines or y - baselines[-1] > tolerance:
+            baselines.append(y)
+    return baselines
+
+
+def _count_aligned(baselines, others, tolerance):
+    aligned = 0
+    for y in baselines:
+        index = bisect.bisect_left(others, y - tolerance)
+        aligned += index < len(others) and others[index] <= y + tolerance
+    return aligned
+
+
+def _split_columns(fragments, size):
+    """Splits at the widest empty vertical strip if both sides read as columns, else None."""
+    spans = sorted((fragment.x, fragment.x1) for fragment in fragments)
+    left_edge, reach = spans[0][0], spans[0][1]
+    gutter = None
+    for x0, x1 in spans[1:]:
+        if x0 - reach >= MIN_GUTTER * size and (gutter is None or x0 - reach > gutter[1] - gutter[0]):
+            gutter = (reach, x0)
+        reach = max(reach, x1)
+    if gutter is None:
+        return None
+
+    cut = (gutter[0] + gutter[1]) / 2
+    left = [fragment for fragment in fragments if fragment.x < cut]
+    right = [fragment for fragment in fragments if fragment.x >= cut]
+    tolerance = BASELINE_TOLERANCE * size
+    left_lines, right_lines = _baselines(left, tolerance), _baselines(right, tolerance)
+    if min(len(left_lines), len(right_lines)) < MIN_COLUMN_LINES:
+        return None
+    narrow = min(gutter[0] - left_edge, reach - gutter[1]) < NARROW_COLUMN * (reach - left_edge)
+    fewer, other = sorted((left_lines, right_lines), key=len)
+    if narrow and _count_aligned(fewer, other, tolerance) > MAX_ALIGNED_LINES * len(fewer):
+        return None
+    return [left, right]
+
+
+def _split_bands(fragments, size):
+    """Splits at every empty horizontal strip taller than MIN_BAND_GAP, top to bottom, else None."""
+    ordered = sorted(fragments, key=lambda fragment: -(fragment.y + ASCENT * fragment.size))
+    bands = [[ordered[0]]]
+    bottom = ordered[0].y - DESCENT * ordered[0].size
+    for fragment in ordered[1:]:
+        if bottom - (fragment.y + ASCENT * fragment.size) >= MIN_BAND_GAP * size:
+            bands.append([])
+        bands[-1].append(fragment)
+        bottom = min(bottom, fragment.y - DESCENT * fragment.size)
+    return bands if len(bands) > 1 else None
+
+
+def _xy_cut(fragments, deadline, depth=0):
+    """Splits fragments into blocks in reading order: columns left to right, bands top to bottom."""
+    if len(fragments) < 2 or depth >= MAX_CUT_DEPTH or (deadline is not None and time.perf_counter() > deadline):
+        return [fragments]
+    size = _median_size(fragments)
+    parts = _split_columns(fragments, size) or _split_bands(fragments, size)
+    if parts is None:
+        return [fragments]
+    blocks = []
+    for part in parts:
+        blocks += _xy_cut(part, deadline, depth + 1)
+    return blocks
+
+
+def _block_lines(block, body_size):
+    """Text lines of a block, top to bottom, with run-in header hints on lines of their own."""
+    ordered = sorted(block, key=lambda fragment: (-fragment.y, fragment.x))
+    rows = []
+    for fragment in ordered:
+        if rows and rows[-1][0].y - fragment.y <= BASELINE_TOLERANCE * max(rows[-1][0].size, fragment.size):
+            rows[-1].append(fragment)
+        else:
+            rows.append([fragment])
+
+    lines = []
+    for row in rows:
+        row.sort(key=lambda fragment: fragment.x)
+        first = row[0]
+        if (len(row) > 1 and first.text.endswith(':') and _is_header(first, body_size)
+                and not any(_is_header(fragment, body_size) for fragment in row[1:])):
+            lines.append(first.text)
+            row = row[1:]
+        parts = [row[0].text]
+        for previous, fragment in zip(row, row[1:]):
+            if fragment.x - previous.x1 > WORD_GAP * fragment.size:
+                parts.append(' ')
+            parts.append(fragment.text)
+        lines.append(''.join(parts))
+    return lines
+
+
+def _is_header(fragment, body_size):
+    return fragment.bold or fragment.size >= HEADER_SIZE_RATIO * body_size
+
+
+def _body_size(fragments):
+    """The font size that most text on the page is set in."""
+    chars = {}
+    for fragment in fragments:
+        size = round(fragment.size, 1)
+        chars[size] = chars.get(size, 0) + len(fragment.text)
+    return max(chars, key=chars.get)
+
+
+def extract_page_text(page, time_budget=None):
+    """
+    Extracts the text of a PyPDF2 page in reading order.
+
+    `time_budget` (seconds, None for no limit) bounds the work on the page. It is checked
+    between content stream operators and between layout steps: if it runs out while the
+    text is being collected, the text found so far is laid out and returned; if it runs
+    out during layout, the remaining blocks are emitted without further splitting.
+
+    Returns:
+        tuple: (text, complete) where complete is False if the budget cut collection short.
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    collector = _FragmentCollector(deadline)
+    complete = True
+    try:
+        page.extract_text(visitor_operand_before=collector.before_operator, visitor_text=collector.on_text)
+    except _PageBudgetExceeded:
+        complete = False
+    fragments = collector.fragments
+    if not fragments:
+        return '', complete
+    body_size = _body_size(fragments)
+    lines = []
+    for block in _xy_cut(fragments, deadline):
+        lines += _block_lines(block, body_size)
+    return '\n'.join(lines), complete
@@ -0,0 +1,103 @@
+import os
+import gzip
+import zipfile
+import threading
+
+try:
+    import brotli
+except ImportError: # Optional: .br variants are skipped without it
+    brotli = None
+
+# Builds static-site zip bundles of a rendered portfolio as a stream of chunks.
+# The archive is written to an unseekable sink, so zipfile emits data descriptors
+# instead of seeking back, and each chunk is handed to the caller as soon as it is
+# produced. Nothing is buffered beyond the member currently being written.
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STYLESHEET_NAME = 'portfolio_style.css'
+
+# The template links the stylesheet as ../static/portfolio_style.css
+HTML_ARCNAME = 'portfolio/index.html'
+STYLESHEET_ARCNAME = f'static/{STYLESHEET_NAME}'
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+_stylesheet_files = None
+_stylesheet_lock = threading.Lock()
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object that collects written bytes until drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def precompressed_variants(arcname, data):
+    """Returns [(arcname, data), ...] for `data` plus its .gz and (if available) .br encodings."""
+    variants = [(arcname, data), (f"{arcname}.gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((f"{arcname}.br", brotli.compress(data, mode=brotli.MODE_TEXT)))
+    return variants
+
+
+def _get_stylesheet_files():
+    # The stylesheet and its compressed variants are the same for every export
+    global _stylesheet_files
+    with _stylesheet_lock:
+        if _stylesheet_files is None:
+            with open(os.path.join(STATIC_DIR, STYLESHEET_NAME), 'rb') as f:
+                _stylesheet_files = precompressed_variants(STYLESHEET_ARCNAME, f.read())
+        return _stylesheet_files
+
+
+def portfolio_export_files(html):
+    """Lists the (arcname, bytes) members of the export bundle for rendered `html`."""
+    return precompressed_variants(HTML_ARCNAME, html.encode('utf-8')) + _get_stylesheet_files()
+
+
+def iter_zip_stream(files, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields a zip archive of `files` as byte chunks.
+
+    Args:
+        files: Iterable of (arcname, bytes). Already compressed members (.gz, .br) are
+               stored as is; everything else is deflated.
+        chunk_size (int): Amount of member data written between yields.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w') as archive:
+        for arcname, data in files:
+            compress_type = zipfile.ZIP_STORED if arcname.endswith(('.gz', '.br')) else zipfile.ZIP_DEFLATED
+            info = zipfile.ZipInfo(arcname, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = compress_type
+            info.external_attr = 0o644 << 16
+            with archive.open(info, 'w') as member:
+                for offset in range(0, len(data), chunk_size):
+                    member.write(data[offset:offset + chunk_size])
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    chunk = sink.drain() # Central directory
+    if chunk:
+        yield chunk
@@ -1,14 +1,164 @@
-import jinja2
 import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import jinja2
+import markupsafe
+
+logger = logging.getLogger(__name__)
 
 # Setup Jinja2 environment
 # Assuming templates are in a 'templates' directory relative to this file's location
 # For this project, it's backend/templates/
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
-loader = jinja2.FileSystemLoader(TEMPLATE_DIR)
-env = jinja2.Environment(loader=loader, autoescape=jinja2.select_autoescape(['html', 'xml']))
+DEFAULT_TEMPLATE = 'portfolio_base.html'
+
+
+def nl2br(value):
+    """Escapes `value` and turns its line breaks into <br> tags (parsed data is untrusted)."""
+    return markupsafe.Markup('<br>').join(markupsafe.escape(value).split('\n'))
+
+
+def create_environment(bytecode_cache_dir=None, auto_reload=False):
+    """
+    Builds the Jinja2 environment used for portfolio templates.
+
+    With `bytecode_cache_dir` set, compiled templates are also cached on disk, so new
+    worker processes skip compiling them again. `auto_reload=False` keeps compiled
+    templates in memory without checking the files for changes on every render.
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        try:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
+        except OSError as e:
+            logger.error(f"Could not create template bytecode cache directory {bytecode_cache_dir}: {e}", exc_info=True)
+    environment = jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+                                     autoescape=jinja2.select_autoescape(['html', 'xml']),
+                                     bytecode_cache=bytecode_cache,
+                                     auto_reload=auto_reload)
+    environment.filters['nl2br'] = nl2br
+    return environment
+
+
+env = create_environment()
+
+
+def compute_data_digest(parsed_data):
+    """Returns a stable SHA-256 over the parsed resume data (key order does not matter)."""
+    payload = json.dumps(parsed_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PortfolioRenderer:
+    """
+    Renders portfolio templates and memoizes the resulting HTML.
+
+    Templates are compiled once by preload(), normally at startup, and each one gets a
+    version hash of its source. Rendered pages are kept in a bounded LRU keyed by a digest
+    of the parsed data, the template version and the render date, so identical data
+    always yields the same HTML and the same digest, which callers can use as an ETag.
+    All operations are thread-safe.
+    """
+
+    def __init__(self, environment=None, max_entries=128):
+        self.env = environment or env
+        self.max_entries = max(0, int(max_entries))
+        self._templates = {}
+        self._template_versions = {}
+        self._rendered = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, template_name):
+        # Caller must hold self._lock
+        template = self._templates.get(template_name)
+        if template is None:
+            source, _, _ = self.env.loader.get_source(self.env, template_name)
+            template = self.env.get_template(template_name)
+            self._templates[template_name] = template
+            self._template_versions[template_name] = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+        return template
+
+    def preload(self, template_names=(DEFAULT_TEMPLATE,)):
+        """Compiles `template_names` up front. Missing templates are logged, not raised."""
+        with self._lock:
+            for template_name in template_names:
+                try:
+                    self._load(template_name)
+                except jinja2.TemplateNotFound:
+                    logger.error(f"Portfolio template '{template_name}' not found in {TEMPLATE_DIR}.")
+        return self
+
+    def template_version(self, template_name=DEFAULT_TEMPLATE):
+        with self._lock:
+            self._load(template_name)
+            return self._template_versions[template_name]
+
+    def render(self, parsed_data, template_name=DEFAULT_TEMPLATE):
+        """
+        Renders `parsed_data` with `template_name`.
+
+        Returns:
+            tuple: (html, digest). The digest identifies this exact output and can be
+                   passed to get() to fetch the HTML again while it is cached.
+
+        Raises:
+            jinja2.TemplateNotFound: If the template does not exist.
+        """
+        # The template only shows the year, so a per-day timestamp keeps output stable
+        today = datetime.now(timezone.utc).date()
+        with self._lock:
+            template = self._load(template_name)
+            version = self._template_versions[template_name]
+        key_source = f"{template_name}\0{version}\0{today.isoformat()}\0{compute_data_digest(parsed_data)}"
+        digest = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+        with self._lock:
+            html = self._rendered.get(digest)
+            if html is not None:
+                self._rendered.move_to_end(digest)
+                self.hits += 1
+                return html, digest
+            self.misses += 1
+
+        html = template.render(data=parsed_data, now=datetime(today.year, today.month, today.day, tzinfo=timezone.utc))
+        with self._lock:
+            if self.max_entries:
+                self._rendered[digest] = html
+                while len(self._rendered) > self.max_entries:
+                    self._rendered.popitem(last=False)
+        return html, digest
+
+    def get(self, digest):
+        """Returns previously rendered HTML by digest, or None if it is unknown or evicted."""
+        with self._lock:
+            html = self._rendered.get(digest)
+            if html is not None:
+                self._rendered.move_to_end(digest)
+            return html
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._rendered),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'templates': dict(self._template_versions),
+            }
+
+
+default_renderer = PortfolioRenderer()
+
 
-def generate_portfolio_html(parsed_data, template_name='portfolio_base.html'):
+def generate_portfolio_html(parsed_data, template_name=DEFAULT_TEMPLATE):
     """
     Generates HTML content for a portfolio website using parsed resume data and a Jinja2 template.
 
@@ -22,11 +172,7 @@ def generate_portfolio_html(parsed_data, template_name='portfolio_base.html'):
         str: The rendered HTML content as a string.
     """
     try:
-        template = env.get_template(template_name)
-        # Pass data under a 'data' key for clarity in template
-        # Also pass datetime for potential use in template, e.g. copyright year
-        from datetime import datetime
-        html_content = template.render(data=parsed_data, now=datetime.utcnow())
+        html_content, _ = default_renderer.render(parsed_data, template_name)
         return html_content
     except jinja2.TemplateNotFound:
         return f"Error: Template '{template_name}' not found in {TEMPLATE_DIR}."
@@ -0,0 +1,355 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import pstats
+import hashlib
+import logging
+import argparse
+import cProfile
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from resume_parser import PARSER_VERSION, parse_resume
+
+logger = logging.getLogger(__name__)
+
+# Opt-in profiling of slow uploads. A sampled fraction of parses runs under cProfile.
+# Every other parse arms a watchdog: if it is still running after `slow_threshold`
+# seconds, a stack sampler starts recording where the parsing thread spends its time.
+# Profiled or slow parses are saved as a capture (profile, metadata and, up to a size
+# limit, the input file named by its hash) so they can be listed and replayed offline:
+#
+#   python profiler.py list --dir captures
+#   python profiler.py replay <capture id> --dir captures
+
+TRIGGER_SAMPLED = 'sampled'
+TRIGGER_SLOW = 'slow'
+
+META_FILE = 'meta.json'
+PROFILE_FILE = 'profile.pstats' # cProfile output, readable with pstats
+STACKS_FILE = 'stacks.txt' # Sampled stacks in folded format ("outer;inner count"), for flame graphs
+
+
+class StackSampler:
+    """Samples the stack of one thread every `interval` seconds in a background thread."""
+
+    def __init__(self, thread_id, interval=0.005, max_depth=64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            names = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='parse-stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class _Watchdog:
+    """Starts a StackSampler on the calling thread once `threshold` seconds have passed."""
+
+    def __init__(self, threshold, interval):
+        self.sampler = StackSampler(threading.get_ident(), interval)
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._timer = threading.Timer(threshold, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            if not self._cancelled:
+                self.sampler.start()
+
+    def stop(self):
+        with self._lock:
+            self._cancelled = True
+        self._timer.cancel()
+        self.sampler.stop()
+        return self.sampler
+
+
+class ParseProfiler:
+    """
+    Decides which parses to profile and stores their captures in `capture_dir`.
+
+    Each parse is profiled with cProfile with probability `sample_rate`, and any parse
+    taking at least `slow_threshold` seconds is captured with stacks sampled every
+    `sample_interval` seconds from the moment it crossed the threshold. Inputs up to
+    `max_input_bytes` are saved with the capture; captures older than `retention`
+    seconds, or beyond the newest `max_captures`, are deleted.
+    """
+
+    def __init__(self, capture_dir, sample_rate=0.0, slow_threshold=5.0, max_input_bytes=5 * 1024 * 1024,
+                 retention=7 * 24 * 3600, max_captures=200, sample_interval=0.005, parse_options=None):
+        self.capture_dir = capture_dir
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.max_input_bytes = max_input_bytes
+        self.retention = retention
+        self.max_captures = max_captures
+        self.sample_interval = sample_interval
+        self.parse_options = parse_options or {}
+        self.captures_saved = 0
+        self._lock = threading.Lock()
+        os.makedirs(capture_dir, exist_ok=True)
+
+    @contextmanager
+    def profile(self, stream, extension, timer=None):
+        """
+        Wraps one parse of `stream` (a seekable upload stream, read again only if a capture
+        is saved). Profiling errors are logged and never affect the parse itself.
+        """
+        profile = None
+        watchdog = None
+        if self.sample_rate and random.random() < self.sample_rate:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError: # Another profiler is already active on this thread
+                profile = None
+        if profile is None and self.slow_threshold:
+            watchdog = _Watchdog(self.slow_threshold, self.sample_interval)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            sampler = watchdog.stop() if watchdog is not None else None
+            trigger = TRIGGER_SAMPLED if profile is not None else None
+            if self.slow_threshold and elapsed >= self.slow_threshold:
+                trigger = TRIGGER_SLOW
+            if trigger is not None:
+                try:
+                    self._save(trigger, elapsed, stream, extension, profile, sampler, timer, error)
+                except Exception as e:
+                    logger.error(f"Could not save parse capture: {e}", exc_info=True)
+
+    def _read_input(self, stream):
+        """Returns (data or None if over max_input_bytes, size, SHA-256 of the whole input)."""
+        position = stream.tell()
+        stream.seek(0)
+        digest = hashlib.sha256()
+        chunks = []
+        size = 0
+        for chunk in iter(lambda: stream.read(64 * 1024), b''):
+            digest.update(chunk)
+            size += len(chunk)
+            if size <= self.max_input_bytes:
+                chunks.append(chunk)
+        stream.seek(position)
+        return (b''.join(chunks) if size <= self.max_input_bytes else None), size, digest.hexdigest()
+
+    def _save(self, trigger, elapsed, stream, extension, profile, sampler, timer, error):
+        data, size, input_hash = self._read_input(stream)
+        extension = extension.lower().lstrip('.')
+        capture_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{trigger}-{input_hash[:12]}"
+        meta = {
+            'id': capture_id,
+            'created_at': time.time(),
+            'trigger': trigger,
+            'elapsed_seconds': round(elapsed, 4),
+            'stages': {name: round(seconds, 4) for name, seconds in (timer.durations if timer is not None and timer.enabled else {}).items()},
+            'error': error,
+            'parser_version': PARSER_VERSION,
+            'parse_options': self.parse_options,
+            'extension': extension,
+            'input_sha256': input_hash,
+            'input_size': size,
+            'input_file': f"{input_hash}.{extension}" if data is not None else None,
+            'profile': PROFILE_FILE if profile is not None else (STACKS_FILE if sampler and sampler.samples else None),
+            'stack_samples': sampler.samples if sampler is not None else 0,
+        }
+        # Written to a temporary directory and renamed, so list() never sees half a capture
+        staging = tempfile.mkdtemp(prefix='.capture_', dir=self.capture_dir)
+        try:
+            if data is not None:
+                with open(os.path.join(staging, meta['input_file']), 'wb') as f:
+                    f.write(data)
+            if profile is not None:
+                profile.dump_stats(os.path.join(staging, PROFILE_FILE))
+            elif sampler is not None and sampler.samples:
+                with open(os.path.join(staging, STACKS_FILE), 'w', encoding='utf-8') as f:
+                    f.write(sampler.folded())
+            with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+            os.replace(staging, os.path.join(self.capture_dir, capture_id))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        with self._lock:
+            self.captures_saved += 1
+        logger.warning(f"Saved {trigger} parse capture {capture_id} ({elapsed:.2f}s, {size} bytes)")
+        self.prune()
+
+    def prune(self):
+        """Deletes captures past the retention period or beyond max_captures. Returns the number deleted."""
+        captures = list_captures(self.capture_dir)
+        cutoff = time.time() - self.retention
+        expired = {meta['id'] for meta in captures if meta.get('created_at', 0) < cutoff}
+        expired.update(meta['id'] for meta in captures[self.max_captures:])
+        for capture_id in expired:
+            shutil.rmtree(os.path.join(self.capture_dir, capture_id), ignore_errors=True)
+        return len(expired)
+
+    def stats(self):
+        return {'captures_saved': self.captures_saved, 'sample_rate': self.sample_rate,
+                'slow_threshold': self.slow_threshold}
+
+
+def list_captures(capture_dir):
+    """Returns the metadata of every capture in `capture_dir`, newest first."""
+    captures = []
+    try:
+        names = os.listdir(capture_dir)
+    except FileNotFoundError:
+        return captures
+    for name in names:
+        if name.startswith('.'):
+            continue
+        try:
+            with open(os.path.join(capture_dir, name, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        meta['id'] = name
+        captures.append(meta)
+    captures.sort(key=lambda meta: meta.get('created_at', 0), reverse=True)
+    return captures
+
+
+def load_capture(capture_dir, capture_id):
+    """Returns the metadata of one capture, or None if there is no such capture."""
+    if os.path.basename(capture_id) != capture_id or capture_id.startswith('.'):
+        return None
+    for meta in list_captures(capture_dir):
+        if meta['id'] == capture_id:
+            return meta
+    return None
+
+
+def replay_capture(capture_dir, capture_id, profile=True):
+    """
+    Parses a capture's saved input with the current parser.
+
+    Returns:
+        tuple: (metadata, seconds taken, ParsedResume, pstats.Stats or None).
+
+    Raises:
+        LookupError: If the capture does not exist or its input was not saved.
+    """
+    meta = load_capture(capture_dir, capture_id)
+    if meta is None:
+        raise LookupError(f"No capture '{capture_id}' in {capture_dir}.")
+    if not meta.get('input_file'):
+        raise LookupError(f"Capture '{capture_id}' has no saved input (it was {meta.get('input_size')} bytes).")
+    with open(os.path.join(capture_dir, capture_id, meta['input_file']), 'rb') as f:
+        data = f.read()
+    options = {key: value for key, value in (meta.get('parse_options') or {}).items()
+               if key in ('max_pages', 'max_chars', 'pdf_reading_order', 'page_time_budget')}
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = parse_resume(io.BytesIO(data), filename=meta['input_file'], **options)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+    stats = pstats.Stats(profiler, stream=io.StringIO()) if profiler is not None else None
+    return meta, elapsed, result, stats
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="List and replay captures of slow or sampled parses.")
+    arg_parser.add_argument('--dir', default=os.environ.get('PARSE_PROFILE_DIR') or 'parse_captures',
+                            help="Capture directory (default: $PARSE_PROFILE_DIR).")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="Show captures, newest first.")
+    replay = commands.add_parser('replay', help="Parse a capture's input again and profile it.")
+    replay.add_argument('capture_id')
+    replay.add_argument('--top', type=int, default=25, help="Functions to show, by cumulative time.")
+    replay.add_argument('--no-profile', action='store_true', help="Only time the parse.")
+    show = commands.add_parser('show', help="Print a capture's recorded profile.")
+    show.add_argument('capture_id')
+    show.add_argument('--top', type=int, default=25)
+    args = arg_parser.parse_args(argv)
+
+    if args.command == 'list':
+        print(f"{'id':<48} {'trigger':<8} {'seconds':>8} {'bytes':>10} {'input':>6} {'profile':<15}")
+        for meta in list_captures(args.dir):
+            print(f"{meta['id']:<48} {meta.get('trigger', ''):<8} {meta.get('elapsed_seconds', 0):>8.3f} "
+                  f"{meta.get('input_size') or 0:>10} {'yes' if meta.get('input_file') else 'no':>6} "
+                  f"{meta.get('profile') or '-':<15}")
+        return 0
+
+    meta = load_capture(args.dir, args.capture_id)
+    if meta is None:
+        print(f"No capture '{args.capture_id}' in {args.dir}.", file=sys.stderr)
+        return 1
+
+    if args.command == 'show':
+        path = os.path.join(args.dir, args.capture_id, meta.get('profile') or '')
+        if meta.get('profile') == PROFILE_FILE:
+            pstats.Stats(path).sort_stats('cumulative').print_stats(args.top)
+        elif meta.get('profile') == STACKS_FILE:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f.readlines()[:args.top]:
+                    print(line.rstrip('\n'))
+        else:
+            print("This capture has no recorded profile.")
+        print(json.dumps(meta, indent=2))
+        return 0
+
+    try:
+        meta, elapsed, result, stats = replay_capture(args.dir, args.capture_id, profile=not args.no_profile)
+    except LookupError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Replayed {args.capture_id}: {elapsed:.3f}s now, {meta.get('elapsed_seconds')}s when captured "
+          f"(parser version {meta.get('parser_version')}); name '{result.name}', {len(result.skills)} skills.")
+    if stats is not None:
+        stats.stream = sys.stdout
+        stats.sort_stats('cumulative').print_stats(args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+
+# Typed parse results. Each class serializes straight to the JSON shapes used by the
+# parse cache, the database, the portfolio template and the frontend, so results are
+# never copied through intermediate dicts. The dict schema is stable: every key is
+# always present (empty string when unknown). The one exception is an experience or
+# education entry the parser could not structure, which stays a plain string; the
+# template and frontend render those as free text.
+#
+# Bump SCHEMA_VERSION whenever a key is added, removed or changes meaning.
+SCHEMA_VERSION = 1
+
+
+@dataclass(slots=True)
+class ExperienceItem:
+    title: str
+    company: str
+    period: str = ''
+    description: str = ''
+
+    def to_dict(self):
+        return {'title': self.title, 'company': self.company, 'period': self.period, 'description': self.description}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('title', ''), data.get('company', ''), data.get('period', ''), data.get('description', ''))
+
+
+@dataclass(slots=True)
+class EducationItem:
+    degree: str
+    institution: str
+    period: str = ''
+    description: str = ''
+
+    def to_dict(self):
+        return {'degree': self.degree, 'institution': self.institution, 'period': self.period,
+                'description': self.description}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('degree', ''), data.get('institution', ''), data.get('period', ''), data.get('description', ''))
+
+
+def _items_to_json(items):
+    return [item if isinstance(item, str) else item.to_dict() for item in items]
+
+
+def _items_from_json(item_class, items):
+    return [item if isinstance(item, (str, item_class)) else item_class.from_dict(item) for item in items or ()]
+
+
+@dataclass(slots=True)
+class ParsedResume:
+    name: str = ''
+    title: str = ''
+    email: str = ''
+    phone: str = ''
+    linkedin: str = ''
+    github: str = ''
+    summary: str = ''
+    experience: list = field(default_factory=list) # ExperienceItem or str
+    education: list = field(default_factory=list) # EducationItem or str
+    skills: list = field(default_factory=list) # str
+    truncated: bool = False
+
+    def to_dict(self):
+        """Serializes to the parse_resume dict shape (cache, database, portfolio template)."""
+        return {
+            'name': self.name,
+            'title': self.title,
+            'email': self.email,
+            'phone': self.phone,
+            'linkedin': self.linkedin,
+            'github': self.github,
+            'summary': self.summary,
+            'experience': _items_to_json(self.experience),
+            'education': _items_to_json(self.education),
+            'skills': list(self.skills),
+            'truncated': self.truncated,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict(); missing keys (e.g. from older cache entries) get their defaults."""
+        return cls(
+            name=data.get('name', ''),
+            title=data.get('title', ''),
+            email=data.get('email', ''),
+            phone=data.get('phone', ''),
+            linkedin=data.get('linkedin', ''),
+            github=data.get('github', ''),
+            summary=data.get('summary', ''),
+            experience=_items_from_json(ExperienceItem, data.get('experience')),
+            education=_items_from_json(EducationItem, data.get('education')),
+            skills=list(data.get('skills') or ()),
+            truncated=bool(data.get('truncated', False)),
+        )
+
+    def to_frontend(self, profile_image_url=''):
+        """Serializes to the shape PreviewPage.js expects from /api/upload."""
+        return {
+            "fullName": self.name or 'Name not parsed',
+            "jobTitle": self.title or 'Title not parsed',
+            "summary": self.summary,
+            "contact": {
+                "email": self.email,
+                "phone": self.phone,
+                "linkedin": self.linkedin,
+                "github": self.github
+            },
+            "experience": _items_to_json(self.experience),
+            "education": _items_to_json(self.education),
+            "skills": list(self.skills),
+            "truncated": self.truncated,
+            "profile_image_url": profile_image_url
+        }
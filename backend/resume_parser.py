@@ -1,14 +1,78 @@
+import io
 import os
 import re
+import time
+import shutil
 import logging
-from docx import Document
-from PyPDF2 import PdfReader
+import tempfile
+import zipfile
+import functools
+import importlib
+import dataclasses
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager, ExitStack
+import pdf_layout
+import skill_taxonomy
+from metrics import NULL_TIMER
+from resume_model import ParsedResume, ExperienceItem, EducationItem
 
 # Configure basic logging
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers(): # Avoid adding multiple handlers if imported multiple times or by Flask
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Bump whenever a change to extraction or section parsing alters the output, so
+# cached parse results produced by an older parser are not served again.
+PARSER_VERSION = '5'
+
+# Buffers up to this size are parsed straight from memory; larger ones (and unseekable
+# streams that grow past it) are spooled to a uniquely named temporary file.
+SPILL_THRESHOLD = 2 * 1024 * 1024 # 2 MB
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+# Extraction budgets: oversized or adversarial documents stop early and the result is
+# flagged as truncated instead of burning CPU and memory. None disables a budget.
+MAX_PAGES = 50
+MAX_CHARS = 200000
+
+# Optional reading-order extraction for PDFs (see pdf_layout), which keeps multi-column
+# resumes from being interleaved. Off by default: the default is content stream order.
+# Each page gets at most PDF_PAGE_TIME_BUDGET seconds of layout-aware extraction before
+# its text is cut short and flagged as truncated.
+PDF_READING_ORDER = False
+PDF_PAGE_TIME_BUDGET = 2.0
+
+# Format libraries are imported on first use, so importing this module (and the app)
+# stays cheap. Pre-fork servers can call warmup() once in the master process instead,
+# letting every worker share the imported modules copy-on-write.
+_FORMAT_MODULES = {'docx': 'docx', 'pdf': 'PyPDF2'}
+_loaded_modules = {}
+
+def _load_format_module(kind):
+    module = _loaded_modules.get(kind)
+    if module is None:
+        module = _loaded_modules[kind] = importlib.import_module(_FORMAT_MODULES[kind])
+    return module
+
+def warmup():
+    """
+    Imports the PDF and DOCX libraries and builds the skill taxonomy now rather than on
+    the first parse that needs them.
+
+    Returns:
+        dict: Seconds spent importing each format's library and building the taxonomy
+              ('skills'); 0.0 for anything already loaded.
+    """
+    timings = {}
+    for kind in _FORMAT_MODULES:
+        start = time.perf_counter()
+        _load_format_module(kind)
+        timings[kind] = time.perf_counter() - start
+    start = time.perf_counter()
+    skill_taxonomy.get_default()
+    timings['skills'] = time.perf_counter() - start
+    return timings
+
 # Refined regex patterns
 EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
 PHONE_REGEX = r"(?:\+?\d{1,3}[-\s.]?)?(?:\(?\d{2,4}\)?[-_\s.]?){2,5}\d{2,4}" # Simplified and more robust
@@ -22,6 +86,54 @@ SECTION_KEYWORDS = {
     'skills': ['skills', 'technical skills', 'proficiencies', 'core competencies', 'technical expertise', 'technologies', 'tools', 'areas of expertise']
 }
 
+# Precompiled contact patterns. Each entity keeps its own pattern because matches of
+# different kinds may overlap (e.g. a digit run inside an email address also counts
+# as a phone candidate), which a single alternation would hide; _scan_contacts feeds
+# them only the parts of the text that can contain a match.
+EMAIL_PATTERN = re.compile(EMAIL_REGEX, re.IGNORECASE)
+PHONE_PATTERN = re.compile(PHONE_REGEX)
+LINKEDIN_PATTERN = re.compile(LINKEDIN_REGEX, re.IGNORECASE)
+GITHUB_PATTERN = re.compile(GITHUB_REGEX, re.IGNORECASE)
+# Per-line guards: lines that cannot be the name/title, or cannot be part of the summary
+NAME_GUARD_PATTERN = re.compile(EMAIL_REGEX + "|" + PHONE_REGEX, re.IGNORECASE)
+CONTACT_LINE_PATTERN = re.compile(EMAIL_REGEX + "|" + PHONE_REGEX + "|" + LINKEDIN_REGEX + "|" + GITHUB_REGEX, re.IGNORECASE)
+# Maximal runs of characters PHONE_REGEX can match that contain at least one digit
+PHONE_RUN_PATTERN = re.compile(r"[\s+()._-]*\d[\d\s+()._-]*")
+SKILL_SPLIT_PATTERN = re.compile(r'[\n,;\u2022*-]')
+
+def _build_section_matcher(section_keywords):
+    """
+    Compiles SECTION_KEYWORDS into a single-pass matcher.
+
+    The pattern reports every position where a keyword starts (longest keyword first),
+    like an Aho-Corasick automaton does, so overlapping keywords are never missed.
+    Each keyword maps to the best (lowest) section rank among itself and every keyword
+    it contains, which reproduces the "first section in SECTION_KEYWORDS order with any
+    keyword in the line" rule without testing each keyword separately.
+    """
+    section_order = list(section_keywords)
+    keyword_sections = [(keyword, rank) for rank, key in enumerate(section_order) for keyword in section_keywords[key]]
+    keywords = sorted({keyword for keyword, _ in keyword_sections}, key=len, reverse=True)
+    keyword_rank = {
+        keyword: min(rank for other, rank in keyword_sections if other in keyword)
+        for keyword in keywords
+    }
+    pattern = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))')
+    return pattern, keyword_rank, section_order
+
+SECTION_KEYWORD_PATTERN, SECTION_KEYWORD_RANK, SECTION_ORDER = _build_section_matcher(SECTION_KEYWORDS)
+
+def _match_section_keyword(line_lower):
+    """Returns the first section (in SECTION_KEYWORDS order) with a keyword in the line, or None."""
+    best_rank = None
+    for match in SECTION_KEYWORD_PATTERN.finditer(line_lower):
+        rank = SECTION_KEYWORD_RANK[match.group(1)]
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            if rank == 0:
+                break
+    return None if best_rank is None else SECTION_ORDER[best_rank]
+
 PERIOD_REGEX = re.compile(
     r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?(?:uary|ruary|rch|ril|y|ne|ly|ust|tember|ober|ember)?\s+\d{4}|\d{4}|\d{1,2}[/-]\d{4})" # Start Date (Month Year, Year, MM/YYYY)
     r"\s*(?:-|" + "\u2013" + "|" + "\u2014" + "|to|\s+until\s+)\s*" # Separator
@@ -30,29 +142,230 @@ PERIOD_REGEX = re.compile(
     , re.IGNORECASE
 )
 
-def _extract_text_from_pdf(file_path):
-    text = ""
+def _collect_text(chunks, counts, max_chunks=None, max_chars=None):
+    """
+    Joins text chunks (PDF pages, DOCX paragraphs) pulled lazily from a generator,
+    stopping as soon as a budget is exhausted so the rest is never extracted.
+
+    `counts['total']`, when the generator sets it, is the number of chunks available and
+    lets a page budget that cuts the document short be reported as truncation.
+
+    Returns:
+        tuple: (text, number of chunks consumed, truncated flag)
+    """
+    parts = []
+    consumed = 0
+    char_count = 0
+    truncated = False
     try:
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    except Exception as e:
-        logger.error(f"Error reading PDF {file_path}: {e}", exc_info=True)
-    return text
+        while max_chunks is None or consumed < max_chunks:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            consumed += 1
+            if not chunk:
+                continue
+            if max_chars is not None and char_count + len(chunk) > max_chars:
+                parts.append(chunk[:max_chars - char_count])
+                truncated = True
+                break
+            parts.append(chunk)
+            char_count += len(chunk) + 1 # Account for the joining newline
+        else:
+            truncated = counts.get('total', consumed) > consumed
+    finally:
+        chunks.close()
+    return '\n'.join(parts), consumed, truncated
+
+def _iter_pdf_pages(stream, label, counts, layout=False, page_time_budget=None):
+    """
+    Yields the text of each page; a page is only extracted when it is consumed.
 
-def _extract_text_from_docx(file_path):
-    text = ""
+    With `layout`, pages are extracted in reading order by pdf_layout, and the number
+    of pages cut short by `page_time_budget` is counted in counts['over_budget']. A page
+    the layout pass fails on falls back to content stream order.
+    """
+    try:
+        reader = _load_format_module('pdf').PdfReader(stream)
+        counts['total'] = len(reader.pages)
+        for number, page in enumerate(reader.pages, 1):
+            if not layout:
+                yield page.extract_text() or ''
+                continue
+            try:
+                text, complete = pdf_layout.extract_page_text(page, page_time_budget)
+            except MemoryError:
+                raise
+            except Exception as e:
+                logger.warning(f"Reading-order extraction failed on page {number} of {label}, using stream order: {e}")
+                yield page.extract_text() or ''
+                continue
+            if not complete:
+                counts['over_budget'] = counts.get('over_budget', 0) + 1
+                logger.warning(f"Page {number} of {label} ran out of its {page_time_budget}s extraction budget; its text is incomplete.")
+            yield text
+    except MemoryError: # Must reach the sandbox (or the caller) instead of yielding partial text
+        raise
+    except Exception as e:
+        logger.error(f"Error reading PDF {label}: {e}", exc_info=True)
+
+# WordprocessingML names used by the streaming DOCX extractor
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_W_P = _W_NS + 'p'
+_W_T = _W_NS + 't'
+_W_PPR = _W_NS + 'pPr'
+_W_BODY = _W_NS + 'body'
+_W_RUN_CHARS = {_W_NS + 'tab': '\t', _W_NS + 'br': '\n', _W_NS + 'cr': '\n', _W_NS + 'noBreakHyphen': '-'}
+DOCX_MAIN_PART = 'word/document.xml'
+DOCX_HEADER_PATTERN = re.compile(r'word/header(\d*)\.xml')
+
+def _iter_wordml_paragraphs(part):
+    """
+    Yields the text of every paragraph in a WordprocessingML part (document body, header)
+    in document order, streaming it with iterparse.
+
+    Paragraphs inside tables and text boxes are included. Text box paragraphs are
+    yielded before the paragraph that anchors them. mc:Fallback content, which
+    duplicates the preferred mc:Choice (e.g. VML copies of DrawingML text boxes),
+    is skipped. Finished top-level blocks are cleared, so memory stays bounded by
+    the largest single table or paragraph rather than the whole document.
+    """
+    buffers = [] # One text buffer per open (possibly nested) paragraph
+    depth = 0
+    skip_depth = None # Depth of the mc:Fallback being skipped
+    ppr_depth = 0 # Inside paragraph properties (tab stops are not text)
+    body = None
+    for event, elem in ET.iterparse(part, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            depth += 1
+            if skip_depth is not None:
+                continue
+            if tag == _W_P:
+                buffers.append([])
+            elif tag == _W_PPR:
+                ppr_depth += 1
+            elif tag == _MC_FALLBACK:
+                skip_depth = depth
+            elif tag == _W_BODY:
+                body = elem
+            continue
+
+        depth -= 1
+        if skip_depth is not None:
+            if depth < skip_depth:
+                skip_depth = None
+            continue
+        if tag == _W_T:
+            if buffers and elem.text:
+                buffers[-1].append(elem.text)
+        elif tag in _W_RUN_CHARS:
+            if buffers and not ppr_depth:
+                buffers[-1].append(_W_RUN_CHARS[tag])
+        elif tag == _W_PPR:
+            ppr_depth -= 1
+        elif tag == _W_P:
+            yield ''.join(buffers.pop())
+        if depth == 2 and body is not None: # A top-level block of the body just ended
+            body.clear()
+
+def _iter_docx_paragraphs(stream, label, counts):
+    """
+    Yields the text of each paragraph of a DOCX document: headers first, then the body
+    (including tables and text boxes) in document order.
+
+    The XML parts are streamed straight out of the zip. Documents without the usual
+    word/document.xml part fall back to python-docx, which resolves the part names
+    through the package relationships.
+    """
     try:
-        doc = Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+        with zipfile.ZipFile(stream) as archive:
+            names = archive.namelist()
+            if DOCX_MAIN_PART not in names:
+                yield from _iter_docx_paragraphs_python_docx(stream, label, counts)
+                return
+
+            headers = sorted((int(match.group(1) or 0), name) for name in names
+                             for match in [DOCX_HEADER_PATTERN.fullmatch(name)] if match)
+            seen_headers = set()
+            for _, name in headers:
+                with archive.open(name) as part:
+                    paragraphs = [text for text in _iter_wordml_paragraphs(part) if text.strip()]
+                key = tuple(paragraphs) # First-page, default and even headers often repeat
+                if key and key not in seen_headers:
+                    seen_headers.add(key)
+                    yield from paragraphs
+
+            with archive.open(DOCX_MAIN_PART) as part:
+                yield from _iter_wordml_paragraphs(part)
+    except MemoryError: # Must reach the sandbox (or the caller) instead of yielding partial text
+        raise
     except Exception as e:
-        logger.error(f"Error reading DOCX {file_path}: {e}", exc_info=True)
-    return text
+        logger.error(f"Error reading DOCX {label}: {e}", exc_info=True)
+
+def _iter_docx_paragraphs_python_docx(stream, label, counts):
+    """Yields the text of each body paragraph using python-docx (no tables or text boxes)."""
+    stream.seek(0)
+    doc = _load_format_module('docx').Document(stream)
+    paragraphs = doc.paragraphs
+    counts['total'] = len(paragraphs)
+    for para in paragraphs:
+        yield para.text
+
+def _extract_text_from_pdf(stream, label, max_pages=None, max_chars=None, layout=False, page_time_budget=None):
+    counts = {}
+    pages_iter = _iter_pdf_pages(stream, label, counts, layout, page_time_budget)
+    text, pages, truncated = _collect_text(pages_iter, counts, max_pages, max_chars)
+    truncated = truncated or bool(counts.get('over_budget'))
+    return text, {'pages': pages, 'chars': len(text), 'truncated': truncated}
+
+def _extract_text_from_docx(stream, label, max_pages=None, max_chars=None):
+    # DOCX files have no fixed pagination, so only the character budget applies
+    counts = {}
+    text, _, truncated = _collect_text(_iter_docx_paragraphs(stream, label, counts), counts, None, max_chars)
+    return text, {'pages': None, 'chars': len(text), 'truncated': truncated}
+
+@contextmanager
+def _open_resume_source(source, spill_threshold, spill_dir):
+    """
+    Yields a readable, seekable binary stream for any supported resume source.
+
+    Paths are opened directly, seekable file objects (e.g. a Werkzeug FileStorage stream)
+    are used as-is, small bytes-like buffers are wrapped in memory, and everything else
+    is copied into a SpooledTemporaryFile that only touches disk above `spill_threshold`.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield f
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if memoryview(source).nbytes <= spill_threshold:
+            yield io.BytesIO(source)
+            return
+    elif getattr(source, 'seekable', lambda: False)():
+        start = source.tell()
+        try:
+            yield source
+        finally:
+            source.seek(start)
+        return
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=spill_threshold, prefix='resume_', dir=spill_dir)
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            spooled.write(source)
+        else:
+            shutil.copyfileobj(source, spooled, SPOOL_CHUNK_SIZE)
+        spooled.seek(0)
+        yield spooled
+    finally:
+        spooled.close() # Removes the temporary file if the buffer was spilled to disk
 
 def _try_structure_item(text_block, item_type):
+    """Returns an ExperienceItem/EducationItem for `text_block`, or the block itself if it has no clear structure."""
     lines = [line.strip() for line in text_block.split('\n') if line.strip()]
     if not lines or len(lines) < 1: # Need at least one line for a meaningful item
         return text_block
@@ -98,19 +411,19 @@ def _try_structure_item(text_block, item_type):
     item['description'] = '\n'.join(description_lines).strip()
 
     # Validate essential fields for structured item
-    if item_type == 'experience' and not (item.get('title') and item.get('company')):
-        return text_block
-    if item_type == 'education' and not (item.get('degree') and item.get('institution')):
+    if item_type == 'experience':
+        if not (item.get('title') and item.get('company')):
+            return text_block
+        return ExperienceItem(item['title'], item['company'], item.get('period', ''), item['description'])
+    if not (item.get('degree') and item.get('institution')):
         return text_block
-    
-    # Remove empty description if it's just an empty string
-    if 'description' in item and not item['description']:
-        del item['description']
+    return EducationItem(item['degree'], item['institution'], item.get('period', ''), item['description'])
 
-    return item
+# ParsedResume fields filled from section bodies
+CONTENT_SECTIONS = frozenset({'experience', 'education', 'skills', 'summary'})
 
-def _process_section_content(section_name, content_lines, target_dict):
-    if not section_name or not content_lines or section_name not in target_dict:
+def _process_section_content(section_name, content_lines, target):
+    if not section_name or not content_lines or section_name not in CONTENT_SECTIONS:
         return
 
     full_content_block = '\n'.join(content_lines).strip()
@@ -119,175 +432,262 @@ def _process_section_content(section_name, content_lines, target_dict):
 
     if section_name in ['experience', 'education']:
         # Append the block; structuring will happen later
-        target_dict[section_name].append(full_content_block)
+        getattr(target, section_name).append(full_content_block)
     elif section_name == 'skills':
         # Split skills by common delimiters (comma, newline, semicolon, bullet points)
-        raw_skills = re.split(r'[\n,;
-" + "\u2022" + "*-]', full_content_block)
+        raw_skills = SKILL_SPLIT_PATTERN.split(full_content_block)
+        skills = target.skills
+        seen_skills = set(skills)
         for skill in raw_skills:
             s = skill.strip()
-            if s and len(s) > 1: # Basic validation for skill length
-                if s not in target_dict[section_name]: # Avoid duplicate skills from same block
-                    target_dict[section_name].append(s)
+            if len(s) > 1 and s not in seen_skills: # Basic validation for skill length, avoid duplicates
+                seen_skills.add(s)
+                skills.append(s)
     elif section_name == 'summary':
         # Explicit summary section should overwrite any heuristically gathered summary
-        target_dict[section_name] = full_content_block.strip()
+        target.summary = full_content_block.strip()
     # Note: If other generic single-block text sections are added in the future,
     # they would need specific handling or a reinstated generic 'else' block.
     # For now, any other section type not explicitly handled above will be ignored here.
 
-def _parse_sections(text_content):
-    parsed_data = {
-        'name': '', 'title': '',
-        'email': '', 'phone': '', 'linkedin': '', 'github': '',
-        'summary': '',
-        'experience': [], 'education': [], 'skills': []
+def _first_match(pattern, text):
+    """Smallest distinct match of `pattern` in the text (what sorted(set(findall))[0] gave)."""
+    matches = pattern.findall(text)
+    return min(matches) if matches else ''
+
+def _token_contact_candidates(text_content):
+    """
+    Returns the (email, linkedin, github) candidates of the text: the smallest match of
+    each, with URLs still carrying their scheme.
+
+    Emails never contain whitespace and always contain '@', and profile URLs never
+    contain whitespace and always contain '/', so only those tokens are scanned, joined
+    by a space that no match can cross.
+    """
+    email_tokens = []
+    url_tokens = []
+    for token in text_content.split():
+        if '@' in token:
+            email_tokens.append(token)
+        if '/' in token:
+            url_tokens.append(token)
+    url_text = ' '.join(url_tokens)
+    return (_first_match(EMAIL_PATTERN, ' '.join(email_tokens)),
+            _first_match(LINKEDIN_PATTERN, url_text),
+            _first_match(GITHUB_PATTERN, url_text))
+
+def _phone_candidate(text_content):
+    """Smallest phone match; phone numbers live inside runs of digits, whitespace and +()._- characters."""
+    return _first_match(PHONE_PATTERN, '|'.join(PHONE_RUN_PATTERN.findall(text_content)))
+
+def _finish_contacts(email, phone, linkedin, github):
+    return {
+        'email': email,
+        'phone': phone,
+        'linkedin': linkedin.replace("https://", "").replace("http://", ""),
+        'github': github.replace("https://", "").replace("http://", ""),
     }
 
-    # Extract contact info
-    emails = sorted(list(set(re.findall(EMAIL_REGEX, text_content, re.IGNORECASE))))
-    if emails: parsed_data['email'] = emails[0] # Take the first one for simplicity
-    
-    phones = sorted(list(set(re.findall(PHONE_REGEX, text_content))))
-    if phones: parsed_data['phone'] = phones[0]
+def _scan_contacts(text_content):
+    """
+    Extracts email, phone, LinkedIn and GitHub with one tokenizing pass over the text.
 
-    linkedin_urls = sorted(list(set(re.findall(LINKEDIN_REGEX, text_content, re.IGNORECASE))))
-    if linkedin_urls: parsed_data['linkedin'] = linkedin_urls[0].replace("https://", "").replace("http://", "")
+    None of the contact patterns use anchors or lookarounds, so each can be run on just
+    the regions that may hold a match, joined by a separator outside its alphabet.
+    Results are identical to scanning the full text.
+    """
+    email, linkedin, github = _token_contact_candidates(text_content)
+    return _finish_contacts(email, _phone_candidate(text_content), linkedin, github)
 
-    github_urls = sorted(list(set(re.findall(GITHUB_REGEX, text_content, re.IGNORECASE))))
-    if github_urls: parsed_data['github'] = github_urls[0].replace("https://", "").replace("http://", "")
+def _detect_name_title(lines):
+    """
+    Picks the name and title from the first two non-empty lines (heuristic).
 
-    lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-    current_section = None
-    temp_content = []
-    
-    # Attempt to get name and title (heuristic)
-    # Name is often the first prominent line, title might be second or near contact details.
+    Name is often the first prominent line, title might be second or near contact details.
+    """
+    name = title = ''
     if lines:
         # First line as potential name, if it's not an email or phone or too long
         first_line = lines[0]
-        if not re.search(EMAIL_REGEX + "|" + PHONE_REGEX, first_line, re.IGNORECASE) and len(first_line.split()) < 6 and len(first_line) < 50:
-            parsed_data['name'] = first_line
+        if len(first_line) < 50 and len(first_line.split()) < 6 and not NAME_GUARD_PATTERN.search(first_line):
+            name = first_line
             # Try second line as title
             if len(lines) > 1:
                 second_line = lines[1]
-                if not re.search(EMAIL_REGEX + "|" + PHONE_REGEX, second_line, re.IGNORECASE) and len(second_line.split()) < 10 and len(second_line) < 70:
+                if len(second_line) < 70 and len(second_line.split()) < 10 and not NAME_GUARD_PATTERN.search(second_line):
                     # Check if it looks like a section header
-                    is_section_header = any(keyword in second_line.lower() for section_keywords in SECTION_KEYWORDS.values() for keyword in section_keywords)
-                    if not is_section_header:
-                        parsed_data['title'] = second_line
-    
+                    if _match_section_keyword(second_line.lower()) is None:
+                        title = second_line
+
     # Default if not found
-    if not parsed_data['name']: parsed_data['name'] = 'Your Name'
-    if not parsed_data['title']: parsed_data['title'] = 'Professional Title'
+    return name or 'Your Name', title or 'Professional Title'
 
-    section_line_indices = set()
+def _section_header_key(line):
+    """Returns the section a (stripped) line introduces, or None. Section headers are short and contain keywords."""
+    if len(line.split()) < 6:
+        return _match_section_keyword(line.lower())
+    return None
 
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        identified_new_section = False
+def _normalize_skills(skills):
+    """Unique skills of sensible length, mapped to canonical names by the skill taxonomy (capitalized if unknown)."""
+    return skill_taxonomy.get_default().normalize(skills)
+
+def _parse_sections(text_content):
+    """Parses extracted resume text into a ParsedResume."""
+    # Extract contact info (the smallest match of each kind, for stable results)
+    parsed_data = ParsedResume(**_scan_contacts(text_content))
+
+    lines = [line for line in (raw_line.strip() for raw_line in text_content.split('\n')) if line]
+    current_section = None
+    temp_content = []
 
-        # Check if line is a section header
-        for section_key_candidate, keywords in SECTION_KEYWORDS.items():
-            # Section headers are usually short and contain keywords
-            if any(keyword in line_lower for keyword in keywords) and len(line.split()) < 6:
+    name, title = parsed_data.name, parsed_data.title = _detect_name_title(lines[:2])
+
+    for line in lines:
+        word_count = len(line.split())
+
+        # Section headers are usually short and contain keywords
+        if word_count < 6:
+            section_key = _match_section_keyword(line.lower())
+            if section_key is not None:
                 _process_section_content(current_section, temp_content, parsed_data)
-                current_section = section_key_candidate
+                current_section = section_key
                 temp_content = []
-                identified_new_section = True
-                section_line_indices.add(i)
-                break # Found a section, process it
-        # Removed redundant `if identified_new_section: break` as it was inside the loop that sets it
-        
-        if not identified_new_section and i not in section_line_indices:
-            # If line is not part of name/title extraction and not a section header
-            if (parsed_data['name'] and line == parsed_data['name']) or \
-               (parsed_data['title'] and line == parsed_data['title']): # Avoid re-adding name/title
                 continue
 
-            if current_section:
-                temp_content.append(line)
-            elif not parsed_data['summary'] and len(line.split()) > 3: # Content before any explicit section could be summary
-                 # Avoid contact info being part of summary
-                if not re.search(EMAIL_REGEX + "|" + PHONE_REGEX + "|" + LINKEDIN_REGEX + "|" + GITHUB_REGEX, line, re.IGNORECASE):
-                    parsed_data['summary'] += line + "\n"
+        # If line is not part of name/title extraction and not a section header
+        if line == name or line == title: # Avoid re-adding name/title
+            continue
+
+        if current_section:
+            temp_content.append(line)
+        elif not parsed_data.summary and word_count > 3: # Content before any explicit section could be summary
+            # Avoid contact info being part of summary
+            if not CONTACT_LINE_PATTERN.search(line):
+                parsed_data.summary += line + "\n"
 
     _process_section_content(current_section, temp_content, parsed_data)
 
     # Post-process experience and education for structure
-    parsed_data['experience'] = [(_try_structure_item(block, 'experience')) for block in parsed_data.get('experience', [])]
-    parsed_data['education'] = [(_try_structure_item(block, 'education')) for block in parsed_data.get('education', [])]
+    parsed_data.experience = [_try_structure_item(block, 'experience') for block in parsed_data.experience]
+    parsed_data.education = [_try_structure_item(block, 'education') for block in parsed_data.education]
 
     # Clean up skills: unique, sensible length
-    if parsed_data['skills']:
-        unique_skills = list(set(s.strip().capitalize() for s in parsed_data['skills'] if s.strip() and 1 < len(s.strip()) < 50))
-        parsed_data['skills'] = sorted(unique_skills)
-    else:
-        parsed_data['skills'] = []
+    parsed_data.skills = sorted(_normalize_skills(parsed_data.skills))
 
-    if parsed_data['summary']:
-        parsed_data['summary'] = parsed_data['summary'].strip()
+    if parsed_data.summary:
+        parsed_data.summary = parsed_data.summary.strip()
 
     return parsed_data
 
-def parse_resume(file_path):
-    _, file_extension = os.path.splitext(file_path)
-    text_content = ""
+def _resume_filename(source, filename):
+    """The given filename, else the path or the `filename`/`name` attribute of a file object."""
+    if filename is None:
+        if isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        else:
+            filename = getattr(source, 'filename', None) or getattr(source, 'name', None)
+    return filename if isinstance(filename, str) else ''
+
+def extract_resume_text(source, filename=None, spill_threshold=SPILL_THRESHOLD, spill_dir=None,
+                        max_pages=MAX_PAGES, max_chars=MAX_CHARS, timer=NULL_TIMER, pdf_reading_order=PDF_READING_ORDER,
+                        page_time_budget=PDF_PAGE_TIME_BUDGET):
+    """
+    Extracts the text of a resume (the first stage of parse_resume).
+
+    Takes the same arguments as parse_resume. Returns (text, extraction info), where the
+    info has 'pages', 'chars' and 'truncated'.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    filename = _resume_filename(source, filename)
+    _, file_extension = os.path.splitext(filename)
     ext_lower = file_extension.lower()
 
     if ext_lower == '.pdf':
-        text_content = _extract_text_from_pdf(file_path)
+        extractor = functools.partial(_extract_text_from_pdf, layout=pdf_reading_order, page_time_budget=page_time_budget)
     elif ext_lower in ['.docx', '.doc']:
-        text_content = _extract_text_from_docx(file_path)
+        extractor = _extract_text_from_docx
     else:
         allowed_types = "PDF, DOCX, DOC"
-        logger.warning(f"Unsupported file type: {ext_lower}. File: {file_path}")
+        logger.warning(f"Unsupported file type: {ext_lower}. File: {filename}")
         raise ValueError(f"Unsupported file type: {ext_lower}. Only {allowed_types} are supported.")
 
+    with ExitStack() as stack:
+        with timer.stage('spool'):
+            stream = stack.enter_context(_open_resume_source(source, spill_threshold, spill_dir))
+        with timer.stage('extract'):
+            text_content, extraction_info = extractor(stream, filename, max_pages=max_pages, max_chars=max_chars)
+
+    if extraction_info['truncated']:
+        logger.warning(f"Extraction budget reached for {filename} after {extraction_info['chars']} characters"
+                       f"{'' if extraction_info['pages'] is None else ' / %d pages' % extraction_info['pages']}; result is truncated.")
+    return text_content, extraction_info
+
+def parse_resume(source, filename=None, spill_threshold=SPILL_THRESHOLD, spill_dir=None,
+                 max_pages=MAX_PAGES, max_chars=MAX_CHARS, timer=NULL_TIMER, stats=None,
+                 fingerprint=None, reuse=None, pdf_reading_order=PDF_READING_ORDER, page_time_budget=PDF_PAGE_TIME_BUDGET):
+    """
+    Parses a resume into structured data.
+
+    Args:
+        source: A filesystem path, a bytes-like buffer (bytes, bytearray, memoryview) or a
+                binary file object such as a Werkzeug FileStorage or its stream.
+        filename (str): Name used to pick the format by extension. Defaults to the path,
+                        or the `filename`/`name` attribute of a file object.
+        spill_threshold (int): Size above which in-memory buffers and unseekable streams
+                               are spooled to a temporary file while parsing.
+        spill_dir (str): Directory for spooled temporary files (system default if None).
+        max_pages (int): Stop extracting PDFs after this many pages (None for no limit).
+        max_chars (int): Stop extracting after this many characters (None for no limit).
+        pdf_reading_order (bool): Extract PDF pages in reading order (columns, blocks) instead of
+                                  content stream order (off by default).
+        page_time_budget (float): Seconds of layout-aware extraction allowed per PDF page
+                                  (None for no limit); a page over budget is cut short.
+        timer: A metrics.StageTimer that records the 'spool', 'extract' and 'sections' stages.
+        stats (dict): If given, receives the extraction info ('pages', 'chars', 'truncated').
+        fingerprint (callable): Applied to the extracted text (e.g. minhash.signature); the
+                                value is stored in stats['fingerprint'] and passed to `reuse`.
+        reuse (callable): Called with the fingerprint; may return an earlier ParsedResume
+                          to use instead of parsing this text (e.g. for a near-duplicate).
+
+    Returns:
+        ParsedResume: The parsed resume. `truncated` is True when a budget cut the text short.
+    """
+    text_content, extraction_info = extract_resume_text(source, filename, spill_threshold, spill_dir,
+                                                        max_pages, max_chars, timer, pdf_reading_order, page_time_budget)
+    filename = _resume_filename(source, filename)
+    if stats is not None:
+        stats.update(extraction_info)
+
+    if fingerprint is not None:
+        with timer.stage('fingerprint'):
+            text_fingerprint = fingerprint(text_content)
+        if stats is not None:
+            stats['fingerprint'] = text_fingerprint
+        if reuse is not None and text_fingerprint is not None:
+            previous = reuse(text_fingerprint)
+            if previous is not None:
+                logger.info(f"Reusing the parse of a near-duplicate for {filename}")
+                return dataclasses.replace(previous, truncated=extraction_info['truncated'])
+
     if not text_content.strip():
-        logger.warning(f"No text extracted from {file_path}. Document might be image-based or empty.")
-        return {
-            'name': 'Error: Could Not Parse Name',
-            'title': 'Error: Could Not Parse Title',
-            'email': '', 'phone': '', 'linkedin': '', 'github': '',
-            'summary': 'Could not extract text from the resume. The document might be image-based, corrupted, or empty.',
-            'experience': [], 'education': [], 'skills': []
-        }
-
-    parsed_data = _parse_sections(text_content)
-    logger.info(f"Successfully parsed resume: {file_path}")
+        logger.warning(f"No text extracted from {filename}. Document might be image-based or empty.")
+        return ParsedResume(
+            name='Error: Could Not Parse Name',
+            title='Error: Could Not Parse Title',
+            summary='Could not extract text from the resume. The document might be image-based, corrupted, or empty.',
+            truncated=extraction_info['truncated'])
+
+    with timer.stage('sections'):
+        parsed_data = _parse_sections(text_content)
+    parsed_data.truncated = extraction_info['truncated']
+    logger.info(f"Successfully parsed resume: {filename}")
     return parsed_data
 
 if __name__ == '__main__':
-    # Example Usage (for testing)
-    # Create a dummy docx for testing
-    dummy_docx_path = 'dummy_resume_parser_test.docx'
-    try:
-        doc = Document()
-        doc.add_heading('Dr. Jane Doe', 0)
-        doc.add_paragraph('Senior Quantum Physicist & Bagel Enthusiast')
-        doc.add_paragraph('jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe | github.com/janedoe')
-        doc.add_heading('Overview', level=1) # This will be treated as 'summary'
-        doc.add_paragraph('A highly motivated physicist with a passion for bagels.')
-        doc.add_heading('Professional Experience', level=1)
-        doc.add_paragraph('Lead Physicist\nQuantum Bagel Labs\nJan 2020 - Present\n- Spearheaded research on bagel quantum properties.')
-        doc.add_paragraph('Research Fellow\nInstitute of Theoretical Breakfast\n2018 - 2019\n- Studied Schr\u00f6dinger\'s cat breakfast preferences.')
-        doc.add_heading('Education', level=1)
-        doc.add_paragraph('Ph.D. in Quantum Bagel Dynamics\nUniversity of Advanced Studies\nGraduated: May 2015')
-        doc.add_paragraph('B.S. in Physics\nState College\n2011')        
-        doc.add_heading('Technical Skills', level=1)
-        doc.add_paragraph('Quantum Entanglement, Python, LaTeX, Bagel Slicing; Cream Cheese Spreading')
-        doc.save(dummy_docx_path)
-        logger.info(f"Dummy DOCX created at {dummy_docx_path}")
-        
-        parsed_docx_data = parse_resume(dummy_docx_path)
-        logger.info("\n--- Parsed DOCX Data ---")
-        import json
-        logger.info(json.dumps(parsed_docx_data, indent=2))
-
-    except Exception as e:
-        logger.error(f"Error in DOCX example processing: {e}", exc_info=True)
-    finally:
-        if os.path.exists(dummy_docx_path):
-            os.remove(dummy_docx_path)
-            logger.info(f"Removed dummy DOCX: {dummy_docx_path}")
+    # Bulk ingestion CLI, e.g. `python -m resume_parser resumes/ -o parsed.ndjson --resume`
+    import sys
+    from batch_ingest import main
+    sys.exit(main())
@@ -0,0 +1,300 @@
+import os
+import math
+import signal
+import logging
+import threading
+import multiprocessing
+
+try:
+    import resource
+except ImportError: # Not available on Windows: only the wall-clock timeout applies there
+    resource = None
+
+from metrics import NULL_TIMER, StageTimer
+from parse_jobs import QueueFullError
+from resume_model import ParsedResume
+from resume_parser import parse_resume
+
+logger = logging.getLogger(__name__)
+
+# Reasons a sandboxed parse can be stopped, as reported by ParseLimitExceeded.reason
+KILL_CPU = 'cpu'
+KILL_MEMORY = 'memory'
+KILL_TIMEOUT = 'timeout'
+KILL_CRASH = 'crash'
+KILL_REASONS = (KILL_CPU, KILL_MEMORY, KILL_TIMEOUT, KILL_CRASH)
+
+
+class ParseLimitExceeded(Exception):
+    """Raised by SandboxPool.run when a parse hit a resource limit or took its worker down."""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class _CpuLimitReached(BaseException):
+    # BaseException, so the parser's broad `except Exception` handlers cannot swallow it
+    pass
+
+
+def _raise_cpu_limit(signum, frame):
+    raise _CpuLimitReached()
+
+
+def _address_space_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def _limit_memory(memory_bytes):
+    """
+    Caps the worker's address space at its current size plus `memory_bytes`.
+
+    Linux does not enforce RLIMIT_RSS, so the address-space limit stands in for it: the
+    worker is forked from the app and starts with the app's mappings, and anything a
+    parse allocates beyond the budget fails with MemoryError.
+    """
+    if resource is None or not memory_bytes:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = _address_space_bytes() + memory_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _arm_cpu_limit(cpu_seconds):
+    """Sets the soft RLIMIT_CPU to `cpu_seconds` beyond the CPU time used so far (RLIMIT_CPU is per process)."""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _disarm_cpu_limit():
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _worker_main(conn, cpu_seconds, memory_bytes):
+    """
+    Loop of a sandbox worker process: receives (data, filename, options) jobs and
+    replies with ('ok', result dict, stats, stage durations), ('invalid', message),
+    ('error', message) or ('limit', reason, message). After a limit is hit the worker
+    replies and exits, since the interrupted parse may have left it in a bad state.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Shutdown is driven by the parent
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    _limit_memory(memory_bytes)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        data, filename, options = job
+        exit_after_reply = False
+        try:
+            _arm_cpu_limit(cpu_seconds)
+            try:
+                timer = StageTimer()
+                stats = {}
+                result = parse_resume(data, filename=filename, timer=timer, stats=stats, **options)
+                reply = ('ok', result.to_dict(), stats, timer.durations)
+            finally:
+                _disarm_cpu_limit()
+        except _CpuLimitReached:
+            reply = ('limit', KILL_CPU, f"CPU time limit of {cpu_seconds}s exceeded.")
+            exit_after_reply = True
+        except MemoryError:
+            reply = ('limit', KILL_MEMORY, f"Memory limit of {memory_bytes // (1024 * 1024)} MB exceeded.")
+            exit_after_reply = True
+        except ValueError as ve:
+            reply = ('invalid', str(ve))
+        except Exception as e:
+            reply = ('error', f"{type(e).__name__}: {e}")
+        del data, job
+        try:
+            conn.send(reply)
+        except (OSError, ValueError):
+            return
+        if exit_after_reply:
+            return
+
+
+class _SandboxWorker:
+    __slots__ = ('process', 'conn', 'jobs')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs = 0
+
+
+class SandboxPool:
+    """
+    Runs parse_resume in reusable worker processes with per-parse resource limits.
+
+    Each parse gets `cpu_seconds` of CPU time (RLIMIT_CPU, re-armed per job), the worker
+    may grow by at most `memory_mb` (RLIMIT_AS) and the parent waits at most `timeout`
+    seconds of wall-clock time before killing the worker. A tripped limit raises
+    ParseLimitExceeded and the worker is replaced; healthy workers are reused until they
+    have handled `max_jobs_per_worker` parses.
+
+    At most `max_workers` parses run at once. Callers wait up to `timeout` seconds for a
+    free worker and then get QueueFullError. `on_kill(reason)` is called for every
+    stopped parse, e.g. to count kills in metrics.
+    """
+
+    def __init__(self, max_workers=2, cpu_seconds=20, memory_mb=512, timeout=30, max_jobs_per_worker=200,
+                 parse_options=None, on_kill=None):
+        self.max_workers = max(1, int(max_workers))
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = int(memory_mb * 1024 * 1024) if memory_mb else 0
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.parse_options = parse_options or {}
+        self.on_kill = on_kill
+        self.kills = dict.fromkeys(KILL_REASONS, 0)
+        self.parses = 0
+        self.workers_started = 0
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+    def _start_worker(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_worker_main, name='parse-sandbox', daemon=True,
+                                          args=(child_conn, self.cpu_seconds, self.memory_bytes))
+        process.start()
+        child_conn.close()
+        with self._lock:
+            self.workers_started += 1
+        logger.info(f"Started parse sandbox worker {process.pid}")
+        return _SandboxWorker(process, parent_conn)
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                self._close(worker)
+        return self._start_worker()
+
+    def _checkin(self, worker):
+        if worker.jobs >= self.max_jobs_per_worker:
+            self._retire(worker)
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def _close(self, worker):
+        worker.conn.close()
+        worker.process.join(timeout=1)
+
+    def _retire(self, worker):
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+        self._close(worker)
+
+    def _kill(self, worker, reason, filename):
+        if worker.process.is_alive():
+            worker.process.kill()
+        self._close(worker)
+        with self._lock:
+            self.kills[reason] += 1
+        logger.warning(f"Stopped sandboxed parse of '{filename}' ({reason}); worker {worker.process.pid} replaced.")
+        if self.on_kill is not None:
+            self.on_kill(reason)
+
+    def run(self, data, filename, timer=NULL_TIMER, stats=None, fingerprint=None):
+        """
+        Parses `data` (the raw file bytes) in a sandbox worker.
+
+        `fingerprint` is passed on to parse_resume and must be picklable (a module-level
+        function or a functools.partial of one); its value comes back in stats['fingerprint'].
+
+        Returns:
+            ParsedResume: As parse_resume would; `timer` and `stats` are filled in likewise.
+
+        Raises:
+            ValueError: For unsupported files, as parse_resume does.
+            ParseLimitExceeded: If the parse hit a limit or its worker died.
+            QueueFullError: If no worker became free within `timeout` seconds.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise QueueFullError("All parse sandbox workers are busy.")
+        try:
+            job = (bytes(data), filename, dict(self.parse_options, fingerprint=fingerprint))
+            worker = self._checkout()
+            try:
+                worker.conn.send(job)
+            except OSError:
+                self._close(worker) # Died while idle; one fresh worker gets the job
+                worker = self._start_worker()
+                worker.conn.send(job)
+            del job
+            worker.jobs += 1
+
+            if not worker.conn.poll(self.timeout):
+                self._kill(worker, KILL_TIMEOUT, filename)
+                raise ParseLimitExceeded(KILL_TIMEOUT, f"Parsing took longer than {self.timeout}s.")
+            try:
+                reply = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(timeout=1)
+                exitcode = worker.process.exitcode
+                self._kill(worker, KILL_CRASH, filename)
+                raise ParseLimitExceeded(KILL_CRASH, f"Parser process exited unexpectedly (exit code {exitcode}).")
+
+            with self._lock:
+                self.parses += 1
+            status = reply[0]
+            if status == 'limit':
+                self._kill(worker, reply[1], filename)
+                raise ParseLimitExceeded(reply[1], reply[2])
+            self._checkin(worker)
+            if status == 'invalid':
+                raise ValueError(reply[1])
+            if status == 'error':
+                raise RuntimeError(reply[1])
+
+            _, result, worker_stats, durations = reply
+            if stats is not None:
+                stats.update(worker_stats)
+            if timer.enabled:
+                for name, seconds in durations.items():
+                    timer.durations[name] = timer.durations.get(name, 0.0) + seconds
+            return ParsedResume.from_dict(result)
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {'workers_idle': len(self._idle), 'workers_started': self.workers_started,
+                    'parses': self.parses, 'kills': dict(self.kills)}
+
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._retire(worker)
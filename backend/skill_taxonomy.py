@@ -0,0 +1,247 @@
+import os
+import re
+import heapq
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Canonicalization of extracted skills against a local dictionary.
+#
+# Every dictionary name and alias is reduced to a key (case-folded, without spacing or
+# punctuation other than "+" and "#"), so "Python3", "python 3" and "PYTHON" meet at the
+# same entries. A skill resolves by exact key, then by its key without a trailing version
+# ("postgresql14" -> "postgresql"), then by fuzzy matching on character trigrams. The
+# trigram index skips grams shared by more than `max_posting` keys, so a fuzzy lookup
+# touches a bounded number of postings however large the dictionary grows, and resolved
+# keys are memoized so repeated skills across a batch cost one dict lookup.
+
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.txt')
+
+_KEY_STRIP_PATTERN = re.compile(r'[^\w+#]|_')
+_VERSION_SUFFIX_PATTERN = re.compile(r'(?<=[^\d])v?\d+$')
+
+
+def skill_key(text):
+    """Matching key of a skill name: NFKC, case-folded, only word characters, '+' and '#'."""
+    return _KEY_STRIP_PATTERN.sub('', unicodedata.normalize('NFKC', text).casefold())
+
+
+def _trigrams(key):
+    padded = f"${key}$"
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dictionary_version(paths, **options):
+    """
+    Short digest of the dictionary files and taxonomy options: what SkillTaxonomy.from_files
+    reports as the version, computed without building the index (e.g. for cache keys).
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    digest.update(repr(sorted(options.items())).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def parse_dictionary(lines):
+    """Yields (canonical, aliases) from dictionary lines ("Canonical | alias | alias", '#' comments)."""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        names = [name.strip() for name in line.split('|')]
+        if names[0]:
+            yield names[0], [name for name in names[1:] if name]
+
+
+class SkillTaxonomy:
+    """
+    Index over a skills dictionary that maps extracted skills to canonical names.
+
+    `entries` is an iterable of (canonical, aliases). Keys that would map to two different
+    canonical names keep the first one. Fuzzy matches need a trigram Dice similarity of at
+    least `fuzzy_threshold` (0 disables fuzzy matching) and are only tried for keys of at
+    least `fuzzy_min_length` characters, since short names are too easily confused.
+    Up to `cache_size` resolved keys are memoized. Instances are safe to share between threads.
+    """
+
+    def __init__(self, entries, fuzzy_threshold=0.8, fuzzy_min_length=5, max_posting=500, cache_size=50000,
+                 version=''):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_min_length = fuzzy_min_length
+        self.max_posting = max_posting
+        self.cache_size = cache_size
+        self.version = version
+        self.canonical_names = []
+        self._exact = {} # key -> canonical name
+        self._keys = [] # Fuzzy candidates: keys long enough to be matched approximately
+        self._key_grams = []
+        postings = {}
+        conflicts = 0
+        for canonical, aliases in entries:
+            self.canonical_names.append(canonical)
+            for name in (canonical, *aliases):
+                key = skill_key(name)
+                if not key:
+                    continue
+                existing = self._exact.get(key)
+                if existing is not None:
+                    conflicts += existing != canonical
+                    continue
+                self._exact[key] = canonical
+                if len(key) >= fuzzy_min_length:
+                    key_id = len(self._keys)
+                    self._keys.append(key)
+                    grams = _trigrams(key)
+                    self._key_grams.append(grams)
+                    for gram in grams:
+                        postings.setdefault(gram, []).append(key_id)
+        # Stop-grams: postings longer than max_posting are dropped, which bounds lookup cost
+        self._postings = {gram: tuple(ids) for gram, ids in postings.items() if len(ids) <= max_posting}
+        self.stop_grams = len(postings) - len(self._postings)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if conflicts:
+            logger.warning(f"Skill taxonomy: {conflicts} names map to more than one canonical skill; kept the first.")
+
+    @classmethod
+    def from_files(cls, paths, **kwargs):
+        """Builds a taxonomy from dictionary files; later files add to (never override) earlier ones."""
+        entries = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries.extend(parse_dictionary(f.read().splitlines()))
+        if 'version' not in kwargs:
+            kwargs['version'] = dictionary_version(paths, **kwargs)
+        taxonomy = cls(entries, **kwargs)
+        logger.info(f"Loaded skill taxonomy: {len(taxonomy.canonical_names)} skills, {len(taxonomy._exact)} names"
+                    f" from {len(paths)} file(s)")
+        return taxonomy
+
+    def _fuzzy(self, key):
+        grams = _trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if ids:
+                shared.update(ids)
+        if not shared:
+            return None
+        threshold = self.fuzzy_threshold
+        # Dice >= t needs the candidate's gram count within [n*t/(2-t), n*(2-t)/t]
+        low = len(grams) * threshold / (2 - threshold)
+        high = len(grams) * (2 - threshold) / threshold
+        best_score, best_id = 0.0, None
+        # Exact scores for the candidates sharing the most indexed grams (earlier entries win ties)
+        for key_id, _ in heapq.nsmallest(8, shared.items(), key=lambda item: (-item[1], item[0])):
+            other = self._key_grams[key_id]
+            if not low <= len(other) <= high:
+                continue
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score:
+                best_score, best_id = score, key_id
+        if best_id is None or best_score < threshold:
+            return None
+        return self._exact[self._keys[best_id]]
+
+    def _resolve(self, key):
+        canonical = self._exact.get(key)
+        if canonical is not None:
+            return canonical
+        unversioned = _VERSION_SUFFIX_PATTERN.sub('', key)
+        if unversioned != key and len(unversioned) >= 2:
+            canonical = self._exact.get(unversioned)
+            if canonical is not None:
+                return canonical
+        if self.fuzzy_threshold and len(key) >= self.fuzzy_min_length:
+            return self._fuzzy(key)
+        return None
+
+    def canonicalize_keys(self, keys):
+        """Returns {key: canonical name or None} for an iterable of skill keys, in one pass."""
+        memo = self._memo
+        resolved = {}
+        pending = set()
+        for key in keys:
+            if key in resolved or key in pending:
+                continue
+            canonical = memo.get(key, memo)
+            if canonical is memo:
+                pending.add(key)
+            else:
+                resolved[key] = canonical
+        self.hits += len(resolved)
+        self.misses += len(pending)
+        if pending:
+            found = {key: self._resolve(key) for key in pending}
+            resolved.update(found)
+            with self._memo_lock:
+                if len(memo) + len(found) > self.cache_size:
+                    memo.clear()
+                memo.update(found)
+        return resolved
+
+    def canonicalize(self, skill):
+        """Canonical name of a single skill, or None if it is not in the dictionary."""
+        key = skill_key(skill)
+        return self.canonicalize_keys([key])[key] if key else None
+
+    def normalize(self, skills):
+        """
+        Maps extracted skills to a set of display names: the canonical name for dictionary
+        skills, the capitalized skill otherwise. Skills outside 2-49 characters are dropped.
+        """
+        named = []
+        for skill in skills:
+            s = skill.strip()
+            if 1 < len(s) < 50:
+                named.append((s, skill_key(s)))
+        canonical = self.canonicalize_keys(key for _, key in named if key)
+        return {canonical.get(key) or s.capitalize() for s, key in named}
+
+    def stats(self):
+        return {'skills': len(self.canonical_names), 'names': len(self._exact), 'fuzzy_keys': len(self._keys),
+                'stop_grams': self.stop_grams, 'memoized': len(self._memo), 'hits': self.hits,
+                'misses': self.misses, 'version': self.version}
+
+
+_default_paths = [DEFAULT_DICTIONARY_PATH]
+_default_options = {}
+_default_taxonomy = None
+_default_lock = threading.Lock()
+
+
+def configure(extra_paths=(), **options):
+    """Sets the dictionary files (the bundled one plus `extra_paths`) and options of the default taxonomy."""
+    global _default_paths, _default_options, _default_taxonomy
+    with _default_lock:
+        _default_paths = [DEFAULT_DICTIONARY_PATH, *extra_paths]
+        _default_options = options
+        _default_taxonomy = None
+
+
+def default_version():
+    """Version of the default taxonomy, without building it if it has not been used yet."""
+    with _default_lock:
+        if _default_taxonomy is not None:
+            return _default_taxonomy.version
+        return dictionary_version(_default_paths, **_default_options)
+
+
+def get_default():
+    """The shared taxonomy used by the parser, built on first use."""
+    global _default_taxonomy
+    taxonomy = _default_taxonomy
+    if taxonomy is None:
+        with _default_lock:
+            if _default_taxonomy is None:
+                _default_taxonomy = SkillTaxonomy.from_files(_default_paths, **_default_options)
+            taxonomy = _default_taxonomy
+    return taxonomy
@@ -0,0 +1,121 @@
+import os
+import re
+import gzip
+import hashlib
+import logging
+import mimetypes
+
+try:
+    import brotli
+except ImportError: # Optional: without it only .br files already in the build are served
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Build outputs with a content hash in the name (e.g. main.3f2a1b9c.js,
+# logo.6ce24c58023cc2f8fd88fe9d219db6c6.svg) never change, so they can be cached forever.
+HASHED_NAME_PATTERN = re.compile(r'\.[0-9a-f]{8,}\.')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Only text-like assets above this size are worth compressing
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                      'image/svg+xml', 'application/manifest+json')
+MIN_COMPRESS_SIZE = 1024
+
+# Accept-Encoding token -> file suffix of the precompressed variant, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticAsset:
+    """One build file held in memory, with its precompressed variants."""
+
+    __slots__ = ('path', 'mimetype', 'cache_control', 'etag', 'variants')
+
+    def __init__(self, path, mimetype, cache_control, data):
+        self.path = path
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(data).hexdigest()[:32]
+        self.variants = {None: data} # encoding (None = identity) -> bytes
+
+    def select(self, accept_encodings):
+        """
+        Picks the best variant for an Accept-Encoding header.
+
+        Args:
+            accept_encodings: Werkzeug's request.accept_encodings.
+
+        Returns:
+            tuple: (content encoding or None, body bytes, ETag). Each encoding has its own
+                   strong ETag since the bytes differ.
+        """
+        for encoding, _ in ENCODINGS:
+            if encoding in self.variants and accept_encodings.quality(encoding) > 0:
+                return encoding, self.variants[encoding], f"{self.etag}-{encoding}"
+        return None, self.variants[None], self.etag
+
+
+class StaticManifest:
+    """
+    In-memory index of a frontend build directory, built once at startup.
+
+    Every file is read into memory together with .br/.gz variants: those shipped in the
+    build are used as-is, and the rest are compressed here (brotli only if installed).
+    Lookups are dictionary hits, so serving an asset never touches the filesystem.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.assets = {}
+        self.total_bytes = 0
+
+    def build(self):
+        assets = {}
+        total_bytes = 0
+        if not os.path.isdir(self.root):
+            logger.warning(f"Frontend build directory not found: {self.root}")
+        else:
+            for dirpath, _, filenames in os.walk(self.root):
+                names = set(filenames)
+                for filename in filenames:
+                    if filename.endswith(('.br', '.gz')) and filename[:-3] in names:
+                        continue # A variant of another file, attached below
+                    full_path = os.path.join(dirpath, filename)
+                    path = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                    asset = self._load_asset(full_path, path, names, filename)
+                    assets[path] = asset
+                    total_bytes += sum(len(data) for data in asset.variants.values())
+        self.assets = assets
+        self.total_bytes = total_bytes
+        logger.info(f"Indexed {len(assets)} frontend assets ({total_bytes / 1024:.0f} KiB with variants) from {self.root}")
+        return self
+
+    def _load_asset(self, full_path, path, sibling_names, filename):
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if mimetype.startswith('text/') or mimetype == 'application/javascript':
+            mimetype += '; charset=utf-8'
+        cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_NAME_PATTERN.search(filename) else REVALIDATE_CACHE_CONTROL
+        asset = StaticAsset(path, mimetype, cache_control, data)
+
+        compressible = mimetype.startswith(COMPRESSIBLE_TYPES) and len(data) >= MIN_COMPRESS_SIZE
+        for encoding, suffix in ENCODINGS:
+            if filename + suffix in sibling_names:
+                with open(full_path + suffix, 'rb') as f:
+                    asset.variants[encoding] = f.read()
+            elif compressible:
+                if encoding == 'gzip':
+                    asset.variants[encoding] = gzip.compress(data, compresslevel=9, mtime=0)
+                elif brotli is not None:
+                    asset.variants[encoding] = brotli.compress(data, mode=brotli.MODE_TEXT)
+            if encoding in asset.variants and len(asset.variants[encoding]) >= len(data):
+                del asset.variants[encoding] # Not worth it
+        return asset
+
+    def get(self, path):
+        return self.assets.get(path)
+
+    def __len__(self):
+        return len(self.assets)
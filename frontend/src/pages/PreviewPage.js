@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react'; // Removed unused useMemo
 import { useLocation, useNavigate } from 'react-router-dom';
+import { downloadPortfolioFiles } from '../services/api';
 
 const DownloadIcon = () => (
   <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" viewBox="0 0 16 16" style={{ marginRight: '8px' }}>
@@ -36,12 +37,12 @@ function PreviewPage() {
     setIsLoading(false);
   }, [location.state]);
 
-  const handleDownload = () => {
-    // Placeholder for download functionality
-    alert('Download functionality to be implemented!');
-    console.log('Downloading website files...');
-    // In a real app, this would likely call an API service from ../services/api.js
-    // e.g., downloadPortfolioFiles(portfolioData.id_if_available_or_entire_data);
+  const handleDownload = async () => {
+    try {
+      await downloadPortfolioFiles(portfolioData?.portfolioId);
+    } catch (err) {
+      alert(err.message);
+    }
   };
 
   const handleGoBack = () => {
@@ -28,19 +28,23 @@ export const uploadResume = async (file) => {
 };
 
 /**
- * Placeholder function to download the generated portfolio website files.
- * In a real scenario, this might trigger a download from a specific backend endpoint.
- * @param {string} portfolioId - The ID of the portfolio to download (if applicable, though current flow doesn't use ID yet).
+ * Downloads the static website bundle (zip) for a stored portfolio.
+ * The backend streams the archive, so the browser saves it directly instead of
+ * buffering the whole file in memory first.
+ * @param {string} portfolioId - The portfolioId returned by uploadResume.
  * @returns {Promise<void>}
  */
 export const downloadPortfolioFiles = async (portfolioId) => {
-  // This is a placeholder. Actual implementation would depend on how the backend serves files.
-  // For example, it might be a GET request to an endpoint like /api/download_portfolio/${portfolioId}
-  // which would return a zip file.
-  console.log('Attempting to download portfolio files. ID (if any):', portfolioId);
-  // Example: window.location.href = `${API_URL}/download_portfolio`; // if no ID needed or ID managed by session
-  alert('Download functionality is not yet implemented on the backend.');
-  return Promise.resolve(); // Simulating a successful call for now
+  if (portfolioId === undefined || portfolioId === null) {
+    throw new Error('This portfolio has not been saved yet, so it cannot be downloaded.');
+  }
+  const link = document.createElement('a');
+  link.href = `${API_URL}/portfolios/${encodeURIComponent(portfolioId)}/export`;
+  link.download = '';
+  document.body.appendChild(link);
+  link.click();
+  document.body.removeChild(link);
+  return Promise.resolve();
 };
 
 // Further API service functions can be added here as the application grows.
@@ -42,6 +42,8 @@ else
 fi
 
 # Run the application
+# APP_MODE=production serves the app with gunicorn (settings from SERVER_* variables, see
+# backend/config.py); anything else runs the Flask development server.
 echo "Starting the Flask application..."
 if [ -f "backend/app.py" ]; then
   echo "The application will be served by the backend on port 9000."
@@ -49,7 +51,14 @@ if [ -f "backend/app.py" ]; then
   # The backend/app.py MUST be configured to:
   # 1. Run on host 0.0.0.0 and port 9000.
   # 2. Serve static files from the '../frontend/build' directory (relative to app.py).
-  python3 backend/app.py
+  if [ "${APP_MODE:-development}" = "production" ]; then
+    echo "Production mode: starting gunicorn..."
+    cd backend
+    python3 -m gunicorn -c gunicorn.conf.py wsgi:app
+    cd ..
+  else
+    python3 backend/app.py
+  fi
 else
   echo "ERROR: backend/app.py not found. Cannot start the application."
   exit 1